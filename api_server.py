@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - HTTP API
+Headless async service for dialogues and follow-ups (JSON and server-sent
+events), so Streamlit is just one client and the API can be load tested
+and scaled horizontally
+
+    python api_server.py --port 8080 --workers 8
+
+Endpoints:
+    GET    /health              Liveness plus whether the RAG stack is loaded
+    GET    /stats               Worker, graph, model tier and cache statistics
+    POST   /dialogue            Run a dialogue, return the result as JSON
+    POST   /dialogue/stream     Run a dialogue, stream node/token/result SSE events
+    POST   /follow-up           Ask one mentor a follow-up question
+    POST   /follow-up/stream    Ask several mentors at once, stream each answer (SSE) as it completes
+    POST   /jobs                Submit a background dialogue job
+    GET    /jobs/{job_id}       Poll a job (progress, partial text, result)
+    DELETE /jobs/{job_id}       Cancel a job
+"""
+
+import os
+import json
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from aiohttp import web
+
+import divine_dialogue_langgraph as dialogue
+from dialogue_jobs import DialogueCancelled, get_job_manager
+from llm_cache import cache_stats
+from llm_scheduler import LLMError, LLMRateLimitError
+
+# Dialogues/follow-ups running at once; the rest wait (environment overridable)
+API_WORKERS = int(os.getenv("DIVINE_API_WORKERS", "4"))
+
+# Seconds between SSE keep-alive comments while a speaker is thinking
+SSE_KEEPALIVE_S = 15.0
+
+
+class DialogueService:
+    """
+    Runs the blocking dialogue functions for the async handlers
+
+    One thread pool and one semaphore bound the work in flight; the RAG
+    store, embedding model, LLM clients and compiled graphs are module
+    globals of divine_dialogue_langgraph, so every request shares them.
+    """
+
+    def __init__(self, workers: int = API_WORKERS):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="divine-api")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the pool once a worker slot is free"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'workers': self.workers, 'in_flight': self.in_flight, 'waiting': self.waiting}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _json_error(status: int, message: str) -> web.Response:
+    return web.json_response({'error': message}, status=status)
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=json.dumps({'error': message}), content_type='application/json')
+
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=str)
+
+
+async def _read_json(request: web.Request) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise _bad_request("Body must be JSON")
+    if not isinstance(body, dict):
+        raise _bad_request("Body must be a JSON object")
+    return body
+
+
+def _optional_str(body: Dict[str, Any], key: str, default: Optional[str] = '') -> Optional[str]:
+    """A body field that must be a string or null (default when missing or null)"""
+    value = body.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise _bad_request(f"'{key}' must be a string or null")
+    return value
+
+
+def _dialogue_args(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated run_divine_dialogue keyword arguments from a request body"""
+    question = _optional_str(body, 'question').strip()
+    if not question:
+        raise _bad_request("'question' is required")
+
+    mode = _optional_str(body, 'mode', 'debate')
+    if mode not in dialogue.DIALOGUE_GRAPH_BUILDERS:
+        raise _bad_request(f"Unknown mode '{mode}'. Choose one of: {', '.join(dialogue.DIALOGUE_GRAPH_BUILDERS)}")
+
+    deadline_s = body.get('deadline_s')
+    if deadline_s is not None and (isinstance(deadline_s, bool) or not isinstance(deadline_s, (int, float))
+                                   or deadline_s <= 0):
+        raise _bad_request("'deadline_s' must be a positive number of seconds")
+
+    return {
+        'user_question': question,
+        'user_background': _optional_str(body, 'background'),
+        'mode': mode,
+        'mentor': _optional_str(body, 'mentor', None),
+        'dialogue_id': _optional_str(body, 'dialogue_id', None),
+        'deadline_s': deadline_s
+    }
+
+
+def _follow_up_context(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated optional run_follow_up keyword arguments from a request body"""
+    return {
+        'user_background': _optional_str(body, 'background'),
+        'initial_question': _optional_str(body, 'initial_question'),
+        'summary': _optional_str(body, 'summary')
+    }
+
+
+def _conversation_history(body: Dict[str, Any]) -> List[str]:
+    """
+    Validated follow-up history: "Speaker: text" strings, or
+    {"speaker", "text"} objects (converted to that form)
+    """
+    history = body.get('conversation_history', [])
+    if not isinstance(history, list):
+        raise _bad_request("'conversation_history' must be a list")
+
+    lines = []
+    for entry in history:
+        if isinstance(entry, str):
+            lines.append(entry)
+        elif isinstance(entry, dict) and isinstance(entry.get('speaker'), str) and isinstance(entry.get('text'), str):
+            lines.append(f"{entry['speaker']}: {entry['text']}")
+        else:
+            raise _bad_request("'conversation_history' entries must be strings or {\"speaker\", \"text\"} objects")
+    return lines
+
+
+# ============================================================================
+# HANDLERS
+# ============================================================================
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({'status': 'ok', 'rag_loaded': dialogue.RAG_STORE is not None})
+
+
+async def stats(request: web.Request) -> web.Response:
+    service: DialogueService = request.app['service']
+    return web.json_response({
+        'api': service.stats(),
+        'jobs': get_job_manager().stats(),
+        'graphs': dialogue.graph_stats(),
+        'model_tiers': dialogue.model_tier_stats(),
+        'llm_cache': cache_stats()
+    })
+
+
+async def run_dialogue(request: web.Request) -> web.Response:
+    args = _dialogue_args(await _read_json(request))
+    try:
+        result = await request.app['service'].run(dialogue.run_divine_dialogue, **args)
+    except ValueError as e:
+        return _json_error(400, str(e))
+
+    status = 200
+    if result.get('error_type') == 'LLMRateLimitError':
+        status = 429
+    elif result.get('error_type') == 'ValueError':
+        status = 409  # dialogue_id already used for a different question
+    elif 'error' in result:
+        status = 500
+    return web.json_response(result, status=status, dumps=_json_dumps)
+
+
+async def stream_dialogue(request: web.Request) -> web.StreamResponse:
+    """
+    Server-sent events for one dialogue
+
+    Events: "node" {node, event, error}, "token" {speaker, text} for each streamed
+    chunk, then one "result" with the full result. A client disconnect
+    cancels the dialogue at its next node or chunk.
+    """
+    args = _dialogue_args(await _read_json(request))
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    disconnected = threading.Event()
+
+    def emit(event: str, data: Dict[str, Any]):
+        if disconnected.is_set():
+            raise DialogueCancelled("Client disconnected")
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    def on_token(speaker: str, chunk: str):
+        emit('token', {'speaker': speaker, 'text': chunk})
+
+    def on_node(node: str, event: str, error: bool = False):
+        emit('node', {'node': node, 'event': event, 'error': error})
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+
+    async def produce():
+        try:
+            result = await request.app['service'].run(
+                dialogue.run_divine_dialogue, on_token=on_token, on_node=on_node, **args
+            )
+        except Exception as e:
+            result = {'error': str(e), 'error_type': type(e).__name__}
+        await events.put(('result', result))
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                event, data = await asyncio.wait_for(events.get(), timeout=SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                await response.write(b": keep-alive\n\n")
+                continue
+
+            payload = _json_dumps(data)
+            await response.write(f"event: {event}\ndata: {payload}\n\n".encode("utf-8"))
+            if event == 'result':
+                break
+    except (ConnectionResetError, asyncio.CancelledError):
+        disconnected.set()
+        raise
+    finally:
+        if not producer.done():
+            disconnected.set()
+
+    await response.write_eof()
+    return response
+
+
+async def follow_up(request: web.Request) -> web.Response:
+    body = await _read_json(request)
+    question = _optional_str(body, 'question').strip()
+    mentor = _optional_str(body, 'mentor')
+    if not question or mentor not in ('Krishna', 'Buddha', 'Jesus'):
+        return _json_error(400, "'question' and 'mentor' (Krishna, Buddha or Jesus) are required")
+    history = _conversation_history(body)
+    context = _follow_up_context(body)
+
+    try:
+        result = await request.app['service'].run(
+            dialogue.run_follow_up, question, mentor, history, **context
+        )
+    except LLMError as e:
+        return _json_error(429 if isinstance(e, LLMRateLimitError) else 502, str(e))
+    return web.json_response(result, dumps=_json_dumps)
+
+
+async def stream_follow_ups(request: web.Request) -> web.StreamResponse:
+    """
+    Server-sent events for one follow-up question put to several mentors
+
+    Body: question, mentors (list, default all three), plus the optional
+    conversation_history / background / initial_question / summary of
+    /follow-up. Each mentor's call takes its own worker slot, so the mentors
+    answer concurrently within the API's worker bound; each answer is sent
+    as a "follow_up" event as soon as it is ready (an "error" event for a
+    mentor that failed), then one "done" event. A client disconnect drops
+    the calls still waiting for a slot.
+    """
+    body = await _read_json(request)
+    question = _optional_str(body, 'question').strip()
+    mentors = body.get('mentors') or dialogue.FOLLOW_UP_MENTORS
+    if not question or not isinstance(mentors, list) or any(m not in dialogue.FOLLOW_UP_MENTORS for m in mentors):
+        return _json_error(400, "'question' is required and 'mentors' must list Krishna, Buddha and/or Jesus")
+    mentors = list(dict.fromkeys(mentors))
+    history = _conversation_history(body)
+    context = _follow_up_context(body)
+    service: DialogueService = request.app['service']
+
+    async def ask(mentor: str) -> Dict[str, Any]:
+        try:
+            return await service.run(dialogue.run_follow_up, question, mentor, history, **context)
+        except Exception as e:
+            print(f"⚠️  {mentor}'s follow-up failed: {e}")
+            return {'mentor': mentor, 'question': question, 'error': str(e), 'error_type': type(e).__name__}
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+
+    tasks = [asyncio.create_task(ask(mentor)) for mentor in mentors]
+    pending = set(tasks)
+    answered = 0
+    try:
+        while pending:
+            finished, pending = await asyncio.wait(pending, timeout=SSE_KEEPALIVE_S,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+            if not finished:
+                await response.write(b": keep-alive\n\n")
+                continue
+
+            for task in finished:
+                result = task.result()
+                event = 'error' if 'error' in result else 'follow_up'
+                await response.write(f"event: {event}\ndata: {_json_dumps(result)}\n\n".encode("utf-8"))
+                answered += 'error' not in result
+
+        done = {'answered': answered, 'asked': len(mentors)}
+        await response.write(f"event: done\ndata: {_json_dumps(done)}\n\n".encode("utf-8"))
+    finally:
+        for task in tasks:
+            task.cancel()  # Client went away: drop calls still waiting for a slot
+
+    await response.write_eof()
+    return response
+
+
+async def submit_job(request: web.Request) -> web.Response:
+    args = _dialogue_args(await _read_json(request))
+    job_id = get_job_manager().submit(
+        args['user_question'], args['user_background'], mode=args['mode'],
+        mentor=args['mentor'], dialogue_id=args['dialogue_id'], deadline_s=args['deadline_s']
+    )
+    return web.json_response({'job_id': job_id}, status=202)
+
+
+async def job_status(request: web.Request) -> web.Response:
+    job = get_job_manager().status(request.match_info['job_id'])
+    if job is None:
+        return _json_error(404, "Unknown or expired job")
+    return web.json_response(job, dumps=_json_dumps)
+
+
+async def cancel_job(request: web.Request) -> web.Response:
+    cancelled = get_job_manager().cancel(request.match_info['job_id'])
+    return web.json_response({'cancelled': cancelled}, status=202 if cancelled else 409)
+
+
+# ============================================================================
+# APP
+# ============================================================================
+
+async def _warm_up(app: web.Application):
+    """Load RAG, the LLM client and the graphs once, before serving traffic"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, lambda: dialogue.warm_up_in_background().join())
+
+
+async def _shutdown(app: web.Application):
+    app['service'].shutdown()
+
+
+def create_app(workers: int = API_WORKERS, warm_up: bool = True) -> web.Application:
+    """Build the aiohttp application"""
+    app = web.Application()
+    app['service'] = DialogueService(workers)
+
+    app.router.add_get('/health', health)
+    app.router.add_get('/stats', stats)
+    app.router.add_post('/dialogue', run_dialogue)
+    app.router.add_post('/dialogue/stream', stream_dialogue)
+    app.router.add_post('/follow-up', follow_up)
+    app.router.add_post('/follow-up/stream', stream_follow_ups)
+    app.router.add_post('/jobs', submit_job)
+    app.router.add_get('/jobs/{job_id}', job_status)
+    app.router.add_delete('/jobs/{job_id}', cancel_job)
+
+    if warm_up:
+        app.on_startup.append(_warm_up)
+    app.on_cleanup.append(_shutdown)
+    return app
+
+
+def main():
+    """Serve the API"""
+    parser = argparse.ArgumentParser(description="Divine Dialogue HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=API_WORKERS,
+                        help="Dialogues/follow-ups run concurrently (others queue)")
+    parser.add_argument("--no-warmup", action="store_true", help="Load RAG and the LLM client on first request")
+    args = parser.parse_args()
+
+    print(f"🕉️ ☸️ ✝️  Divine Dialogue API on http://{args.host}:{args.port} ({args.workers} workers)")
+    web.run_app(create_app(args.workers, warm_up=not args.no_warmup), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
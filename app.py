@@ -11,9 +11,17 @@ import random
 import time
 import threading
 import base64
+import uuid
 from datetime import datetime
 from pathlib import Path
-from divine_dialogue_langgraph import run_divine_dialogue, run_follow_up, load_rag_database
+from divine_dialogue_langgraph import (
+    run_follow_ups, load_rag_database, model_tier_stats,
+    warm_up_in_background, dialogue_checkpoint
+)
+from dialogue_jobs import get_job_manager
+from llm_cache import cache_stats
+from session_store import get_session_store
+from conversation_summary import get_summarizer
 
 # TTS imports (try multiple options)
 try:
@@ -29,6 +37,16 @@ try:
 except ImportError:
     GTTS_AVAILABLE = False
 
+# How often a running dialogue job is polled (seconds)
+JOB_POLL_S = float(os.getenv("DIVINE_JOB_POLL_S", "0.5"))
+
+# Saved dialogues / follow-ups loaded from the session store per page
+HISTORY_PAGE_SIZE = 5
+FOLLOW_UP_PAGE_SIZE = 5
+
+# selected_mentor value that sends the follow-up to every mentor at once
+ALL_MENTORS = "All"
+
 # Page configuration
 st.set_page_config(
     page_title="Gyan Samvad",
@@ -299,32 +317,45 @@ st.markdown("""
 
 
 def initialize_session_state():
-    """Initialize session state variables"""
-    if 'dialogue_history' not in st.session_state:
-        st.session_state.dialogue_history = []
+    """
+    Initialize session state variables
+    
+    Dialogues, follow-ups and saved history live in the session store (keyed
+    by the ?session= id in the URL); session_state only holds the current
+    page's view of them, so it stays small however long the user chats.
+    """
     if 'rag_loaded' not in st.session_state:
         st.session_state.rag_loaded = False
-    if 'current_dialogue' not in st.session_state:
-        st.session_state.current_dialogue = None
+    if 'current_record' not in st.session_state:
+        st.session_state.current_record = None  # Session store id of the displayed dialogue
+    if 'history_page' not in st.session_state:
+        st.session_state.history_page = 0
+    if 'follow_up_limit' not in st.session_state:
+        st.session_state.follow_up_limit = FOLLOW_UP_PAGE_SIZE  # Follow-ups shown (latest first loaded)
+    if 'last_follow_up_timings' not in st.session_state:
+        st.session_state.last_follow_up_timings = {}  # Turn id -> timings of the newest follow-up(s)
     if 'follow_up_mode' not in st.session_state:
         st.session_state.follow_up_mode = False
     if 'last_result' not in st.session_state:
         st.session_state.last_result = None
     if 'displayed_question' not in st.session_state:
         st.session_state.displayed_question = None
-    # Recursive conversation state management
-    if 'conversation_history' not in st.session_state:
-        st.session_state.conversation_history = []  # Full conversation history for follow-ups
-    if 'initial_responses' not in st.session_state:
-        st.session_state.initial_responses = {}  # Store initial mentor responses
     if 'user_background' not in st.session_state:
         st.session_state.user_background = ""  # Store user background
     if 'user_background_stored' not in st.session_state:
         st.session_state.user_background_stored = ''  # Store user background for follow-ups
     if 'selected_mentor' not in st.session_state:
         st.session_state.selected_mentor = None
-    if 'follow_up_responses' not in st.session_state:
-        st.session_state.follow_up_responses = []  # Store follow-up responses
+    if 'active_job' not in st.session_state:
+        st.session_state.active_job = None  # Id of this session's running dialogue job
+    if 'show_timings' not in st.session_state:
+        st.session_state.show_timings = False  # Debug panel with per-node timings
+    if 'session_id' not in st.session_state:
+        # New tab, or a reconnect: reuse the id in the URL and restore its last dialogue
+        st.session_state.session_id = st.query_params.get('session') or uuid.uuid4().hex
+        st.query_params['session'] = st.session_state.session_id
+        if 'job' not in st.query_params:  # A running job shows its own progress instead
+            restore_latest_dialogue()
     # # TTS SESSION STATE COMMENTED OUT
     # if 'audio_enabled' not in st.session_state:
     #     st.session_state.audio_enabled = True
@@ -342,6 +373,190 @@ def load_rag_once():
             st.session_state.rag_loaded = True
 
 
+def store_dialogue_result(result, user_question, user_background):
+    """Keep a finished dialogue for display and follow-ups"""
+    # Store result and mark question as displayed
+    st.session_state.last_result = result
+    st.session_state.displayed_question = user_question
+    st.session_state.user_background_stored = user_background
+    
+    # Persist the dialogue (compact turns) for follow-ups, history and reconnects
+    try:
+        st.session_state.current_record = get_session_store().save_dialogue(
+            st.session_state.session_id, result, user_background
+        )
+        # Summarize it while the user reads, ready for the first follow-up
+        get_summarizer().schedule(st.session_state.session_id, st.session_state.current_record)
+    except Exception as e:
+        print(f"⚠️  Could not save dialogue to the session store: {e}")
+        st.session_state.current_record = None
+    
+    # Clear follow-up state
+    st.session_state.selected_mentor = None
+    st.session_state.follow_up_limit = FOLLOW_UP_PAGE_SIZE
+    st.session_state.last_follow_up_timings = {}
+
+
+def restore_latest_dialogue():
+    """Show the session's most recent dialogue again after a reconnect"""
+    try:
+        latest = get_session_store().latest_dialogue(st.session_state.session_id)
+    except Exception as e:
+        print(f"⚠️  Could not read the session store: {e}")
+        return
+    
+    if latest is None:
+        return
+    
+    st.session_state.last_result = latest
+    st.session_state.displayed_question = latest['question']
+    st.session_state.user_background_stored = latest['user_background']
+    st.session_state.current_record = latest['record_id']
+
+
+def follow_up_context():
+    """
+    (summary, latest lines) of the displayed dialogue for run_follow_up
+    
+    The rolling summary covers everything but the newest turns; without a
+    stored dialogue the whole result is sent as history.
+    """
+    if st.session_state.current_record is None:
+        result = st.session_state.last_result
+        return "", [f"User Question: {result['question']}"] + [
+            f"{r['mentor']}: {r['response']}" for r in result['mentor_responses']
+        ] + [f"Moderator: {result['synthesis']}"]
+    
+    return get_summarizer().context(st.session_state.session_id, st.session_state.current_record)
+
+
+def start_dialogue_job(user_question, user_background, dialogue_id):
+    """
+    Submit a (new or resumed) dialogue to the shared worker pool
+    
+    The script thread returns immediately; render_active_job() then polls
+    the job, so the page stays responsive while the mentors answer.
+    """
+    manager = get_job_manager()
+    if st.session_state.active_job:
+        manager.cancel(st.session_state.active_job)
+    
+    job_id = manager.submit(user_question, user_background, dialogue_id=dialogue_id)
+    st.session_state.active_job = job_id
+    st.session_state.last_result = None
+    
+    # Kept in the URL so a reconnecting browser finds its job (or its checkpoint)
+    st.query_params['job'] = job_id
+    st.query_params['dialogue'] = dialogue_id
+
+
+def render_job_progress(job_id):
+    """Progress bar, each speaker's text so far and a cancel button for a running job"""
+    speaker_icons = {'Krishna': '🕉️', 'Buddha': '☸️', 'Jesus': '✝️', 'Moderator': '🎯'}
+    
+    job = get_job_manager().status(job_id)
+    if job is None or job['status'] not in ('queued', 'running'):
+        st.rerun()  # Finished - collect the result on a full rerun
+    
+    st.markdown(f"""
+    <div class="question-display">
+        <h3 style="color: #ffffff;">📝 Your Question:</h3>
+        <p style="font-size: 1.2rem; font-style: italic; color: #e0e0e0;">"{job['question']}"</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if job['status'] == 'queued':
+        label = f"⏳ Waiting for a free mentor ({job['queued_s']:.0f}s)..."
+    elif job['cancel_requested']:
+        label = "⏹️ Stopping..."
+    else:
+        label = f"🌟 {(job['current_node'] or 'starting').title()} ({job['elapsed_s']:.0f}s)..."
+    st.progress(job['progress'], text=label)
+    
+    for speaker, text in job['partial'].items():
+        st.markdown(f"#### {speaker_icons.get(speaker, '✨')} {speaker} speaks:")
+        st.markdown(text)
+    
+    if not job['cancel_requested'] and st.button("⏹️ Cancel Dialogue", key=f"cancel_{job_id}"):
+        get_job_manager().cancel(job_id)
+
+
+# Re-render only the progress block every JOB_POLL_S (full reruns on older Streamlit)
+if hasattr(st, 'fragment'):
+    render_job_progress = st.fragment(run_every=JOB_POLL_S)(render_job_progress)
+
+
+def render_active_job():
+    """Show this session's dialogue job while it runs, and collect it once it finishes"""
+    job_id = st.session_state.active_job or st.query_params.get('job')
+    if not job_id:
+        return
+    
+    job = get_job_manager().status(job_id)
+    if job is None:
+        # Expired, or submitted to another server process
+        st.session_state.active_job = None
+        if 'job' in st.query_params:
+            del st.query_params['job']
+        return
+    
+    st.session_state.active_job = job_id
+    
+    if job['status'] in ('queued', 'running'):
+        render_job_progress(job_id)
+        if not hasattr(st, 'fragment'):
+            time.sleep(JOB_POLL_S)
+            st.rerun()
+        return
+    
+    # Finished - release the job and keep (or report) its result
+    st.session_state.active_job = None
+    if 'job' in st.query_params:
+        del st.query_params['job']
+    
+    result = job['result'] or {}
+    if job['status'] == 'completed':
+        store_dialogue_result(result, job['question'], job['user_background'])
+        if 'dialogue' in st.query_params:
+            del st.query_params['dialogue']  # Nothing left to resume
+    elif job['status'] == 'cancelled':
+        st.session_state.resume_notice = "⏹️ Dialogue cancelled."
+    elif result.get('error_type') == 'LLMRateLimitError':
+        st.session_state.resume_notice = "⏳ The mentors are answering many seekers right now. Please try again in a moment."
+    else:
+        st.session_state.resume_notice = f"❌ Error: {job['error'] or 'Unknown error'}"
+    
+    if not result.get('resumable') and 'resume_notice' in st.session_state:
+        st.error(st.session_state.pop('resume_notice'))
+
+
+def render_resume_option():
+    """Offer to resume the interrupted dialogue named in the URL (?dialogue=<id>)"""
+    dialogue_id = st.query_params.get('dialogue')
+    if not dialogue_id or st.session_state.last_result or st.session_state.active_job:
+        return
+    
+    try:
+        checkpoint = dialogue_checkpoint(dialogue_id)
+    except Exception as e:
+        print(f"⚠️  Could not read dialogue checkpoint: {e}")
+        return
+    
+    if checkpoint is None:
+        return
+    
+    notice = st.session_state.pop('resume_notice', None)
+    if notice:
+        st.error(notice)
+    
+    completed = ", ".join(checkpoint['completed_mentors']) or "no mentors yet"
+    st.info(f"⏸️ An interrupted dialogue was found: \"{checkpoint['question'][:80]}\" ({completed} answered)")
+    
+    if st.button("🔁 Resume Dialogue", type="primary"):
+        start_dialogue_job(checkpoint['question'], checkpoint['user_background'], dialogue_id)
+        st.rerun()
+
+
 # # TTS FUNCTION COMMENTED OUT
 # def stream_mentor_response_tts(mentor_name: str, text: str, use_gtts: bool = False) -> str:
 #     """
@@ -929,6 +1144,38 @@ def display_moderator_answer(moderator_text):
     """, unsafe_allow_html=True)
 
 
+def display_timings(timings, title="🔧 Timings"):
+    """Debug panel: per-node durations, LLM calls/tokens and every timing record"""
+    if not timings or not st.session_state.show_timings:
+        return
+    
+    llm = timings['llm']
+    with st.expander(f"{title} ({timings['total_s']:.2f}s total)"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("LLM Calls", llm['calls'], help=f"{llm['cache_hits']} served from cache")
+        col2.metric("Input Tokens", f"{llm['input_tokens']:,}")
+        col3.metric("Output Tokens", f"{llm['output_tokens']:,}")
+        
+        if timings['nodes']:
+            st.markdown("**Nodes**")
+            for node, seconds in timings['nodes'].items():
+                st.caption(f"{node}: {seconds:.2f}s")
+        
+        st.markdown("**All records**")
+        st.dataframe([
+            {
+                'kind': r['kind'],
+                'name': r['name'],
+                'parent': r.get('parent') or '',
+                'start (s)': round(r['start_s'], 3),
+                'duration (s)': round(r['duration_s'], 3),
+                'tokens in/out': f"{r['input_tokens']}/{r['output_tokens']}" if 'input_tokens' in r else '',
+                'cache hit': bool(r.get('cache_hit'))
+            }
+            for r in timings['records']
+        ], use_container_width=True)
+
+
 def export_dialogue_text(question, responses, synthesis):
     """Export dialogue as formatted text"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -981,6 +1228,9 @@ Powered by LangGraph, FAISS, and OpenRouter AI
 def main():
     """Main application"""
     
+    # Start loading the RAG stack and LLM client without blocking the first render
+    warm_up_in_background()
+    
     # Initialize session state
     initialize_session_state()
     
@@ -1082,11 +1332,31 @@ def main():
         st.metric("Vector Database", "FAISS")
         st.metric("Embedding Model", "all-MiniLM-L6-v2")
         
+        llm_cache_stats = cache_stats()
+        if llm_cache_stats:
+            st.metric(
+                "LLM Cache Hit Rate",
+                f"{llm_cache_stats['hit_rate']:.0%}",
+                help=f"{llm_cache_stats['hits']} hits / {llm_cache_stats['misses']} misses, {llm_cache_stats['entries']} cached responses"
+            )
+        
+        for tier, tier_stats in model_tier_stats().items():
+            if tier_stats['calls']:
+                st.caption(
+                    f"{tier.title()} tier ({tier_stats['model']}): {tier_stats['calls']} calls, "
+                    f"{tier_stats['avg_latency_s']:.2f}s avg, "
+                    f"{tier_stats['input_tokens'] + tier_stats['output_tokens']:,} tokens"
+                )
+        
+        st.checkbox("🔧 Show timings", key="show_timings",
+                    help="Show per-node, retrieval and LLM call timings under each answer")
+        
         st.divider()
         
         if st.button("🔄 Clear All History", use_container_width=True):
-            st.session_state.dialogue_history = []
-            st.session_state.current_dialogue = None
+            get_session_store().clear(st.session_state.session_id)
+            st.session_state.current_record = None
+            st.session_state.history_page = 0
             st.session_state.last_result = None
             st.session_state.displayed_question = None
             st.session_state.speaker_order = None
@@ -1393,68 +1663,21 @@ def main():
             st.rerun()
     
     with col3:
-        if st.session_state.current_dialogue:
+        if st.session_state.current_record is not None:
             if st.button("💾 Save", use_container_width=True):
-                st.session_state.dialogue_history.append(st.session_state.current_dialogue)
+                get_session_store().set_saved(st.session_state.session_id, st.session_state.current_record)
                 st.success("Saved!")
     
     # Process question
     if begin_button and user_question.strip():
         # Only run if this is a new question
         if st.session_state.displayed_question != user_question:
-            # Clear previous results to prevent duplication
-            st.session_state.last_result = None
-            
-            # Load RAG database
-            load_rag_once()
-            
-            # Display question with dark background
-            st.markdown(f"""
-            <div class="question-display">
-                <h3 style="color: #ffffff;">📝 Your Question:</h3>
-                <p style="font-size: 1.2rem; font-style: italic; color: #e0e0e0;">"{user_question}"</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Run the dialogue with spinner
-            with st.spinner("🌟 The mentors are considering your question... This may take 15-30 seconds..."):
-                try:
-                    # Pass user_background to the dialogue function
-                    result = run_divine_dialogue(user_question, user_background=user_background.strip() if user_background else '')
-                    
-                    if 'error' not in result:
-                        # Store result and mark question as displayed
-                        st.session_state.last_result = result
-                        st.session_state.displayed_question = user_question
-                        st.session_state.user_background_stored = user_background.strip() if user_background else ''
-                        
-                        # Build comprehensive conversation history for follow-ups
-                        conversation_history = []
-                        conversation_history.append(f"User Question: {user_question}")
-                        # Store initial responses
-                        for response in result['mentor_responses']:
-                            mentor_name = response['mentor']
-                            mentor_response = response['response']
-                            conversation_history.append(f"{mentor_name}: {mentor_response}")
-                            # Store in initial_responses for reference
-                            st.session_state.initial_responses[mentor_name] = {
-                                'response': mentor_response,
-                                'citations': response.get('citations', [])
-                            }
-                        conversation_history.append(f"Moderator: {result['synthesis']}")
-                        st.session_state.conversation_history = conversation_history
-                        
-                        # Clear follow-up state
-                        st.session_state.selected_mentor = None
-                        st.session_state.follow_up_responses = []
-                        
-                        st.rerun()  # Rerun to display results cleanly
-                    else:
-                        st.error(f"❌ Error: {result.get('error', 'Unknown error')}")
-                        
-                except Exception as e:
-                    st.error(f"❌ An error occurred: {str(e)}")
-                    st.exception(e)
+            # Checkpointed under this id so an interrupted dialogue can resume
+            dialogue_id = uuid.uuid4().hex
+            start_dialogue_job(user_question, user_background.strip() if user_background else '', dialogue_id)
+    
+    render_active_job()
+    render_resume_option()
         
     # Display results if available
     if st.session_state.last_result and st.session_state.displayed_question:
@@ -1487,14 +1710,7 @@ def main():
         }
         
         # Get mentor responses in FIXED ORDER: Krishna → Buddha → Jesus (no randomization)
-        mentor_responses = result['mentor_responses'].copy()
-        
-        # Remove duplicates (ensure unique mentors)
-        seen_mentors = {}
-        for response in mentor_responses:
-            mentor_name = response.get('mentor', 'Unknown')
-            if mentor_name not in seen_mentors:
-                seen_mentors[mentor_name] = response
+        seen_mentors = {response.get('mentor', 'Unknown'): response for response in result['mentor_responses']}
         
         # Enforce FIXED ORDER: Krishna → Buddha → Jesus
         fixed_order = ['Krishna', 'Buddha', 'Jesus']
@@ -1625,6 +1841,7 @@ def main():
         
         # Display Moderator's Synthesis (combines all three mentor responses with personal context)
         display_moderator_answer(result['synthesis'])
+        display_timings(result.get('timings'), "🔧 Dialogue Timings")
         
         st.divider()
         
@@ -1657,29 +1874,17 @@ def main():
         
         with col3:
             # Save to history
-            if st.button("💾 Save to History", use_container_width=True, key="save_history"):
-                st.session_state.dialogue_history.append({
-                    'question': st.session_state.displayed_question,
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'responses': result['mentor_responses'],
-                    'synthesis': result['synthesis']
-                })
+            if st.button("💾 Save to History", use_container_width=True, key="save_history",
+                         disabled=st.session_state.current_record is None):
+                get_session_store().set_saved(st.session_state.session_id, st.session_state.current_record)
                 st.success("Saved to history!")
         
-        # Store current dialogue
-        st.session_state.current_dialogue = {
-            'question': st.session_state.displayed_question,
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'responses': result['mentor_responses'],
-            'synthesis': result['synthesis']
-        }
-        
         # Follow-up section
         st.divider()
         st.header("🔄 Follow-Up Questions")
         st.write("Ask any of the mentors a follow-up question about their guidance or your situation.")
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             if st.button("❓ Ask Krishna 🕉️", use_container_width=True, key="ask_krishna"):
@@ -1696,13 +1901,20 @@ def main():
                 st.session_state.selected_mentor = "Jesus"
                 st.rerun()
         
+        with col4:
+            if st.button("🙏 Ask All Three", use_container_width=True, key="ask_all"):
+                st.session_state.selected_mentor = ALL_MENTORS
+                st.rerun()
+        
         # Display follow-up question input if mentor is selected
         if st.session_state.selected_mentor:
-            mentor_icon = {'Krishna': '🕉️', 'Buddha': '☸️', 'Jesus': '✝️'}.get(st.session_state.selected_mentor, '✨')
-            st.write(f"### {mentor_icon} Your question for {st.session_state.selected_mentor}:")
+            asking_all = st.session_state.selected_mentor == ALL_MENTORS
+            addressee = "all three mentors" if asking_all else st.session_state.selected_mentor
+            mentor_icon = {'Krishna': '🕉️', 'Buddha': '☸️', 'Jesus': '✝️', ALL_MENTORS: '🙏'}.get(st.session_state.selected_mentor, '✨')
+            st.write(f"### {mentor_icon} Your question for {addressee}:")
             
             follow_up_question = st.text_input(
-                f"Ask {st.session_state.selected_mentor}:",
+                f"Ask {addressee}:",
                 key="follow_up_input",
                 placeholder=f"E.g., Can you explain more about what you meant by...?",
                 label_visibility="collapsed"
@@ -1712,42 +1924,50 @@ def main():
             with col_submit:
                 if st.button("💬 Ask", use_container_width=True, key="submit_follow_up"):
                     if follow_up_question.strip():
-                        # Call follow-up function
-                        with st.spinner(f"🌟 {st.session_state.selected_mentor} is considering your question..."):
+                        # Dialogues load RAG on the worker pool; make sure it is ready here too
+                        load_rag_once()
+                        
+                        # Ask the mentor(s) concurrently and show each answer as it arrives
+                        mentors = None if asking_all else [st.session_state.selected_mentor]
+                        arrivals = st.container()
+                        with st.spinner(f"🌟 {addressee.capitalize()} {'are' if asking_all else 'is'} considering your question..."):
                             try:
-                                follow_up_result = run_follow_up(
+                                summary, latest_lines = follow_up_context()
+                                st.session_state.last_follow_up_timings = {}
+                                failed = False
+                                
+                                for follow_up_result in run_follow_ups(
                                     question=follow_up_question.strip(),
-                                    mentor_name=st.session_state.selected_mentor,
-                                    conversation_history=st.session_state.conversation_history,
+                                    mentor_names=mentors,
+                                    conversation_history=latest_lines,
                                     user_background=st.session_state.user_background_stored,
-                                    initial_question=st.session_state.displayed_question
-                                )
+                                    initial_question=st.session_state.displayed_question,
+                                    summary=summary
+                                ):
+                                    if 'error' in follow_up_result:
+                                        failed = True
+                                        arrivals.error(f"❌ {follow_up_result['mentor']} could not answer: {follow_up_result['error']}")
+                                        continue
+                                    
+                                    arrivals.markdown(f"#### {follow_up_result['icon']} {follow_up_result['mentor']} responds:")
+                                    arrivals.markdown(follow_up_result['response'])
+                                    
+                                    # Store the exchange (compact) for recursive follow-ups and reconnects
+                                    if st.session_state.current_record is not None:
+                                        turn_id = get_session_store().add_follow_up(
+                                            st.session_state.session_id, st.session_state.current_record,
+                                            follow_up_result['mentor'], follow_up_question.strip(),
+                                            follow_up_result['response'], follow_up_result.get('citations', [])
+                                        )
+                                        st.session_state.last_follow_up_timings[turn_id] = follow_up_result.get('timings')
                                 
-                                # Store follow-up response
-                                st.session_state.follow_up_responses.append(follow_up_result)
+                                if st.session_state.current_record is not None:
+                                    get_summarizer().schedule(st.session_state.session_id, st.session_state.current_record)
                                 
-                                # Update conversation history with full context
-                                st.session_state.conversation_history.append(
-                                    f"User Follow-up to {st.session_state.selected_mentor}: {follow_up_question}"
-                                )
-                                st.session_state.conversation_history.append(
-                                    f"{st.session_state.selected_mentor}: {follow_up_result['response']}"
-                                )
-                                
-                                # Store in conversation history list for recursive follow-ups
-                                if 'conversation_history_list' not in st.session_state:
-                                    st.session_state.conversation_history_list = []
-                                st.session_state.conversation_history_list.append({
-                                    'turn': len(st.session_state.conversation_history_list) + 1,
-                                    'mentor': st.session_state.selected_mentor,
-                                    'question': follow_up_question,
-                                    'response': follow_up_result['response'],
-                                    'citations': follow_up_result.get('citations', [])
-                                })
-                                
-                                # Clear selected mentor and input
+                                # Clear selected mentor and input (keep any error on screen)
                                 st.session_state.selected_mentor = None
-                                st.rerun()
+                                if not failed:
+                                    st.rerun()
                                 
                             except Exception as e:
                                 st.error(f"❌ An error occurred: {str(e)}")
@@ -1760,17 +1980,31 @@ def main():
                     st.session_state.selected_mentor = None
                     st.rerun()
         
-        # Display follow-up responses
-        if st.session_state.follow_up_responses:
+        # Display follow-up responses (latest page loaded from the session store)
+        follow_up_total = 0
+        if st.session_state.current_record is not None:
+            store = get_session_store()
+            follow_up_total = store.count_turns(st.session_state.session_id, st.session_state.current_record,
+                                                kinds=['follow_up'])
+        if follow_up_total:
             st.divider()
             st.write("### 💬 Follow-Up Responses")
             
-            for i, follow_up in enumerate(st.session_state.follow_up_responses):
-                mentor_name = follow_up['mentor']
+            hidden = follow_up_total - st.session_state.follow_up_limit
+            if hidden > 0 and st.button(f"⬆️ Show earlier follow-ups ({hidden} more)", key="more_follow_ups"):
+                st.session_state.follow_up_limit += FOLLOW_UP_PAGE_SIZE
+                st.rerun()
+            
+            follow_ups = store.get_turns(st.session_state.session_id, st.session_state.current_record,
+                                         kinds=['follow_up'], limit=st.session_state.follow_up_limit)
+            last_timings = st.session_state.last_follow_up_timings
+            
+            for i, follow_up in enumerate(follow_ups):
+                mentor_name = follow_up['speaker']
                 mentor_icon = follow_up['icon']
-                response_text = follow_up['response']
-                question = follow_up.get('question', 'Follow-up question')
-                citations = follow_up.get('citations', [])
+                response_text = follow_up['text']
+                question = follow_up['question'] or 'Follow-up question'
+                citations = follow_up['citations']
                 
                 # Display follow-up response header
                 st.markdown(f"""
@@ -1805,24 +2039,49 @@ def main():
                             if j < len(citations[:3]):
                                 st.divider()
                 
-                if i < len(st.session_state.follow_up_responses) - 1:
+                if follow_up['id'] in last_timings:
+                    display_timings(last_timings[follow_up['id']], "🔧 Follow-up Timings")
+                
+                if i < len(follow_ups) - 1:
                     st.divider()
     
     elif begin_button:
         st.warning("⚠️ Please enter a question first!")
     
-    # Display history
-    if st.session_state.dialogue_history:
+    # Display history (saved dialogues, one page at a time from the session store)
+    store = get_session_store()
+    saved_total = store.count_dialogues(st.session_state.session_id, saved_only=True)
+    if saved_total:
         st.divider()
         st.header("📜 Dialogue History")
         
-        for i, dialogue in enumerate(reversed(st.session_state.dialogue_history[-5:]), 1):
-            with st.expander(f"{i}. {dialogue['question'][:60]}... ({dialogue['timestamp']})"):
+        pages = (saved_total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page = min(st.session_state.history_page, pages - 1)
+        offset = page * HISTORY_PAGE_SIZE
+        dialogues = store.list_dialogues(st.session_state.session_id, saved_only=True,
+                                         limit=HISTORY_PAGE_SIZE, offset=offset)
+        
+        for i, dialogue in enumerate(dialogues, offset + 1):
+            timestamp = datetime.fromtimestamp(dialogue['created_at']).strftime("%Y-%m-%d %H:%M:%S")
+            with st.expander(f"{i}. {dialogue['question'][:60]}... ({timestamp})"):
                 st.markdown(f"**Question:** {dialogue['question']}")
                 st.markdown(f"**Synthesis:** {dialogue['synthesis'][:200]}...")
                 
-                if st.button(f"View Full Dialogue #{i}", key=f"view_{i}"):
+                if st.button(f"View Full Dialogue #{i}", key=f"view_{dialogue['id']}"):
                     st.info("Full dialogue viewer coming soon!")
+        
+        if pages > 1:
+            col_newer, col_page, col_older = st.columns([1, 2, 1])
+            with col_newer:
+                if st.button("⬅️ Newer", disabled=page == 0, use_container_width=True, key="history_newer"):
+                    st.session_state.history_page = page - 1
+                    st.rerun()
+            with col_page:
+                st.caption(f"Page {page + 1} of {pages} ({saved_total} saved)")
+            with col_older:
+                if st.button("Older ➡️", disabled=page >= pages - 1, use_container_width=True, key="history_older"):
+                    st.session_state.history_page = page + 1
+                    st.rerun()
     
     # Footer
     st.divider()
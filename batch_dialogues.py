@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Batch Runner
+Runs many dialogues from a JSONL file with bounded, rate-limit aware
+concurrency, streaming results to an output JSONL as they finish
+
+Input lines: {"question": ..., "background": ..., "mode": ..., "mentor": ..., "deadline_s": ..., "id": ...}
+(only "question" is required). Re-running with the same output file skips
+questions that already succeeded.
+
+    python batch_dialogues.py questions.jsonl -o results.jsonl --concurrency 4
+    python batch_dialogues.py --from-tests test_comprehensive.py -o regression.jsonl --mode quick
+"""
+
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Iterable, Optional, Set
+
+from divine_dialogue_langgraph import run_divine_dialogue, load_rag_database, DIALOGUE_GRAPH_BUILDERS
+from llm_scheduler import get_scheduler
+from tracing import percentile
+
+# Times a rate-limited question is re-queued before it is recorded as failed
+DEFAULT_RETRIES = 2
+
+
+def item_id(item: Dict[str, Any], default_mode: str = 'debate') -> str:
+    """Stable id for an input item (its own "id", else a hash of its content and effective mode)"""
+    if item.get('id'):
+        return str(item['id'])
+    key = json.dumps([item['question'], item.get('background', ''), item.get('mode') or default_mode, item.get('mentor')])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def read_jsonl(path: str) -> List[Dict[str, Any]]:
+    """Input items; blank lines skipped, bare strings treated as questions"""
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {'question': item}
+            if not item.get('question'):
+                raise ValueError(f"{path}:{line_no}: missing 'question'")
+            items.append(item)
+    return items
+
+
+def questions_from_tests(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """String lists assigned to *questions names (e.g. test_questions) in Python files, deduplicated"""
+    items = []
+    seen = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Assign) or not isinstance(node.value, (ast.List, ast.Tuple)):
+                continue
+            names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+            if not any(name.endswith('questions') for name in names):
+                continue
+            for element in node.value.elts:
+                if isinstance(element, ast.Constant) and isinstance(element.value, str) and element.value not in seen:
+                    seen.add(element.value)
+                    items.append({'question': element.value, 'source': os.path.basename(path)})
+    return items
+
+
+def completed_ids(output_path: str) -> Set[str]:
+    """Ids already written successfully to the output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written last line
+            if record.get('status') == 'ok':
+                done.add(record['id'])
+    return done
+
+
+def run_item(item: Dict[str, Any], default_mode: str, default_deadline_s: Optional[float] = None) -> Dict[str, Any]:
+    """Run one dialogue and shape it into an output record"""
+    mode = item.get('mode') or default_mode
+    start = time.perf_counter()
+    try:
+        result = run_divine_dialogue(item['question'], item.get('background', ''),
+                                     mode=mode, mentor=item.get('mentor'),
+                                     dialogue_id=item.get('_dialogue_id'),
+                                     deadline_s=item.get('deadline_s') or default_deadline_s)
+    except Exception as e:
+        result = {'error': str(e), 'error_type': type(e).__name__}
+    latency_s = time.perf_counter() - start
+
+    llm = (result.get('timings') or {}).get('llm', {})
+    record = {
+        'id': item['_id'],
+        'question': item['question'],
+        'mode': mode,
+        'status': 'error' if 'error' in result else 'ok',
+        'latency_s': round(latency_s, 3),
+        'dialogue_id': result.get('dialogue_id'),
+        'llm_calls': llm.get('calls', 0),
+        'cache_hits': llm.get('cache_hits', 0),
+        'input_tokens': llm.get('input_tokens', 0),
+        'output_tokens': llm.get('output_tokens', 0),
+        'degradations': [d['action'] for d in result.get('degradations', [])]
+    }
+    if 'error' in result:
+        record['error'] = result['error']
+        record['error_type'] = result.get('error_type')
+    else:
+        record['synthesis'] = result['synthesis']
+        record['mentor_responses'] = [
+            {
+                'mentor': r['mentor'],
+                'response': r['response'],
+                'citations': [v.get('reference') for v in r.get('citations', [])]
+            }
+            for r in result['mentor_responses']
+        ]
+    return record
+
+
+class BatchRunner:
+    """
+    Runs items with at most `limit` dialogues in flight
+
+    The limit adapts (AIMD): a rate-limited dialogue halves it and is
+    re-queued after a pause; each success raises it by one back up to
+    max_concurrency. The shared LLMScheduler still paces every call.
+    """
+
+    def __init__(self, output_path: str, max_concurrency: int, mode: str, retries: int = DEFAULT_RETRIES,
+                 deadline_s: Optional[float] = None):
+        self.output_path = output_path
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.mode = mode
+        self.retries = retries
+        self.deadline_s = deadline_s
+        self.records: List[Dict[str, Any]] = []
+        self.rate_limited = 0
+        self._write_lock = threading.Lock()
+
+    def _write(self, record: Dict[str, Any]):
+        with self._write_lock, open(self.output_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.records.append(record)
+
+    def run(self, items: List[Dict[str, Any]]):
+        queue = deque((item, 0) for item in items)
+        in_flight = {}
+        resume_at = 0.0
+        total = len(items)
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="divine-batch") as executor:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.limit and time.monotonic() >= resume_at:
+                    item, attempt = queue.popleft()
+                    in_flight[executor.submit(run_item, item, self.mode, self.deadline_s)] = (item, attempt)
+
+                timeout = max(resume_at - time.monotonic(), 0.05) if queue else None
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    item, attempt = in_flight.pop(future)
+                    record = future.result()
+
+                    if record.get('error_type') == 'LLMRateLimitError' and attempt < self.retries:
+                        self.rate_limited += 1
+                        self.limit = max(1, self.limit // 2)
+                        resume_at = time.monotonic() + get_scheduler().backoff_delay(attempt + 2)
+                        # Same dialogue id: the retry resumes from the last checkpointed node
+                        queue.append((dict(item, _dialogue_id=record['dialogue_id']), attempt + 1))
+                        print(f"   ⏳ Rate limited - concurrency now {self.limit}, retrying {record['id']}")
+                        continue
+
+                    if record['status'] == 'ok':
+                        self.limit = min(self.max_concurrency, self.limit + 1)
+                    self._write(record)
+
+                    mark = "✓" if record['status'] == 'ok' else "✗"
+                    print(f"   {mark} [{len(self.records)}/{total}] {record['latency_s']:.1f}s  {record['question'][:60]}")
+
+
+def print_report(runner: BatchRunner, wall_s: float, skipped: int):
+    records = runner.records
+    ok = [r for r in records if r['status'] == 'ok']
+    latencies = sorted(r['latency_s'] for r in ok)
+
+    print("\n" + "="*70)
+    print("📦 BATCH SUMMARY")
+    print("="*70)
+    print(f"Completed: {len(ok)} ok, {len(records) - len(ok)} failed, {skipped} skipped (already done)")
+    print(f"Wall time: {wall_s:.1f}s | Throughput: {len(records) / wall_s * 60 if wall_s else 0:.1f} dialogues/min")
+    if latencies:
+        print(f"Latency:   p50 {percentile(latencies, 50):.2f}s | p95 {percentile(latencies, 95):.2f}s | "
+              f"p99 {percentile(latencies, 99):.2f}s | max {latencies[-1]:.2f}s")
+    degraded = sum(1 for r in ok if r.get('degradations'))
+    if degraded:
+        print(f"Deadline:  {degraded} of {len(ok)} dialogues degraded to meet their deadline")
+    print(f"LLM:       {sum(r['llm_calls'] for r in records)} calls, {sum(r['cache_hits'] for r in records)} cache hits, "
+          f"{sum(r['input_tokens'] + r['output_tokens'] for r in records):,} tokens")
+    print(f"Rate limits: {runner.rate_limited} re-queued | scheduler: {get_scheduler().stats}")
+    print(f"Results:   {runner.output_path}")
+
+
+def main():
+    """Run a batch of dialogues"""
+    parser = argparse.ArgumentParser(description="Run Divine Dialogues in bulk from JSONL")
+    parser.add_argument("input", nargs="?", help="JSONL file of {question, background, mode, mentor, id}")
+    parser.add_argument("--from-tests", nargs="+", metavar="FILE",
+                        help="Use the *questions lists in these Python files instead of a JSONL input")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum dialogues in flight")
+    parser.add_argument("--mode", default="debate", choices=list(DIALOGUE_GRAPH_BUILDERS),
+                        help="Mode for items that don't set one")
+    parser.add_argument("--deadline-s", type=float, help="Time budget per dialogue for items that don't set one")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Re-queues per rate-limited question")
+    parser.add_argument("--limit", type=int, help="Only run the first N pending questions")
+    parser.add_argument("--no-resume", action="store_true", help="Rerun questions already in the output file")
+    args = parser.parse_args()
+
+    if args.from_tests:
+        items = questions_from_tests(args.from_tests)
+    elif args.input:
+        items = read_jsonl(args.input)
+    else:
+        parser.error("give an input JSONL file or --from-tests")
+
+    for item in items:
+        item['_id'] = item_id(item, args.mode)
+
+    done = set() if args.no_resume else completed_ids(args.output)
+    pending = [item for item in items if item['_id'] not in done]
+    skipped = len(items) - len(pending)
+    if args.limit:
+        pending = pending[:args.limit]
+
+    print(f"\n📥 {len(items)} questions, {skipped} already done, running {len(pending)} "
+          f"(concurrency {args.concurrency}, mode {args.mode})")
+    if not pending:
+        return
+
+    load_rag_database()
+
+    runner = BatchRunner(args.output, args.concurrency, args.mode, args.retries, args.deadline_s)
+    start = time.perf_counter()
+    try:
+        runner.run(pending)
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted - rerun the same command to resume")
+        sys.exit(130)
+    finally:
+        print_report(runner, time.perf_counter() - start, skipped)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Dialogue Mode Latency Comparison
+Times the dialogue graph variants (debate, panel, single mentor, quick) on the same questions
+"""
+
+import argparse
+import statistics
+import time
+
+from divine_dialogue_langgraph import run_divine_dialogue, load_rag_database, graph_stats, DIALOGUE_GRAPH_BUILDERS, MENTOR_ORDER
+
+DEFAULT_QUESTIONS = [
+    "How can I find inner peace?",
+    "What is the purpose of life?",
+    "How should I treat my enemies?"
+]
+
+
+def time_dialogue(question: str, mode: str) -> float:
+    """Run one dialogue and return its wall-clock latency in seconds"""
+    start = time.perf_counter()
+    # single_mentor needs a mentor; time the first speaker of the debate
+    mentor = MENTOR_ORDER[0] if mode == 'single_mentor' else None
+    result = run_divine_dialogue(question, mode=mode, mentor=mentor)
+    elapsed = time.perf_counter() - start
+
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return elapsed
+
+
+def main():
+    """Run every question in every mode and print a latency table"""
+    parser = argparse.ArgumentParser(description="Compare debate vs panel dialogue latency")
+    parser.add_argument("--modes", nargs="+", default=list(DIALOGUE_GRAPH_BUILDERS), choices=list(DIALOGUE_GRAPH_BUILDERS))
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per question per mode")
+    parser.add_argument("questions", nargs="*", default=DEFAULT_QUESTIONS)
+    args = parser.parse_args()
+
+    # Load once so the first timed run doesn't pay for model loading
+    load_rag_database()
+
+    latencies = {mode: [] for mode in args.modes}
+    for _ in range(args.repeats):
+        for question in args.questions:
+            # Alternate modes per question so Groq load drifts affect both equally
+            for mode in args.modes:
+                latencies[mode].append(time_dialogue(question, mode))
+
+    print("\n" + "="*70)
+    print("⏱️  DIALOGUE MODE LATENCY")
+    print("="*70)
+    print(f"{'Mode':<15}{'Runs':>6}{'Mean (s)':>10}{'Median (s)':>12}{'Min (s)':>10}{'Max (s)':>10}{'Compile (ms)':>14}")
+    print("-" * 77)
+    compile_stats = graph_stats()
+    for mode, values in latencies.items():
+        print(f"{mode:<15}{len(values):>6}{statistics.mean(values):>10.2f}{statistics.median(values):>12.2f}"
+              f"{min(values):>10.2f}{max(values):>10.2f}{compile_stats[mode]['compile_s'] * 1000:>14.0f}")
+
+    if 'debate' in latencies and 'panel' in latencies:
+        speedup = statistics.mean(latencies['debate']) / statistics.mean(latencies['panel'])
+        print(f"\n⚡ Panel mode is {speedup:.2f}x faster than the sequential debate")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Import Time Benchmark
+Measures how long importing the app modules takes in a fresh interpreter
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Dict, Any
+
+DEFAULT_MODULES = ["divine_dialogue_langgraph"]
+
+# Modules that should only be loaded on first use (or by the background warm-up)
+HEAVY_MODULES = [
+    "torch", "sentence_transformers", "faiss", "chromadb", "numpy",
+    "langgraph", "langchain_core", "langchain_groq", "groq", "httpx"
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+_WARMUP_PROBE = """
+import json, time
+import {module} as m
+start = time.perf_counter()
+m.warm_up_in_background().join()
+print(json.dumps({{'seconds': time.perf_counter() - start}}))
+"""
+
+
+def _run_probe(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", code]
+    return subprocess.run(command, capture_output=True, text=True)
+
+
+def _last_json_line(output: str) -> Dict[str, Any]:
+    for line in reversed(output.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"No result from probe:\n{output[-500:]}")
+
+
+def time_import(module: str, repeats: int) -> Dict[str, Any]:
+    """
+    Import module in `repeats` fresh interpreters
+
+    Returns:
+        Dict with per-run seconds and the heavy modules the import pulled in
+    """
+    runs = []
+    heavy = []
+    for _ in range(repeats):
+        proc = _run_probe(_PROBE.format(module=module, heavy=HEAVY_MODULES))
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+        result = _last_json_line(proc.stdout)
+        runs.append(result['seconds'])
+        heavy = result['heavy']
+    return {'module': module, 'runs': runs, 'heavy': heavy}
+
+
+def slowest_imports(module: str, top: int) -> List[Dict[str, Any]]:
+    """Top-level packages by cumulative import time, from python -X importtime"""
+    proc = _run_probe(f"import {module}", importtime=True)
+
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cumulative, name = [part.strip() for part in line.split(":", 1)[1].split("|")]
+            cumulative_us = int(cumulative)
+        except ValueError:
+            continue  # header row
+        root = name.strip().split(".")[0]
+        packages[root] = max(packages.get(root, 0), cumulative_us)
+
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{'package': name, 'ms': us / 1000} for name, us in ranked]
+
+
+def main():
+    """Benchmark import time and print a summary"""
+    parser = argparse.ArgumentParser(description="Measure Divine Dialogue import time")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    parser.add_argument("--warmup", action="store_true",
+                        help="Also time the background warm-up (RAG stack + LLM client)")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("⏱️  IMPORT TIME BENCHMARK")
+    print("="*70)
+
+    for module in args.modules:
+        try:
+            report = time_import(module, args.repeats)
+        except RuntimeError as e:
+            print(f"\n⚠️  Could not import {module}: {e}")
+            continue
+
+        runs = report['runs']
+        print(f"\n📦 import {module}  ({len(runs)} fresh interpreters)")
+        print(f"   median {statistics.median(runs) * 1000:.0f} ms | "
+              f"min {min(runs) * 1000:.0f} ms | max {max(runs) * 1000:.0f} ms")
+
+        if report['heavy']:
+            print(f"   ⚠️  Heavy modules loaded at import: {', '.join(report['heavy'])}")
+        else:
+            print("   ✓ No heavy modules loaded at import")
+
+        print("\n   Slowest packages (cumulative):")
+        for entry in slowest_imports(module, args.top):
+            print(f"   {entry['package']:<28}{entry['ms']:>10.1f} ms")
+
+        if args.warmup:
+            proc = _run_probe(_WARMUP_PROBE.format(module=module))
+            if proc.returncode == 0:
+                print(f"\n   Background warm-up: {_last_json_line(proc.stdout)['seconds']:.2f} s")
+            else:
+                print(f"\n   ⚠️  Warm-up failed: {proc.stderr.strip()[-200:]}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Vector Store Benchmark
+Times the FAISS, ChromaDB and NumPy engines on the same queries
+"""
+
+import argparse
+import math
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from vector_store import BACKENDS, load_vector_store, encode_queries
+
+BENCHMARK_QUERIES = [
+    "How can I find inner peace?",
+    "What is the purpose of life?",
+    "How should I treat my enemies?",
+    "What happens after death?",
+    "How do I overcome suffering?",
+    "What is true love?",
+    "How can I be a better person?",
+    "What is the nature of the soul?",
+    "How do I find happiness?",
+    "What is wisdom?"
+]
+
+MENTORS = ['krishna', 'buddha', 'jesus']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile of a list of values (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def benchmark_backend(backend: str, query_embeddings: np.ndarray, k: int, repeats: int) -> Dict[str, Any]:
+    """
+    Run every query x mentor combination against one backend
+
+    Returns:
+        Dict with load time, per-search latencies (ms) and top references
+    """
+    start = time.perf_counter()
+    store = load_vector_store(backend)
+    load_s = time.perf_counter() - start
+
+    # Warm-up (first call pays for lazy allocations / BLAS thread start-up)
+    store.search(query_embeddings[0], mentor=MENTORS[0], k=k)
+
+    latencies_ms = []
+    top_refs = {}
+    for _ in range(repeats):
+        for qi, query_embedding in enumerate(query_embeddings):
+            for mentor in MENTORS:
+                start = time.perf_counter()
+                results = store.search(query_embedding, mentor=mentor, k=k)
+                latencies_ms.append((time.perf_counter() - start) * 1000)
+                top_refs[(qi, mentor)] = [r['metadata']['reference'] for r in results]
+
+    return {
+        'backend': backend,
+        'vectors': len(store),
+        'load_s': load_s,
+        'latencies_ms': latencies_ms,
+        'top_refs': top_refs
+    }
+
+
+def main():
+    """Benchmark all requested backends and print a comparison table"""
+    parser = argparse.ArgumentParser(description="Benchmark Divine Dialogue vector store backends")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--k", type=int, default=3, help="Results per search")
+    parser.add_argument("--repeats", type=int, default=20, help="Passes over the query set")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("⏱️  VECTOR STORE BENCHMARK")
+    print("="*70)
+
+    # Encode once so every backend sees identical query vectors
+    query_embeddings = encode_queries(BENCHMARK_QUERIES)
+    print(f"\n{len(BENCHMARK_QUERIES)} queries x {len(MENTORS)} mentors x {args.repeats} repeats, k={args.k}\n")
+
+    reports = []
+    for backend in args.backends:
+        try:
+            reports.append(benchmark_backend(backend, query_embeddings, args.k, args.repeats))
+        except Exception as e:
+            print(f"⚠️  Skipping {backend}: {e}")
+
+    if not reports:
+        print("❌ No backend could be loaded. Run: python build_rag_database.py")
+        return
+
+    print(f"{'Backend':<10}{'Vectors':>9}{'Load (s)':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'QPS':>10}")
+    print("-" * 69)
+    for report in reports:
+        latencies = report['latencies_ms']
+        qps = 1000 * len(latencies) / sum(latencies) if latencies else 0.0
+        print(f"{report['backend']:<10}{report['vectors']:>9}{report['load_s']:>10.2f}"
+              f"{percentile(latencies, 50):>10.3f}{percentile(latencies, 95):>10.3f}"
+              f"{percentile(latencies, 99):>10.3f}{qps:>10.0f}")
+
+    # Result agreement against the first backend (all engines are exact L2)
+    baseline = reports[0]
+    for report in reports[1:]:
+        same = sum(
+            1 for key, refs in report['top_refs'].items()
+            if refs == baseline['top_refs'].get(key)
+        )
+        print(f"\n✓ {report['backend']} matches {baseline['backend']} on {same}/{len(report['top_refs'])} result lists")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
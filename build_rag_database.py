@@ -21,6 +21,16 @@ except ImportError:
     print("ERROR: sentence-transformers not installed. Run: pip install sentence-transformers")
     exit(1)
 
+import numpy as np
+
+from vector_store import (
+    EMBEDDING_MODEL_NAME,
+    FAISS_DB_PATH,
+    VectorStore,
+    FaissVectorStore,
+    ChromaVectorStore,
+)
+
 
 class SacredTextsRAG:
     """RAG database builder for sacred texts"""
@@ -36,6 +46,8 @@ class SacredTextsRAG:
         }
         self.vectorstore_type = None
         self.db_path = None
+        self.embedding_model = None
+        self.embeddings = None
         
     def load_bhagavad_gita(self) -> List[Dict[str, Any]]:
         """Load and preprocess Bhagavad Gita verses"""
@@ -164,10 +176,42 @@ class SacredTextsRAG:
         
         print(f"  ✓ Saved {len(self.documents)} documents")
 
+    def load_embedding_model(self) -> SentenceTransformer:
+        """Load the sentence-transformers model once and reuse it"""
+        if self.embedding_model is None:
+            print(f"  🤖 Loading embedding model ({EMBEDDING_MODEL_NAME})...")
+            self.embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        return self.embedding_model
+    
+    def compute_embeddings(self):
+        """
+        Encode all documents once so every vector store backend shares them.
+        
+        Returns:
+            float32 numpy array of shape (num_documents, dimension)
+        """
+        if self.embeddings is not None and len(self.embeddings) == len(self.documents):
+            return self.embeddings
+        
+        model = self.load_embedding_model()
+        texts = [doc["text"] for doc in self.documents]
+        
+        print(f"  🔢 Generating embeddings for {len(texts)} documents...")
+        embeddings = model.encode(texts, show_progress_bar=True, batch_size=32, convert_to_numpy=True)
+        self.embeddings = embeddings.astype('float32')
+        return self.embeddings
+
     def build_vector_database(self):
         """Build vector database with ChromaDB (primary) and FAISS (fallback)"""
         print(f"\n🔨 Building vector database...")
         
+        # Embeddings are computed once here; a FAISS fallback reuses them
+        self.compute_embeddings()
+        
+        # Written whichever backend is built: the NumPy backend and the
+        # verse catalog (saved sessions' citations) read these files
+        self.save_shared_files()
+        
         # Try ChromaDB first
         try:
             return self._build_chromadb()
@@ -183,6 +227,21 @@ class SacredTextsRAG:
                 print(f"    Falling back to FAISS...")
                 return self._build_faiss()
     
+    def save_shared_files(self):
+        """Write texts.json, metadatas.json and embeddings.npy to the FAISS directory"""
+        os.makedirs(FAISS_DB_PATH, exist_ok=True)
+        
+        # Raw vectors for the NumPy engine (no FAISS needed at query time)
+        np.save(os.path.join(FAISS_DB_PATH, "embeddings.npy"), self.compute_embeddings())
+        
+        with open(os.path.join(FAISS_DB_PATH, "texts.json"), 'w', encoding='utf-8') as f:
+            json.dump([doc["text"] for doc in self.documents], f, ensure_ascii=False, indent=2)
+        
+        with open(os.path.join(FAISS_DB_PATH, "metadatas.json"), 'w', encoding='utf-8') as f:
+            json.dump([doc["metadata"] for doc in self.documents], f, ensure_ascii=False, indent=2)
+        
+        print(f"  💾 Texts, metadata and embeddings saved to {FAISS_DB_PATH}")
+    
     def _build_chromadb(self):
         """Build ChromaDB vector database"""
         print(f"  Attempting ChromaDB setup...")
@@ -193,8 +252,10 @@ class SacredTextsRAG:
         db_path = "sacred_texts_rag"
         client = chromadb.PersistentClient(path=db_path)
         
+        # Only used for query_texts at search time; documents are added with
+        # the precomputed embeddings below
         embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
+            model_name=EMBEDDING_MODEL_NAME
         )
         
         collection_name = "sacred_texts"
@@ -212,6 +273,7 @@ class SacredTextsRAG:
         texts = [doc["text"] for doc in self.documents]
         metadatas = [doc["metadata"] for doc in self.documents]
         ids = [f"{doc['metadata']['mentor']}_{i}" for i, doc in enumerate(self.documents)]
+        embeddings = self.compute_embeddings().tolist()
         
         batch_size = 100
         total_batches = (len(texts) + batch_size - 1) // batch_size
@@ -222,8 +284,10 @@ class SacredTextsRAG:
             batch_texts = texts[i:i+batch_size]
             batch_metadatas = metadatas[i:i+batch_size]
             batch_ids = ids[i:i+batch_size]
+            batch_embeddings = embeddings[i:i+batch_size]
             
             collection.add(
+                embeddings=batch_embeddings,
                 documents=batch_texts,
                 metadatas=batch_metadatas,
                 ids=batch_ids
@@ -239,7 +303,7 @@ class SacredTextsRAG:
         
         self.vectorstore_type = "chromadb"
         self.db_path = db_path
-        return ("chromadb", client, collection)
+        return ChromaVectorStore(collection)
     
     def _build_faiss(self):
         """Build FAISS vector database as fallback"""
@@ -253,41 +317,32 @@ class SacredTextsRAG:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "faiss-cpu", "-q"])
             import faiss
         
-        import numpy as np
-        
-        db_path = "sacred_texts_rag_faiss"
-        
-        print("  🤖 Loading embedding model (sentence-transformers/all-MiniLM-L6-v2)...")
-        model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        db_path = FAISS_DB_PATH
         
         texts = [doc["text"] for doc in self.documents]
         metadatas = [doc["metadata"] for doc in self.documents]
         
-        print(f"  🔢 Generating embeddings for {len(texts)} documents...")
-        embeddings = model.encode(texts, show_progress_bar=True, batch_size=32, convert_to_numpy=True)
+        # Reuse the embeddings computed for ChromaDB (no re-encoding)
+        embeddings = self.compute_embeddings()
         
         dimension = embeddings.shape[1]
         index = faiss.IndexFlatL2(dimension)
-        index.add(embeddings.astype('float32'))
+        index.add(embeddings)
         
+        # texts.json, metadatas.json and embeddings.npy were saved alongside
+        # by save_shared_files()
         os.makedirs(db_path, exist_ok=True)
         faiss.write_index(index, os.path.join(db_path, "index.faiss"))
         
-        with open(os.path.join(db_path, "texts.json"), 'w', encoding='utf-8') as f:
-            json.dump(texts, f, ensure_ascii=False, indent=2)
-        
-        with open(os.path.join(db_path, "metadatas.json"), 'w', encoding='utf-8') as f:
-            json.dump(metadatas, f, ensure_ascii=False, indent=2)
-        
         print(f"\n✅ FAISS fallback successful!")
         print(f"  📍 Location: {db_path}")
         print(f"  📝 Total vectors: {index.ntotal}")
         
         self.vectorstore_type = "faiss"
         self.db_path = db_path
-        return ("faiss", {"index": index, "texts": texts, "metadatas": metadatas, "model": model})
+        return FaissVectorStore(index, texts, metadatas)
     
-    def test_semantic_search(self, vectorstore_type: str, vectorstore: Any):
+    def test_semantic_search(self, vectorstore: VectorStore):
         """Test semantic search with sample queries"""
         print("\n🔍 Testing semantic search...\n")
         
@@ -309,68 +364,31 @@ class SacredTextsRAG:
             }
         ]
         
+        model = self.load_embedding_model()
+        query_embeddings = model.encode(
+            [test['query'] for test in test_queries], convert_to_numpy=True
+        ).astype('float32')
+        
         results_summary = []
         
-        for test in test_queries:
+        for test, query_embedding in zip(test_queries, query_embeddings):
             print(f"📌 Query: {test['query']}")
             print(f"   Target Mentor: {test['mentor']}")
             
-            if vectorstore_type == "chromadb":
-                results = vectorstore.query(
-                    query_texts=[test['query']],
-                    n_results=3,
-                    where={"mentor": test['mentor']}
-                )
-                
-                print(f"   Results:")
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results['documents'][0],
-                    results['metadatas'][0],
-                    results['distances'][0]
-                ), 1):
-                    similarity = 1 - distance
-                    print(f"     {i}. [{metadata['reference']}] (similarity: {similarity:.3f})")
-                    print(f"        {doc[:100]}...")
-                
+            results = vectorstore.search(query_embedding, mentor=test['mentor'], k=3)
+            
+            print(f"   Results:")
+            for i, result in enumerate(results, 1):
+                print(f"     {i}. [{result['metadata']['reference']}] (similarity: {result['similarity']:.3f})")
+                print(f"        {result['text'][:100]}...")
+            
+            if results:
                 results_summary.append({
                     "query": test['query'],
                     "mentor": test['mentor'],
-                    "top_result": results['metadatas'][0][0]['reference'],
-                    "similarity": 1 - results['distances'][0][0]
+                    "top_result": results[0]['metadata']['reference'],
+                    "similarity": results[0]['similarity']
                 })
-                
-            else:  # FAISS
-                import numpy as np
-                
-                query_embedding = vectorstore["model"].encode([test['query']], convert_to_numpy=True)
-                
-                k = 50
-                distances, indices = vectorstore["index"].search(query_embedding.astype('float32'), k)
-                
-                filtered_results = []
-                for idx, dist in zip(indices[0], distances[0]):
-                    if vectorstore["metadatas"][idx]["mentor"] == test['mentor']:
-                        filtered_results.append({
-                            "text": vectorstore["texts"][idx],
-                            "metadata": vectorstore["metadatas"][idx],
-                            "distance": dist
-                        })
-                        if len(filtered_results) >= 3:
-                            break
-                
-                print(f"   Results:")
-                for i, result in enumerate(filtered_results, 1):
-                    similarity = 1 / (1 + result['distance'])
-                    print(f"     {i}. [{result['metadata']['reference']}] (similarity: {similarity:.3f})")
-                    print(f"        {result['text'][:100]}...")
-                
-                if filtered_results:
-                    results_summary.append({
-                        "query": test['query'],
-                        "mentor": test['mentor'],
-                        "top_result": filtered_results[0]['metadata']['reference'],
-                        "similarity": 1 / (1 + filtered_results[0]['distance'])
-                    })
             
             print()
         
@@ -445,31 +463,13 @@ class SacredTextsRAG:
         print("You can now use this vector store in your LangGraph application.")
         print()
         
-        if self.vectorstore_type == "chromadb":
-            print("Load it using:")
-            print("  import chromadb")
-            print("  from chromadb.utils import embedding_functions")
-            print()
-            print(f"  client = chromadb.PersistentClient(path='{self.db_path}')")
-            print("  embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(")
-            print("      model_name='sentence-transformers/all-MiniLM-L6-v2'")
-            print("  )")
-            print("  collection = client.get_collection(")
-            print("      name='sacred_texts',")
-            print("      embedding_function=embedding_fn")
-            print("  )")
-        else:  # FAISS
-            print("Load it using:")
-            print("  import faiss")
-            print("  import json")
-            print("  from sentence_transformers import SentenceTransformer")
-            print()
-            print(f"  index = faiss.read_index('{self.db_path}/index.faiss')")
-            print(f"  with open('{self.db_path}/texts.json', 'r') as f:")
-            print("      texts = json.load(f)")
-            print(f"  with open('{self.db_path}/metadatas.json', 'r') as f:")
-            print("      metadatas = json.load(f)")
-            print("  model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')")
+        backend = "chroma" if self.vectorstore_type == "chromadb" else "faiss"
+        print("Load it using:")
+        print("  from vector_store import load_vector_store, encode_queries")
+        print()
+        print(f"  store = load_vector_store('{backend}')  # or 'numpy'")
+        print("  query_embedding = encode_queries(['How can I find inner peace?'])[0]")
+        print("  results = store.search(query_embedding, mentor='buddha', k=3)")
         
         print("-" * 70)
         print()
@@ -491,16 +491,10 @@ def main():
     rag.save_preprocessed()
     
     # Step 3: Build vector database (ChromaDB with FAISS fallback)
-    vectorstore_type, *vectorstore_components = rag.build_vector_database()
-    
-    if vectorstore_type == "chromadb":
-        client, collection = vectorstore_components
-        vectorstore = collection
-    else:  # FAISS
-        vectorstore = vectorstore_components[0]
+    vectorstore = rag.build_vector_database()
     
     # Step 4: Test semantic search
-    results = rag.test_semantic_search(vectorstore_type, vectorstore)
+    results = rag.test_semantic_search(vectorstore)
     
     # Step 5: Print analysis report
     rag.print_analysis_report(results)
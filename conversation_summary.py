@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Rolling Conversation Summaries
+Keeps a bounded summary of each dialogue in the session store, updated
+after every turn on a background thread, so follow-up prompts carry the
+summary plus the latest exchange instead of an ever longer history
+
+Each update folds only the turns the summary does not cover yet into it
+(one fast-tier call), so the cost per turn stays flat.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from divine_dialogue_langgraph import call_llm
+from session_store import SessionStore, get_session_store, history_lines
+
+# Summary budget and worker count (environment overridable)
+SUMMARY_MAX_WORDS = int(os.getenv("DIVINE_SUMMARY_MAX_WORDS", "150"))
+SUMMARY_MAX_TOKENS = int(os.getenv("DIVINE_SUMMARY_MAX_TOKENS", "250"))
+SUMMARY_WORKERS = int(os.getenv("DIVINE_SUMMARY_WORKERS", "2"))
+
+SUMMARY_SYSTEM_PROMPT = "You keep a running summary of a spiritual guidance conversation. Reply with the updated summary only, as plain prose."
+
+
+def _summary_prompt(previous_summary: str, new_lines: List[str], max_words: int) -> str:
+    new_turns = "\n\n".join(new_lines)
+    return f"""CURRENT SUMMARY:
+{previous_summary or '(none yet - this is the start of the conversation)'}
+
+NEW TURNS:
+{new_turns}
+
+Rewrite the summary so it also covers the new turns, in at most {max_words} words.
+Keep: the user's situation and original question, each mentor's key teaching (with verse references), the advice already given and what the user has asked since.
+Drop: greetings, repetition and wording that adds no new point."""
+
+
+def update_summary(previous_summary: str, new_lines: List[str], max_words: int = SUMMARY_MAX_WORDS) -> str:
+    """
+    Fold new conversation lines into a summary with one fast-tier call
+
+    Raises:
+        LLMError: the call failed (the caller keeps the previous summary)
+    """
+    summary = call_llm(SUMMARY_SYSTEM_PROMPT, _summary_prompt(previous_summary, new_lines, max_words),
+                       max_tokens=SUMMARY_MAX_TOKENS, use_cache=True, tier='fast')
+    return summary.strip() or previous_summary
+
+
+class RollingSummarizer:
+    """
+    Updates dialogue summaries off the request path
+
+    schedule() returns at once. Updates for one dialogue never overlap:
+    turns added while one is running are folded in by a single follow-up
+    pass, however many arrive.
+    """
+
+    def __init__(self, store: Optional[SessionStore] = None, workers: int = SUMMARY_WORKERS):
+        self.store = store or get_session_store()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="divine-summary")
+        self._lock = threading.Lock()
+        self._running: Set[Tuple[str, int]] = set()
+        self._dirty: Set[Tuple[str, int]] = set()
+        self.updates = 0
+        self.failures = 0
+
+    def schedule(self, session_id: str, dialogue_ref: int):
+        """Bring the dialogue's summary up to date in the background"""
+        key = (session_id, dialogue_ref)
+        with self._lock:
+            if key in self._running:
+                self._dirty.add(key)
+                return
+            self._running.add(key)
+        self._executor.submit(self._run, key)
+
+    def context(self, session_id: str, dialogue_ref: int) -> Tuple[str, List[str]]:
+        """
+        What a follow-up prompt needs: (summary, latest lines)
+
+        The latest lines are the turns the summary does not cover yet, or
+        the last turn when it is fully up to date. Without a summary (not
+        written yet) they are the whole conversation.
+        """
+        summary, covered = self.store.get_summary(session_id, dialogue_ref)
+        recent = self.store.get_turns(session_id, dialogue_ref, after_id=covered)
+        if not recent:
+            recent = self.store.get_turns(session_id, dialogue_ref, limit=1)
+        return summary, history_lines(recent)
+
+    def flush(self, timeout: float = 30.0):
+        """Wait (up to timeout) until no update is running"""
+        deadline = time.monotonic() + timeout
+        while self._running and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'updates': self.updates, 'failures': self.failures, 'running': len(self._running)}
+
+    def _run(self, key: Tuple[str, int]):
+        while True:
+            try:
+                self._update(*key)
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️  Conversation summary update failed (kept the previous one): {e}")
+
+            with self._lock:
+                if key in self._dirty:
+                    self._dirty.discard(key)
+                    continue
+                self._running.discard(key)
+                return
+
+    def _update(self, session_id: str, dialogue_ref: int):
+        summary, covered = self.store.get_summary(session_id, dialogue_ref)
+        new_turns = self.store.get_turns(session_id, dialogue_ref, after_id=covered)
+        if not new_turns:
+            return
+
+        summary = update_summary(summary, history_lines(new_turns))
+        self.store.set_summary(session_id, dialogue_ref, summary, new_turns[-1]['id'])
+        self.updates += 1
+
+
+_summarizer: Optional[RollingSummarizer] = None
+_summarizer_lock = threading.Lock()
+
+
+def get_summarizer() -> RollingSummarizer:
+    """Process-wide summarizer over the shared session store"""
+    global _summarizer
+
+    if _summarizer is None:
+        with _summarizer_lock:
+            if _summarizer is None:
+                _summarizer = RollingSummarizer()
+    return _summarizer
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Background Dialogue Jobs
+Process-wide worker pool that runs dialogues as jobs with ids, per-node
+progress, partial text and cooperative cancellation, for UIs to poll
+"""
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from divine_dialogue_langgraph import run_divine_dialogue, MENTOR_ORDER
+
+# Pool configuration (environment overridable)
+DIALOGUE_JOB_WORKERS = int(os.getenv("DIVINE_JOB_WORKERS", "4"))
+DIALOGUE_JOB_RETENTION_S = float(os.getenv("DIVINE_JOB_RETENTION_S", "3600"))
+
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+
+
+class DialogueCancelled(Exception):
+    """Raised inside a job's callbacks to stop its dialogue at the next checkpoint"""
+
+
+def expected_nodes(mode: str, mentor: Optional[str] = None) -> List[str]:
+    """Graph nodes a dialogue in this mode runs, in order"""
+    if mode == 'debate':
+        return ['prefetch'] + MENTOR_ORDER + ['moderator']
+    if mode == 'panel':
+        return MENTOR_ORDER + ['moderator']
+    if mode == 'single_mentor':
+        return [(mentor or '').lower()]
+    return [mode]
+
+
+class DialogueJob:
+    """
+    One dialogue submitted to the pool
+
+    Workers update it through on_token / on_node; readers take a
+    consistent copy with snapshot(). Cancellation is cooperative: the
+    next node start or streamed chunk raises DialogueCancelled.
+    """
+
+    def __init__(self, question: str, background: str = '', mode: str = 'debate',
+                 mentor: Optional[str] = None, dialogue_id: Optional[str] = None,
+                 deadline_s: Optional[float] = None):
+        self.id = uuid.uuid4().hex
+        self.question = question
+        self.background = background
+        self.mode = mode
+        self.mentor = mentor
+        self.dialogue_id = dialogue_id or self.id
+        self.deadline_s = deadline_s
+
+        self.status = 'queued'
+        self.nodes: Dict[str, str] = {}  # node -> 'running' / 'done' / 'failed'
+        self.partial: Dict[str, str] = {}  # speaker -> text streamed so far
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Ask the job to stop (takes effect at its next node or chunk)"""
+        self._cancel.set()
+
+    def on_token(self, speaker: str, chunk: str):
+        if self._cancel.is_set():
+            raise DialogueCancelled(f"Dialogue job {self.id} was cancelled")
+        with self._lock:
+            self.partial[speaker] = self.partial.get(speaker, '') + chunk
+
+    def on_node(self, node: str, event: str, error: bool = False):
+        if event == 'start' and self._cancel.is_set():
+            raise DialogueCancelled(f"Dialogue job {self.id} was cancelled")
+        with self._lock:
+            if event == 'start':
+                self.nodes[node] = 'running'
+            else:
+                self.nodes[node] = 'failed' if error else 'done'
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Thread-safe copy of the job's status for polling"""
+        with self._lock:
+            nodes = dict(self.nodes)
+            partial = dict(self.partial)
+
+        planned = expected_nodes(self.mode, self.mentor)
+        done = [node for node in planned if nodes.get(node) == 'done']
+        running = [node for node, state in nodes.items() if state == 'running']
+        end = self.finished or time.time()
+
+        return {
+            'job_id': self.id,
+            'dialogue_id': self.dialogue_id,
+            'status': self.status,
+            'mode': self.mode,
+            'question': self.question,
+            'user_background': self.background,
+            'nodes': nodes,
+            'current_node': running[0] if running else None,
+            'progress': len(done) / len(planned) if planned else 0.0,
+            'partial': partial,
+            'cancel_requested': self.cancel_requested,
+            'result': self.result,
+            'error': self.error,
+            'queued_s': (self.started or end) - self.created,
+            'elapsed_s': end - (self.started or end)
+        }
+
+
+class DialogueJobManager:
+    """
+    Runs dialogue jobs on a shared thread pool
+
+    Every session submits here, so the number of dialogues in flight is
+    bounded by max_workers no matter how many users are connected; the
+    rest wait as 'queued'. Finished jobs are kept for retention_s so
+    reconnecting clients can still collect their results.
+    """
+
+    def __init__(self, max_workers: int = DIALOGUE_JOB_WORKERS,
+                 retention_s: float = DIALOGUE_JOB_RETENTION_S):
+        self.max_workers = max_workers
+        self.retention_s = retention_s
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="divine-dialogue-job")
+        self._jobs: Dict[str, DialogueJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, question: str, background: str = '', mode: str = 'debate',
+               mentor: Optional[str] = None, dialogue_id: Optional[str] = None,
+               deadline_s: Optional[float] = None) -> str:
+        """
+        Queue a dialogue
+
+        Args:
+            question, background, mode, mentor: As for run_divine_dialogue
+            dialogue_id: Checkpoint key (an interrupted dialogue's id resumes it)
+            deadline_s: Optional time budget, counted from when the job starts running
+
+        Returns:
+            The job id to poll with status()
+        """
+        job = DialogueJob(question, background, mode, mentor, dialogue_id, deadline_s)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+        return job.id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of a job, or None if unknown (or expired)"""
+        job = self._jobs.get(job_id)
+        return job.snapshot() if job else None
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; False if the job is unknown or already finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.status in ('completed', 'failed', 'cancelled'):
+            return False
+        job.cancel()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status plus pool size"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        counts = {status: statuses.count(status) for status in JOB_STATUSES}
+        return {'workers': self.max_workers, 'jobs': len(statuses), **counts}
+
+    def _run(self, job: DialogueJob):
+        if job.cancel_requested:
+            job.status = 'cancelled'
+            job.finished = time.time()
+            return
+
+        job.status = 'running'
+        job.started = time.time()
+        try:
+            result = run_divine_dialogue(
+                job.question, job.background,
+                on_token=job.on_token, on_node=job.on_node,
+                mode=job.mode, mentor=job.mentor, dialogue_id=job.dialogue_id,
+                deadline_s=job.deadline_s
+            )
+        except Exception as e:
+            result = {'error': str(e), 'error_type': type(e).__name__}
+
+        job.result = result
+        if result.get('error_type') == DialogueCancelled.__name__:
+            job.status = 'cancelled'
+        elif 'error' in result:
+            job.status = 'failed'
+            job.error = result['error']
+        else:
+            job.status = 'completed'
+        job.finished = time.time()
+
+    def _prune(self):
+        """Forget finished jobs older than retention_s (caller holds the lock)"""
+        cutoff = time.time() - self.retention_s
+        for job_id in [jid for jid, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+
+_manager: Optional[DialogueJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> DialogueJobManager:
+    """Process-wide job manager shared by every session"""
+    global _manager
+
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = DialogueJobManager()
+    return _manager
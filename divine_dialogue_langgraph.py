@@ -7,29 +7,95 @@ LangGraph orchestration with Krishna, Buddha, and Jesus mentors
 import os
 import json
 import re
-from typing import TypedDict, List, Dict, Any, Annotated
+import asyncio
+import threading
+import time
+import uuid
+import inspect
+import contextvars
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from typing import TypedDict, List, Dict, Any, Annotated, Callable, Iterator, Optional, Tuple, TYPE_CHECKING
 from operator import add
 
-import faiss
-from sentence_transformers import SentenceTransformer
-from langgraph.graph import StateGraph, END
+from llm_cache import get_llm_cache
+from prompt_budget import PromptBuilder, REQUIRED
+from model_router import MODEL_TIERS, DEFAULT_TIER, ModelRouter, message_usage
+from graph_registry import GraphRegistry
+from timings import collect_timings, record_timing, timed
+from llm_scheduler import (
+    LLMError,
+    LLMUnavailableError,
+    get_scheduler,
+    estimate_tokens,
+)
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+# Heavy dependencies (LangGraph, LangChain, Groq SDK, sentence-transformers,
+# FAISS) are imported on first use, so importing this module stays cheap
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+    from vector_store import VectorStore
+
+# LangGraph passes the run config to nodes with a "config" parameter; a plain
+# alias of langchain_core's RunnableConfig keeps LangChain out of import time
+RunnableConfig = Dict[str, Any]
+
 # Switch to Groq API - The fastest LLM in the world (300+ tokens/second)
-try:
-    from langchain_groq import ChatGroq
-    from langchain_core.messages import SystemMessage, HumanMessage
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
+GROQ_AVAILABLE = importlib.util.find_spec("langchain_groq") is not None
+if not GROQ_AVAILABLE:
     print("⚠️ Warning: langchain-groq not installed. Install with: pip install langchain-groq")
 
+GROQ_MODEL_NAME = MODEL_TIERS['quality']['model']
+
+# "groq" (default) or "fake" - the deterministic offline provider in fake_llm.py
+LLM_PROVIDER = os.getenv("DIVINE_LLM_PROVIDER", "groq").strip().lower()
+
+# Optional Groq-compatible endpoint, e.g. the local stand-in: python fake_llm.py
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
+
+# Connection pool size shared by every Groq call in this process
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+
+
+def _http_limits():
+    """Connection pool limits for the Groq HTTP clients"""
+    import httpx
+    return httpx.Limits(
+        max_connections=GROQ_MAX_CONNECTIONS,
+        max_keepalive_connections=GROQ_MAX_CONNECTIONS
+    )
+
+
+def _create_groq_model(api_key: str, model_name: str = GROQ_MODEL_NAME, temperature: float = 0.7, **client_kwargs):
+    """Create a ChatGroq client with the app's model settings"""
+    from langchain_groq import ChatGroq
+    
+    # Default is llama-3.3-70b-versatile (best for spiritual wisdom); short
+    # utility calls go to the "fast" tier (llama-3.1-8b-instant) via the router
+    if GROQ_BASE_URL:
+        client_kwargs.setdefault('base_url', GROQ_BASE_URL)
+    
+    return ChatGroq(
+        model=model_name,
+        groq_api_key=api_key,
+        temperature=temperature,
+        max_retries=0,  # Retries, backoff and rate limits are owned by llm_scheduler
+        **client_kwargs
+    )
+
+
 # Initialize Groq model (fastest free LLM)
 def initialize_groq_model():
     """Initialize Groq model with API key check - Lightning fast responses!"""
+    if LLM_PROVIDER == "fake":
+        from fake_llm import FakeChatModel
+        print("🧪 Using the offline fake LLM provider (DIVINE_LLM_PROVIDER=fake)")
+        return FakeChatModel(GROQ_MODEL_NAME)
+    
     if not GROQ_AVAILABLE:
         return None
     
@@ -40,48 +106,196 @@ def initialize_groq_model():
         return None
     
     try:
-        # Use llama-3.3-70b-versatile - Latest, best quality, currently available
-        # Alternative: "llama-3.1-8b-instant" (even faster) or "openai/gpt-oss-20b" (very fast)
-        model = ChatGroq(
-            model="llama-3.3-70b-versatile",  # Latest version - best for spiritual wisdom
-            groq_api_key=api_key,
-            temperature=0.7
-        )
+        import httpx
+        # One pooled HTTP client reused by every sync call (keep-alive connections)
+        model = _create_groq_model(api_key, http_client=httpx.Client(limits=_http_limits()))
         print("⚡ Groq model initialized - Lightning fast responses enabled!")
         return model
     except Exception as e:
         print(f"⚠️ Warning: Failed to initialize Groq model: {e}")
         return None
 
-groq_model = initialize_groq_model()
+_groq_model = None
+_groq_model_ready = False
+_groq_model_lock = threading.Lock()
+
+
+def get_groq_model():
+    """
+    The shared chat model client, created on first use
+    
+    Returns:
+        The client, or None when Groq is not installed / configured
+    """
+    global _groq_model, _groq_model_ready
+    
+    if not _groq_model_ready:
+        with _groq_model_lock:
+            if not _groq_model_ready:
+                _groq_model = initialize_groq_model()
+                _groq_model_ready = True
+    return _groq_model
+
+
+def _tier_client_factory(tier_config: Dict[str, Any], async_client: bool):
+    """
+    Create a ChatGroq client for a model tier
+    
+    Every tier shares the pooled sync HTTP client; async clients get a
+    pool of their own on the running event loop.
+    """
+    if LLM_PROVIDER == "fake":
+        from fake_llm import FakeChatModel
+        return FakeChatModel(tier_config['model'], temperature=tier_config['temperature'])
+    
+    client_kwargs = {'http_client': get_groq_model().http_client}
+    if async_client:
+        import httpx
+        client_kwargs['http_async_client'] = httpx.AsyncClient(limits=_http_limits())
+    
+    return _create_groq_model(
+        os.getenv("GROQ_API_KEY"),
+        model_name=tier_config['model'],
+        temperature=tier_config['temperature'],
+        **client_kwargs
+    )
+
+
+# Tier -> client routing, with per-tier latency and token accounting
+model_router = ModelRouter(_tier_client_factory)
+
+
+def model_tier_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tier call counts, cache hits, latency and token usage"""
+    return model_router.stats()
+
+
+# One event loop, on a daemon thread, runs every non-streaming LLM call and
+# retrieval (acall_llm, aretrieve_verses, ...). Prefetches are tasks on it, so
+# waiting on Groq costs them a coroutine rather than a pool thread; the sync
+# wrappers (call_llm, retrieve_verses, ...) block their caller on the result.
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+
+
+def _get_async_loop() -> asyncio.AbstractEventLoop:
+    """The shared event loop, started on first use"""
+    global _async_loop
+    
+    if _async_loop is None:
+        with _async_loop_lock:
+            if _async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="divine-async", daemon=True).start()
+                _async_loop = loop
+    return _async_loop
+
+
+def submit_async(coro) -> Future:
+    """
+    Schedule a coroutine on the shared event loop
+    
+    The task runs in a copy of the caller's context, so its timings land in
+    the calling dialogue. Cancelling the returned future cancels the task.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_async_loop())
+
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    loop = _get_async_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Blocking call made on the shared event loop; await the async variant instead")
+    return submit_async(coro).result()
 
 # Global RAG components (loaded once)
-RAG_INDEX = None
-RAG_TEXTS = None
-RAG_METADATAS = None
+RAG_STORE: "VectorStore" = None
 RAG_MODEL = None
+_rag_lock = threading.Lock()
 
 
-def load_rag_database():
-    """Load FAISS RAG database (called once at startup)"""
-    global RAG_INDEX, RAG_TEXTS, RAG_METADATAS, RAG_MODEL
+def load_rag_database(backend: str = None):
+    """
+    Load the RAG vector store and embedding model (called once at startup)
+    
+    Args:
+        backend: Vector store backend ("faiss", "chroma" or "numpy").
+            Defaults to DIVINE_VECTOR_BACKEND, then whichever database exists.
+    """
+    global RAG_STORE, RAG_MODEL
     
-    if RAG_INDEX is not None:
+    if RAG_STORE is not None:
         return  # Already loaded
     
-    print("📚 Loading RAG database...")
+    # A background warm-up and the first request may race to load
+    with _rag_lock:
+        if RAG_STORE is not None:
+            return
+        
+        print("📚 Loading RAG database...")
+        
+        from vector_store import load_vector_store, get_embedding_model
+        
+        store = load_vector_store(backend)
+        RAG_MODEL = get_embedding_model()
+        RAG_STORE = store
+        
+        print(f"✓ Loaded {len(RAG_STORE)} verses ({RAG_STORE.backend})")
+
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+def warm_up_in_background() -> threading.Thread:
+    """
+    Load the RAG stack, the LLM client and LangGraph on a daemon thread
     
-    RAG_INDEX = faiss.read_index('sacred_texts_rag_faiss/index.faiss')
+    Lets a UI render immediately while the heavy imports happen; the first
+    dialogue then finds everything loaded. Safe to call repeatedly.
+    """
+    global _warmup_thread
     
-    with open('sacred_texts_rag_faiss/texts.json', 'r', encoding='utf-8') as f:
-        RAG_TEXTS = json.load(f)
+    def warm_up():
+        try:
+            load_rag_database()
+            get_groq_model()
+            graph_registry.compile_all()  # LangGraph import + compiles paid off the request path
+        except Exception as e:
+            print(f"⚠️  Background warm-up failed (will retry on first use): {e}")
     
-    with open('sacred_texts_rag_faiss/metadatas.json', 'r', encoding='utf-8') as f:
-        RAG_METADATAS = json.load(f)
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name="divine-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+MEANING_SYSTEM_PROMPT = "You are a spiritual scholar explaining sacred texts."
+
+
+def _build_meaning_prompt(verse_text: str, verse_reference: str, mentor: str, user_question: str) -> str:
+    """Build the one-sentence verse explanation prompt"""
+    mentor_names = {
+        'krishna': 'the Bhagavad Gita',
+        'buddha': 'the Dhammapada',
+        'jesus': 'the Gospels'
+    }
     
-    RAG_MODEL = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    source_name = mentor_names.get(mentor, 'sacred text')
     
-    print(f"✓ Loaded {RAG_INDEX.ntotal} verses")
+    return f"""Explain what this verse from {source_name} teaches in one concise sentence (15-20 words).
+Focus on the core teaching or principle, especially as it relates to: "{user_question}"
+
+Verse: {verse_reference}
+Text: {verse_text[:300]}
+
+Provide only the explanation, no preamble or quotation marks."""
 
 
 def generate_verse_meaning(verse_text: str, verse_reference: str, mentor: str, user_question: str) -> str:
@@ -97,31 +311,190 @@ def generate_verse_meaning(verse_text: str, verse_reference: str, mentor: str, u
     Returns:
         A brief explanation of what the verse teaches
     """
+    return run_async(agenerate_verse_meaning(verse_text, verse_reference, mentor, user_question))
+
+
+async def agenerate_verse_meaning(verse_text: str, verse_reference: str, mentor: str, user_question: str) -> str:
+    """
+    Async version of generate_verse_meaning
+    
+    Args:
+        verse_text: The verse text
+        verse_reference: The verse reference (e.g., "Gita 2.47")
+        mentor: The mentor name (krishna, buddha, jesus)
+        user_question: The user's question for context
+    
+    Returns:
+        A brief explanation of what the verse teaches
+    """
+    meaning_prompt = _build_meaning_prompt(verse_text, verse_reference, mentor, user_question)
+    
+    try:
+        meaning = await acall_llm(MEANING_SYSTEM_PROMPT, meaning_prompt, max_tokens=50, use_cache=True, tier='fast')
+        return meaning.strip()
+    except Exception:
+        # Fallback if meaning generation fails
+        return f"Teaches about {mentor}'s wisdom"
+
+
+BATCH_MEANING_SYSTEM_PROMPT = "You are a spiritual scholar explaining sacred texts. You reply with a single JSON object and nothing else."
+
+# Output budget per verse in a batched meaning call (15-20 words + JSON key)
+BATCH_MEANING_TOKENS_PER_VERSE = 45
+
+
+def _fallback_meaning(mentor: str) -> str:
+    """Generic meaning used when no explanation could be generated"""
+    return f"Teaches about {mentor}'s wisdom regarding the question"
+
+
+def _build_batch_meaning_prompt(verses_by_mentor: Dict[str, List[Dict[str, Any]]], user_question: str) -> str:
+    """Build one prompt asking for every verse's meaning as a JSON object"""
     mentor_names = {
         'krishna': 'the Bhagavad Gita',
         'buddha': 'the Dhammapada',
         'jesus': 'the Gospels'
     }
     
-    source_name = mentor_names.get(mentor, 'sacred text')
+    verse_blocks = []
+    for mentor, verses in verses_by_mentor.items():
+        source_name = mentor_names.get(mentor, 'sacred text')
+        for verse in verses:
+            verse_blocks.append(f"[{verse['reference']}] ({source_name})\n{verse['text'][:300]}")
+    
+    verse_list = "\n\n".join(verse_blocks)
     
-    meaning_prompt = f"""Explain what this verse from {source_name} teaches in one concise sentence (15-20 words).
+    return f"""For each verse below, explain what it teaches in one concise sentence (15-20 words).
 Focus on the core teaching or principle, especially as it relates to: "{user_question}"
 
-Verse: {verse_reference}
-Text: {verse_text[:300]}
+{verse_list}
 
-Provide only the explanation, no preamble or quotation marks."""
+Return ONLY a JSON object that maps each verse reference, exactly as written inside the square brackets, to its explanation.
+Example: {{"2.47": "Teaches acting from duty without attachment to results."}}
+No preamble, no code fences, no quotation marks inside explanations."""
+
+
+def _normalize_reference(reference: str) -> str:
+    return re.sub(r'[^a-z0-9:.]', '', reference.lower())
+
+
+def _parse_batch_meanings(text: str, references: List[str]) -> Dict[str, str]:
+    """
+    Extract {reference: meaning} from a batched meaning response
+    
+    Tolerates code fences, surrounding prose, slightly altered keys and
+    line-oriented "reference: meaning" output when the JSON is broken.
+    
+    Args:
+        text: Raw model output
+        references: References that were asked for
+    
+    Returns:
+        Meanings for every reference that could be recovered
+    """
+    if not text:
+        return {}
+    
+    by_normalized = {_normalize_reference(ref): ref for ref in references}
+    meanings = {}
+    
+    def _accept(key: str, value: Any):
+        ref = by_normalized.get(_normalize_reference(str(key)))
+        if ref and isinstance(value, str) and value.strip() and ref not in meanings:
+            meanings[ref] = value.strip().strip('"').strip()
+    
+    # 1. A JSON object somewhere in the text
+    cleaned = re.sub(r'```(?:json)?', '', text)
+    start, end = cleaned.find('{'), cleaned.rfind('}')
+    if start != -1 and end > start:
+        try:
+            parsed = json.loads(cleaned[start:end + 1])
+            if isinstance(parsed, dict):
+                for key, value in parsed.items():
+                    _accept(key, value)
+        except json.JSONDecodeError:
+            pass
+    
+    # 2. "key": "value" pairs from broken JSON, or "[ref] meaning" / "ref: meaning" lines
+    if len(meanings) < len(references):
+        for key, value in re.findall(r'"([^"]+)"\s*:\s*"([^"]*)"', cleaned):
+            _accept(key, value)
+    if len(meanings) < len(references):
+        # The reference must open the line and end at a delimiter, so "2.4"
+        # never claims the "2.47" line nor "Verse 1" the "Verse 12" line
+        line_patterns = [
+            (ref, re.compile(rf'^\W*(?:\d+[.)]\s+)?{re.escape(ref)}(?!\w)'))
+            for ref in references
+        ]
+        for line in cleaned.splitlines():
+            for ref, pattern in line_patterns:
+                match = pattern.match(line)
+                if ref not in meanings and match:
+                    _accept(ref, line[match.end():].lstrip(' ]"\':-–'))
+                    break
+    
+    return meanings
+
+
+def generate_verse_meanings_batch(verses_by_mentor: Dict[str, List[Dict[str, Any]]], user_question: str):
+    """
+    Fill in every verse's 'meaning' with a single LLM call
+    
+    Replaces one generate_verse_meaning call per verse (each repeating the
+    same instructions) with one structured JSON request. Verses the
+    response does not cover fall back to an individual call; if the batch
+    call itself fails, every verse gets the generic fallback meaning.
+    
+    Args:
+        verses_by_mentor: {mentor: [verse dicts]} - updated in place
+        user_question: The user's question for context
+    """
+    run_async(agenerate_verse_meanings_batch(verses_by_mentor, user_question))
+
+
+async def agenerate_verse_meanings_batch(verses_by_mentor: Dict[str, List[Dict[str, Any]]], user_question: str):
+    """
+    Async version of generate_verse_meanings_batch (per-verse fallbacks run concurrently)
+    
+    Args:
+        verses_by_mentor: {mentor: [verse dicts]} - updated in place
+        user_question: The user's question for context
+    """
+    all_verses = [(mentor, v) for mentor, verses in verses_by_mentor.items() for v in verses]
+    if not all_verses:
+        return
+    
+    references = [v['reference'] for _, v in all_verses]
+    prompt = _build_batch_meaning_prompt(verses_by_mentor, user_question)
     
     try:
-        meaning = call_llm("You are a spiritual scholar explaining sacred texts.", meaning_prompt, max_tokens=50)
-        return meaning.strip()
-    except Exception as e:
-        # Fallback if meaning generation fails
-        return f"Teaches about {mentor}'s wisdom"
+        response = await acall_llm(
+            BATCH_MEANING_SYSTEM_PROMPT, prompt,
+            max_tokens=BATCH_MEANING_TOKENS_PER_VERSE * len(all_verses) + 20,
+            use_cache=True,
+            tier='fast'
+        )
+    except LLMError as e:
+        print(f"⚠️  Warning: Batched meaning generation failed: {e}")
+        for mentor, verse in all_verses:
+            verse['meaning'] = _fallback_meaning(mentor)
+        return
+    
+    meanings = _parse_batch_meanings(response, references)
+    
+    # Per-verse fallback for anything the batch response missed
+    missing = [(mentor, v) for mentor, v in all_verses if v['reference'] not in meanings]
+    fallbacks = await asyncio.gather(
+        *[agenerate_verse_meaning(v['text'], v['reference'], mentor, user_question) for mentor, v in missing]
+    )
+    for (mentor, verse), meaning in zip(missing, fallbacks):
+        meanings[verse['reference']] = meaning
+    
+    for mentor, verse in all_verses:
+        verse['meaning'] = meanings[verse['reference']]
 
 
-def retrieve_verses(query: str, mentor: str, k: int = 3) -> List[Dict[str, Any]]:
+def retrieve_verses(query: str, mentor: str, k: int = 3, with_meanings: bool = True) -> List[Dict[str, Any]]:
     """
     Retrieve relevant verses from RAG database and add meaning explanations
     
@@ -129,49 +502,115 @@ def retrieve_verses(query: str, mentor: str, k: int = 3) -> List[Dict[str, Any]]
         query: Search query (user's question)
         mentor: Filter by mentor (krishna, buddha, jesus)
         k: Number of results to return
+        with_meanings: False skips the meaning call (generic meanings instead)
     
     Returns:
         List of verse dictionaries with text, reference, metadata, and meaning
     """
-    if RAG_INDEX is None:
+    return run_async(aretrieve_verses(query, mentor, k, with_meanings))
+
+
+def _add_fallback_meanings(verses_by_mentor: Dict[str, List[Dict[str, Any]]]):
+    """Give every verse the generic meaning (no LLM call)"""
+    for mentor, verses in verses_by_mentor.items():
+        for verse in verses:
+            verse['meaning'] = _fallback_meaning(mentor)
+
+
+def retrieve_verses_for_mentors(query: str, mentors: List[str], k: int = 3,
+                                with_meanings: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Retrieve verses for several mentors with a single meaning call for all of them
+    
+    Args:
+        query: Search query (user's question)
+        mentors: Mentor keys (krishna, buddha, jesus)
+        k: Number of results per mentor
+        with_meanings: False skips the meaning call (generic meanings instead)
+    
+    Returns:
+        {mentor: list of verse dictionaries with meanings}
+    """
+    return run_async(aretrieve_verses_for_mentors(query, mentors, k, with_meanings))
+
+
+async def aretrieve_verses(query: str, mentor: str, k: int = 3, with_meanings: bool = True) -> List[Dict[str, Any]]:
+    """
+    Async version of retrieve_verses
+    
+    Embedding and search run in a worker thread; the batched meaning call
+    runs on the event loop.
+    
+    Args:
+        query: Search query (user's question)
+        mentor: Filter by mentor (krishna, buddha, jesus)
+        k: Number of results to return
+        with_meanings: False skips the meaning call (generic meanings instead)
+    
+    Returns:
+        List of verse dictionaries with text, reference, metadata, and meaning
+    """
+    with timed('retrieval', mentor, k=k):
+        verses = await asyncio.to_thread(_search_verses, query, mentor, k)
+        
+        # One meaning call for all k verses
+        if with_meanings:
+            with timed('meanings', mentor, verses=len(verses)):
+                await agenerate_verse_meanings_batch({mentor: verses}, query)
+        else:
+            _add_fallback_meanings({mentor: verses})
+    
+    return verses
+
+
+async def aretrieve_verses_for_mentors(query: str, mentors: List[str], k: int = 3,
+                                       with_meanings: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Async version of retrieve_verses_for_mentors
+    
+    Args:
+        query: Search query (user's question)
+        mentors: Mentor keys (krishna, buddha, jesus)
+        k: Number of results per mentor
+        with_meanings: False skips the meaning call (generic meanings instead)
+    
+    Returns:
+        {mentor: list of verse dictionaries with meanings}
+    """
+    with timed('retrieval', ",".join(mentors), k=k):
+        verses_by_mentor = {mentor: await asyncio.to_thread(_search_verses, query, mentor, k) for mentor in mentors}
+        
+        if with_meanings:
+            with timed('meanings', ",".join(mentors), verses=sum(len(v) for v in verses_by_mentor.values())):
+                await agenerate_verse_meanings_batch(verses_by_mentor, query)
+        else:
+            _add_fallback_meanings(verses_by_mentor)
+    
+    return verses_by_mentor
+
+
+def _search_verses(query: str, mentor: str, k: int) -> List[Dict[str, Any]]:
+    """Embed the query and search the vector store (no LLM calls)"""
+    if RAG_STORE is None:
         load_rag_database()
     
     # Generate query embedding
-    query_embedding = RAG_MODEL.encode([query], convert_to_numpy=True)
+    with timed('encode', mentor):
+        query_embedding = RAG_MODEL.encode([query], convert_to_numpy=True).astype('float32')[0]
     
-    # Search FAISS (get more results to filter by mentor)
-    search_k = 50
-    distances, indices = RAG_INDEX.search(query_embedding.astype('float32'), search_k)
+    # Search the vector store, filtered by mentor
+    with timed('search', mentor, k=k, backend=RAG_STORE.backend):
+        matches = RAG_STORE.search(query_embedding, mentor=mentor, k=k)
     
-    # Filter by mentor and collect results
     results = []
-    for idx, dist in zip(indices[0], distances[0]):
-        metadata = RAG_METADATAS[idx]
-        
-        if metadata['mentor'] != mentor:
-            continue
-        
-        verse_text = RAG_TEXTS[idx]
-        verse_reference = metadata['reference']
-        
-        # Generate meaning for the verse (with error handling)
-        try:
-            meaning = generate_verse_meaning(verse_text, verse_reference, mentor, query)
-        except Exception as e:
-            print(f"⚠️  Warning: Could not generate meaning for {verse_reference}: {e}")
-            # Fallback meaning
-            meaning = f"Teaches about {mentor}'s wisdom regarding the question"
-        
+    for match in matches:
+        metadata = match['metadata']
         results.append({
-            'text': verse_text,
-            'reference': verse_reference,
+            'text': match['text'],
+            'reference': metadata['reference'],
             'source': metadata['source'],
-            'similarity': 1 / (1 + dist),
-            'meaning': meaning  # Add meaning field
+            'similarity': match['similarity']
         })
-        
-        if len(results) >= k:
-            break
     
     # If we didn't get enough results, return what we have (better than nothing)
     if len(results) == 0:
@@ -180,16 +619,207 @@ def retrieve_verses(query: str, mentor: str, k: int = 3) -> List[Dict[str, Any]]
     return results
 
 
+def _merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer that merges per-mentor dicts written by parallel nodes"""
+    return {**(left or {}), **(right or {})}
+
+
+# Background retrieval for mentors who have not spoken yet
+PREFETCH_MAX_AGE_S = 600
+
+_prefetch_lock = threading.Lock()
+_prefetched: Dict[str, Dict[str, Any]] = {}  # prefetch_id -> {'created': ts, 'futures': {mentor: Future}}
+
+
+def start_prefetch(query: str, mentors: List[str], k: int = 3, with_meanings: bool = True,
+                   prefetch_id: Optional[str] = None) -> str:
+    """
+    Start retrieval + batched meaning generation for several mentors in the background
+    
+    The first mentor gets a batch of their own: they speak next, so they
+    wait for k meanings only. The others share one batched meaning call,
+    which runs while the first mentor speaks.
+    
+    Args:
+        query: Search query (user's question)
+        mentors: Mentor keys to prefetch, in speaking order (krishna, buddha, jesus)
+        k: Number of verses per mentor
+        with_meanings: False skips the meaning calls
+        prefetch_id: Key for the prefetch (e.g. the dialogue id); generated when omitted
+    
+    Returns:
+        The prefetch id to pass to get_prefetched_verses and discard_prefetch
+    """
+    prefetch_id = prefetch_id or uuid.uuid4().hex
+    
+    # Each task (on the shared event loop) searches its mentors and makes a
+    # single batched meaning call; each mentor consumes its slice of the result
+    futures = {}
+    for group in (mentors[:1], mentors[1:]):
+        if group:
+            batch = submit_async(aretrieve_verses_for_mentors(query, group, k, with_meanings))
+            futures.update({mentor: batch for mentor in group})
+    
+    with _prefetch_lock:
+        # Drop entries from dialogues that died before consuming them
+        now = time.time()
+        for stale_id in [pid for pid, entry in _prefetched.items() if now - entry['created'] > PREFETCH_MAX_AGE_S]:
+            del _prefetched[stale_id]
+        _prefetched[prefetch_id] = {'created': now, 'futures': futures}
+    
+    return prefetch_id
+
+
+def _pop_prefetch_future(prefetch_id: str, mentor: str) -> Optional[Future]:
+    """Take a mentor's future out of the registry (each is consumed once)"""
+    with _prefetch_lock:
+        entry = _prefetched.get(prefetch_id)
+        if entry is None:
+            return None
+        future = entry['futures'].pop(mentor, None)
+        if not entry['futures']:
+            del _prefetched[prefetch_id]
+        return future
+
+
+def discard_prefetch(prefetch_id: str):
+    """Forget a dialogue's unconsumed prefetches, cancelling tasks still running"""
+    with _prefetch_lock:
+        entry = _prefetched.pop(prefetch_id, None)
+    if entry:
+        for future in entry['futures'].values():
+            future.cancel()
+
+
+def get_prefetched_verses(state: Dict[str, Any], mentor: str, k: int = 3,
+                          config: Optional[RunnableConfig] = None) -> List[Dict[str, Any]]:
+    """
+    Wait for a mentor's prefetched verses, retrieving directly if none exist
+    
+    Args:
+        state: Conversation state (reads user_question and prefetch_id)
+        mentor: Mentor key (krishna, buddha, jesus)
+        k: Number of verses (used only for direct retrieval)
+        config: LangGraph runnable config (deadline for direct retrieval)
+    
+    Returns:
+        List of verse dictionaries with meanings
+    """
+    future = _pop_prefetch_future(state.get('prefetch_id') or '', mentor)
+    if future is not None:
+        try:
+            return future.result()[mentor]
+        except Exception as e:
+            print(f"⚠️  Prefetch for {mentor} failed, retrieving directly: {e}")
+    
+    with_meanings = _remaining_s(config) >= DEADLINE_ESTIMATES_S['meanings'] + DEADLINE_ESTIMATES_S['quality']
+    return retrieve_verses(state['user_question'], mentor=mentor, k=k, with_meanings=with_meanings)
+
+
+def prefetch_node(state: Dict[str, Any], config: RunnableConfig = None) -> Dict[str, Any]:
+    """
+    Graph entry node: start every mentor's retrieval at once
+    
+    Krishna's verses come from a small batch of their own; Buddha's and
+    Jesus's verses and meanings are then ready (or nearly) by the time
+    Krishna has finished speaking. The prefetch is keyed by the dialogue id
+    (thread_id) so run_divine_dialogue can discard what was not consumed.
+    Under a deadline too tight for the meaning call plus every mentor and
+    the moderator, meanings are skipped.
+    """
+    remaining = _remaining_s(config)
+    needed = DEADLINE_ESTIMATES_S['meanings'] + (len(MENTOR_ORDER) + 1) * DEADLINE_ESTIMATES_S['quality']
+    with_meanings = remaining >= needed
+    
+    thread_id = (config or {}).get('configurable', {}).get('thread_id')
+    delta = {'prefetch_id': start_prefetch(state['user_question'], MENTOR_ORDER, with_meanings=with_meanings,
+                                           prefetch_id=thread_id)}
+    if not with_meanings:
+        delta['degradations'] = [_degradation('prefetch', 'skip_meanings', remaining)]
+    return delta
+
+
 # Define the conversation state
 class ConversationState(TypedDict):
     """State for the Divine Dialogue conversation"""
     user_question: str
     user_background: str  # NEW: User's personal background for personalized guidance
+    dialogue_mode: str  # "debate", "panel", "single_mentor" or "quick"
+    focus_mentor: str  # Mentor key answering in "single_mentor" mode
+    prefetch_id: str  # Key of this dialogue's background retrieval futures
     mentor_responses: Annotated[List[Dict[str, Any]], add]
     conversation_history: Annotated[List[str], add]
     current_mentor: str
     synthesis_result: str
-    rag_context: Dict[str, List[Dict]]
+    rag_context: Annotated[Dict[str, List[Dict]], _merge_dicts]
+    degradations: Annotated[List[Dict[str, Any]], add]  # Shortcuts taken to meet the deadline
+
+
+# Rough wall time of each kind of work, used to decide what still fits before the deadline
+DEADLINE_ESTIMATES_S = {
+    'meanings': float(os.getenv("DIVINE_EST_MEANINGS_S", "1.5")),
+    'quality': float(os.getenv("DIVINE_EST_QUALITY_S", "4.0")),
+    'fast': float(os.getenv("DIVINE_EST_FAST_S", "1.5"))
+}
+
+
+def _remaining_s(config: Optional[RunnableConfig]) -> float:
+    """
+    Seconds left before this run's deadline (inf without one)
+    
+    The deadline is an absolute time.time() in the run's config rather than
+    the checkpointed state, so a resumed dialogue gets the resuming call's
+    budget instead of one that may have expired while it was interrupted.
+    """
+    deadline = (config or {}).get('configurable', {}).get('deadline') or 0.0
+    return deadline - time.time() if deadline else float('inf')
+
+
+def _degradation(node: str, action: str, remaining_s: float, **details) -> Dict[str, Any]:
+    return {'node': node, 'action': action, 'remaining_s': round(remaining_s, 2), **details}
+
+
+def _deadline_plan(config: Optional[RunnableConfig], node: str, calls_left: int,
+                   tier: str = DEFAULT_TIER, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Choose a node's model tier and max_tokens for the time left
+    
+    Steps down as the budget shrinks: the requested tier; the fast tier
+    with two thirds of the tokens; the fast tier with half; skip the call.
+    
+    Args:
+        config: LangGraph runnable config (reads deadline)
+        node: Node name, recorded with any degradation
+        calls_left: LLM calls the dialogue still has to make, this one included
+        tier: Tier the node would normally use
+        max_tokens: Tokens the node would normally allow (default: the tier's)
+    
+    Returns:
+        {'skip': bool, 'tier': str, 'max_tokens': int or None, 'degradations': [...]}
+    """
+    remaining = _remaining_s(config)
+    base_tokens = max_tokens or MODEL_TIERS[tier]['max_tokens']
+    
+    if remaining >= calls_left * DEADLINE_ESTIMATES_S[tier]:
+        return {'skip': False, 'tier': tier, 'max_tokens': max_tokens, 'degradations': []}
+    
+    if tier != 'fast' and remaining >= calls_left * DEADLINE_ESTIMATES_S['fast']:
+        tokens = int(base_tokens * 2 / 3)
+        action = 'fast_tier'
+    elif remaining >= DEADLINE_ESTIMATES_S['fast']:
+        tokens = base_tokens // 2
+        action = 'shrink_tokens'
+    else:
+        return {'skip': True, 'tier': tier, 'max_tokens': 0,
+                'degradations': [_degradation(node, 'skip', remaining)]}
+    
+    return {'skip': False, 'tier': 'fast', 'max_tokens': tokens,
+            'degradations': [_degradation(node, action, remaining, tier='fast', max_tokens=tokens)]}
+
+
+def _mentor_said(state: Dict[str, Any], mentor_name: str) -> str:
+    """A mentor's response so far ("" if they have not spoken or were skipped)"""
+    return next((r['response'] for r in state['mentor_responses'] if r['mentor'] == mentor_name), "")
 
 
 def _clean_response(text: str) -> str:
@@ -242,7 +872,91 @@ def _clean_response(text: str) -> str:
     return cleaned
 
 
-def call_llm(system_prompt: str, user_message: str, model: str = None, max_tokens: int = 300) -> str:
+def _build_messages(system_prompt: str, user_message: str) -> list:
+    """Use LangChain's message classes for proper formatting"""
+    from langchain_core.messages import SystemMessage, HumanMessage
+    
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_message)
+    ]
+
+
+def _extract_text(response) -> str:
+    """Extract text from a LangChain response"""
+    if hasattr(response, 'content'):
+        return response.content
+    return str(response)
+
+
+GROQ_UNAVAILABLE_MESSAGE = "Groq not available. Please install langchain-groq and set GROQ_API_KEY. Get free key at: https://console.groq.com"
+
+
+def _require_groq():
+    """Raise LLMUnavailableError when no Groq client (or fake provider) is configured"""
+    if get_groq_model() is None:
+        raise LLMUnavailableError(GROQ_UNAVAILABLE_MESSAGE)
+
+
+def _cache_lookup(system_prompt: str, user_message: str, model_name: str, max_tokens: int,
+                  use_cache: bool) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Look a request up in the response cache
+    
+    Returns:
+        (cache_key, cached_response) - key is None when caching is off
+    """
+    # Canned fake responses are never cached: they would be served to real
+    # runs and turn load tests into cache-hit benchmarks
+    cache = get_llm_cache() if use_cache and LLM_PROVIDER != "fake" else None
+    if cache is None:
+        return None, None
+    
+    key = cache.make_key(system_prompt, user_message, model_name, max_tokens, endpoint=GROQ_BASE_URL or "groq")
+    return key, cache.get(key)
+
+
+def _cache_store(key: Optional[str], response: str, model_name: str):
+    """Store a successful, non-empty response under key"""
+    if key and response:
+        get_llm_cache().set(key, response, model=model_name)
+
+
+def _resolve_tier(tier: str, max_tokens: Optional[int]) -> Tuple[Dict[str, Any], int]:
+    """Tier settings plus the effective max_tokens (the tier default when None)"""
+    tier_config = model_router.config(tier)
+    return tier_config, max_tokens or tier_config['max_tokens']
+
+
+def _record_usage(tier: str, start: float, prompt_text: str, completion_text: str,
+                  input_tokens: Optional[int] = None, output_tokens: Optional[int] = None):
+    """
+    Record a completed call on the router and in the dialogue's timings,
+    estimating tokens the provider did not report
+    """
+    latency_s = time.perf_counter() - start
+    usage_reported = input_tokens is not None and output_tokens is not None
+    input_tokens = input_tokens if input_tokens is not None else estimate_tokens(prompt_text)
+    output_tokens = output_tokens if output_tokens is not None else estimate_tokens(completion_text)
+    
+    model_router.record(tier, latency_s=latency_s, input_tokens=input_tokens, output_tokens=output_tokens)
+    record_timing(
+        'llm', tier, latency_s,
+        model=model_router.config(tier)['model'],
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        tokens_estimated=not usage_reported
+    )
+
+
+def _record_cache_hit(tier: str):
+    """Record an LLM call served from the response cache"""
+    model_router.record(tier, cache_hit=True)
+    record_timing('llm', tier, 0.0, model=model_router.config(tier)['model'], cache_hit=True)
+
+
+def call_llm(system_prompt: str, user_message: str, model: str = None, max_tokens: int = None,
+             use_cache: bool = False, tier: str = DEFAULT_TIER) -> str:
     """
     Call Groq API - The fastest LLM in the world (300+ tokens/second)
     
@@ -250,76 +964,265 @@ def call_llm(system_prompt: str, user_message: str, model: str = None, max_token
         system_prompt: System instructions for the LLM
         user_message: User's message/question
         model: Not used (kept for compatibility)
-        max_tokens: Maximum tokens for the response (default 300)
+        max_tokens: Maximum tokens for the response (default: the tier's)
+        use_cache: Serve/store identical requests from the response cache.
+            Only for utility calls whose answer should not vary (verse
+            meanings, summaries); sampled dialogue text is never cached.
+        tier: Model tier - "fast" for short utility calls, "quality"
+            (default) for mentor and moderator text
     
     Returns:
         Cleaned LLM response text
+    
+    Raises:
+        LLMError: typed failure (unavailable, authentication, rate limit
+            after retries, server error) - never an error string
     """
-    if not GROQ_AVAILABLE or groq_model is None:
-        return "[Error: Groq not available. Please install langchain-groq and set GROQ_API_KEY. Get free key at: https://console.groq.com]"
+    # Runs acall_llm on the shared event loop - Groq is lightning fast (1-3 seconds)
+    return run_async(acall_llm(system_prompt, user_message, model=model, max_tokens=max_tokens,
+                               use_cache=use_cache, tier=tier))
+
+
+async def acall_llm(system_prompt: str, user_message: str, model: str = None, max_tokens: int = None,
+                    use_cache: bool = False, tier: str = DEFAULT_TIER) -> str:
+    """
+    Async counterpart of call_llm using the chat model's native async API
     
-    try:
-        # Use LangChain's message classes for proper formatting
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_message)
-        ]
+    Does not hold a thread while waiting on Groq, so many calls can be in
+    flight on one event loop over the shared connection pool.
+    
+    Args:
+        system_prompt: System instructions for the LLM
+        user_message: User's message/question
+        model: Not used (kept for compatibility)
+        max_tokens: Maximum tokens for the response (default: the tier's)
+        use_cache: Serve/store identical requests from the response cache
+            (utility calls only, as for call_llm)
+        tier: Model tier ("fast" or "quality")
+    
+    Returns:
+        Cleaned LLM response text
+    
+    Raises:
+        LLMError: typed failure, as for call_llm
+    """
+    tier_config, max_tokens = _resolve_tier(tier, max_tokens)
+    
+    cache_key, cached = _cache_lookup(system_prompt, user_message, tier_config['model'], max_tokens, use_cache)
+    if cached is not None:
+        _record_cache_hit(tier)
+        return cached
+    
+    _require_groq()
+    
+    async_model = model_router.async_model(tier)
+    messages = _build_messages(system_prompt, user_message)
+    start = time.perf_counter()
+    response = await get_scheduler().arun(
+        lambda: async_model.ainvoke(messages, max_tokens=max_tokens),
+        estimated_tokens=estimate_tokens(system_prompt, user_message, max_tokens=max_tokens)
+    )
+    text = _extract_text(response)
+    _record_usage(tier, start, system_prompt + user_message, text, *message_usage(response))
+    
+    # Clean the response to remove instruction tokens
+    cleaned_response = _clean_response(text.strip())
+    _cache_store(cache_key, cleaned_response, tier_config['model'])
+    return cleaned_response
+
+
+# Flush a streamed chunk at a sentence end, or at a space once this long
+STREAM_FLUSH_CHARS = 120
+
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+|\n+')
+
+
+class _StreamCleaner:
+    """
+    Incrementally applies _clean_response to a token stream.
+    
+    Tokens are buffered up to a sentence boundary (or a word boundary once
+    the buffer is long) so instruction tokens and leaked instruction
+    sentences are removed before anything reaches the user.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        self.emitted_any = False
+    
+    def feed(self, text: str) -> List[str]:
+        """Add raw tokens, return cleaned chunks that are ready to show"""
+        self.buffer += text
+        chunks = []
         
-        # Invoke the model - Groq is lightning fast (1-3 seconds)
-        response = groq_model.invoke(messages)
+        while True:
+            match = _SENTENCE_END.search(self.buffer)
+            boundary = match.end() if match else None
+            if boundary is None and len(self.buffer) > STREAM_FLUSH_CHARS:
+                space = self.buffer.rfind(' ')
+                if space > 0:
+                    boundary = space + 1
+            if boundary is None:
+                break
+            
+            segment, self.buffer = self.buffer[:boundary], self.buffer[boundary:]
+            chunk = self._clean(segment)
+            if chunk:
+                chunks.append(chunk)
         
-        # Extract text from LangChain response
-        if hasattr(response, 'content'):
-            raw_response = response.content
-        else:
-            raw_response = str(response)
+        return chunks
+    
+    def flush(self) -> List[str]:
+        """Return whatever is left in the buffer, cleaned"""
+        segment, self.buffer = self.buffer, ""
+        chunk = self._clean(segment)
+        return [chunk] if chunk else []
+    
+    def _clean(self, segment: str) -> str:
+        # Same rule as _clean_response: drop sentences that start with "Do NOT" / "Instead"
+        if self.emitted_any and re.match(r'\s*(Do NOT|Instead)\b', segment, flags=re.IGNORECASE):
+            return ""
         
-        # Clean the response to remove instruction tokens
-        cleaned_response = _clean_response(raw_response.strip())
-        return cleaned_response
+        cleaned = _clean_response(segment)
+        if not cleaned:
+            return ""
         
-    except Exception as e:
-        error_str = str(e).lower()
-        print(f"⚠️  Groq API call failed: {e}")
+        chunk = (" " if self.emitted_any else "") + cleaned
+        self.emitted_any = True
+        return chunk
+
+
+def stream_llm(system_prompt: str, user_message: str, model: str = None, max_tokens: int = None,
+               use_cache: bool = False, tier: str = DEFAULT_TIER) -> Iterator[str]:
+    """
+    Streaming variant of call_llm that yields cleaned text chunks
+    
+    Joining the chunks gives the same text call_llm would return (modulo
+    instruction phrases that span sentence boundaries).
+    
+    Args:
+        system_prompt: System instructions for the LLM
+        user_message: User's message/question
+        model: Not used (kept for compatibility)
+        max_tokens: Maximum tokens for the response (default: the tier's)
+        use_cache: Serve a cached response as a single chunk; store the
+            joined stream once it completes
+        tier: Model tier ("fast" or "quality")
+    
+    Yields:
+        Cleaned response text chunks
+    
+    Raises:
+        LLMError: typed failure; failures before the first chunk are
+            retried by the scheduler
+    """
+    tier_config, max_tokens = _resolve_tier(tier, max_tokens)
+    
+    cache_key, cached = _cache_lookup(system_prompt, user_message, tier_config['model'], max_tokens, use_cache)
+    if cached is not None:
+        _record_cache_hit(tier)
+        yield cached
+        return
+    
+    _require_groq()
+    
+    tier_model = model_router.model(tier)
+    cleaner = _StreamCleaner()
+    streamed = []
+    raw = []
+    input_tokens = output_tokens = None
+    messages = _build_messages(system_prompt, user_message)
+    start = time.perf_counter()
+    for chunk in get_scheduler().stream(
+        lambda: tier_model.stream(messages, max_tokens=max_tokens),
+        estimated_tokens=estimate_tokens(system_prompt, user_message, max_tokens=max_tokens)
+    ):
+        # Usage, when the provider reports it, arrives on the final chunk
+        chunk_input, chunk_output = message_usage(chunk)
+        if chunk_output:
+            input_tokens, output_tokens = chunk_input, chunk_output
         
-        # Check for API key error
-        if "api_key" in error_str or "authentication" in error_str:
-            return "[Error: Invalid or missing GROQ_API_KEY. Please set it in your .env file. Get free key at: https://console.groq.com]"
-        elif "quota" in error_str or "429" in error_str or "rate limit" in error_str:
-            return "[Error: API rate limit exceeded. Please try again in a moment. Groq free tier is very generous!]"
-        else:
-            return f"[Error: {str(e)[:100]}]"
+        text = _extract_text(chunk)
+        raw.append(text)
+        for cleaned in cleaner.feed(text):
+            streamed.append(cleaned)
+            yield cleaned
+    
+    for cleaned in cleaner.flush():
+        streamed.append(cleaned)
+        yield cleaned
+    
+    _record_usage(tier, start, system_prompt + user_message, "".join(raw), input_tokens, output_tokens)
+    _cache_store(cache_key, "".join(streamed).strip(), tier_config['model'])
 
 
-def krishna_node(state: ConversationState) -> ConversationState:
-    """Krishna mentor node - speaks first"""
-    print("\n🕉️  Krishna is speaking...")
+TokenCallback = Callable[[str, str], None]
+
+# on_node(node, event, error=False) with event "start" or "end"; "end" is sent
+# even when the node raises, with error=True. Raising on "start" stops the dialogue
+NodeCallback = Callable[..., None]
+
+
+def _get_token_callback(config: Optional[RunnableConfig]) -> Optional[TokenCallback]:
+    """Read the on_token(speaker, chunk) callback passed in the graph config"""
+    if not config:
+        return None
+    return config.get('configurable', {}).get('on_token')
+
+
+def _generate_response(speaker: str, system_prompt: str, user_message: str,
+                       config: Optional[RunnableConfig] = None, max_tokens: int = None,
+                       use_cache: bool = False, tier: str = DEFAULT_TIER) -> str:
+    """
+    Run a node's LLM call, streaming chunks to on_token when one is configured
     
-    # Retrieve relevant Gita verses with meanings
-    verses = retrieve_verses(state['user_question'], mentor='krishna', k=3)
+    Args:
+        speaker: Display name passed to on_token (e.g. "Krishna", "Moderator")
+        system_prompt: System instructions for the LLM
+        user_message: User's message/question
+        config: LangGraph runnable config (may carry on_token)
+        max_tokens: Maximum tokens for the response (default: the tier's)
+        use_cache: Passed through to call_llm / stream_llm
+        tier: Model tier passed through to call_llm / stream_llm
     
-    # Format verses with their meanings for context
-    verse_context = "\n\n".join([
-        f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', 'Teaches about dharma and yoga')}"
-        for v in verses
-    ])
+    Returns:
+        The full cleaned response text
+    """
+    on_token = _get_token_callback(config)
+    if on_token is None:
+        return call_llm(system_prompt, user_message, max_tokens=max_tokens, use_cache=use_cache, tier=tier)
     
-    # Get user background for personalized context
-    user_background = state.get('user_background', '')
-    background_context = ""
-    if user_background:
-        background_context = f"""
+    chunks = []
+    for chunk in stream_llm(system_prompt, user_message, max_tokens=max_tokens, use_cache=use_cache, tier=tier):
+        chunks.append(chunk)
+        on_token(speaker, chunk)
+    return "".join(chunks).strip()
+
 
-USER CONTEXT: {user_background}
+# Wrapper for the user's background in the debate mentors' system prompts
+BACKGROUND_TEMPLATE = """
+
+USER CONTEXT: {background}
 
 Keep this context in mind as you respond. Your answer should relate to their specific situation, challenges, and life circumstances."""
-    
-    # Krishna's system prompt - Conversational wisdom format
-    system_prompt = f"""You are Lord Krishna from the Bhagavad Gita, the Supreme Teacher of dharma and yoga.
+
+
+def _background_context(background: str) -> str:
+    """The user's background wrapped for a mentor's system prompt ("" when empty)"""
+    return BACKGROUND_TEMPLATE.format(background=background) if background else ""
+
+
+def _example_block(example: str) -> str:
+    """A fitted example section followed by its spacing ("" when dropped)"""
+    return f"{example}\n\n" if example else ""
+
+
+# Krishna prompt templates (the example is the first thing trimmed under a tight budget)
+KRISHNA_SYSTEM_TEMPLATE = """You are Lord Krishna from the Bhagavad Gita, the Supreme Teacher of dharma and yoga.
 You are speaking directly to this student about their challenge.
 
 STUDENT'S SITUATION:
-- Question: {state['user_question']}
+- Question: {question}
 - Background: {background_context}
 
 INSTRUCTIONS:
@@ -333,82 +1236,94 @@ INSTRUCTIONS:
 
 FORMAT: Just write your wisdom directly in paragraphs. No "PRINCIPLE", "HOW TO APPLY", "TIMELINE", or bullet points.
 
-EXAMPLE FORMAT (For someone with academic anxiety):
+{example_block}Now generate similar wisdom for THIS student based on their question and background. Use the verse context provided to reference specific Gita teachings naturally."""
+
+KRISHNA_EXAMPLE = """EXAMPLE FORMAT (For someone with academic anxiety):
 
 "My dear student, I see your struggle with academic pressure and anxiety. The Gita teaches in verse 2.47: 'You have a right to perform your prescribed duty, but you are not entitled to the fruits of action.' This means focus on your studies themselves—the thinking, learning, understanding—not the placement outcome. When you detach from the result, the anxiety loosens its grip. 
 
 In verse 4.41, I teach that when actions are performed with wisdom and without attachment to outcomes, they become purifying. So study deeply. Master the concepts. Then let go of whether you get the perfect internship. Your worth is not your GPA.
 
-Practice this: Each study session, remind yourself: 'I am here to learn deeply, not to earn a grade.' This shift changes everything. The anxiety may still visit, but it no longer controls you."
+Practice this: Each study session, remind yourself: 'I am here to learn deeply, not to earn a grade.' This shift changes everything. The anxiety may still visit, but it no longer controls you.\""""
 
-Now generate similar wisdom for THIS student based on their question and background. Use the verse context provided to reference specific Gita teachings naturally."""
-    
-    user_message = f"""Relevant teachings from the Bhagavad Gita:
-{verse_context}
+KRISHNA_USER_TEMPLATE = """Relevant teachings from the Bhagavad Gita:
+{verses}
 
 Now speak as Krishna directly to this student. Write 2-3 conversational paragraphs with embedded verse references and practical guidance. No bullet points or structured sections."""
-    
-    # Get Krishna's response
-    response = call_llm(system_prompt, user_message)
-    
-    # Ensure response is not empty
-    if not response or len(response.strip()) < 10:
-        response = "I speak of the path of dharma, where inner peace comes through selfless action and devotion to the eternal truth."
-    
-    # Store response with citations
-    state['mentor_responses'].append({
-        'mentor': 'Krishna',
-        'response': response,
-        'verses': verses,
-        'citations': verses,  # Add citations field for Streamlit display
-        'icon': '🕉️'
-    })
-    
-    state['conversation_history'].append(f"Krishna: {response}")
-    state['current_mentor'] = 'krishna'
-    state['rag_context']['krishna'] = verses
-    
-    return state
 
 
-def buddha_node(state: ConversationState) -> ConversationState:
-    """Buddha mentor node - speaks second"""
-    print("\n☸️  Buddha is speaking...")
+def krishna_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
+    """Krishna mentor node - speaks first"""
+    print("\n🕉️  Krishna is speaking...")
     
-    # Retrieve relevant Dhammapada verses with meanings
-    verses = retrieve_verses(state['user_question'], mentor='buddha', k=3)
+    plan = _deadline_plan(config, 'krishna', calls_left=4)
+    if plan['skip']:
+        print("⏱️  Deadline reached - Krishna is skipped")
+        return {'degradations': plan['degradations']}
+    
+    # Retrieve relevant Gita verses with meanings
+    verses = get_prefetched_verses(state, 'krishna', config=config)
     
     # Format verses with their meanings for context
     verse_context = "\n\n".join([
-        f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', 'Teaches about mindfulness and the path')}"
+        f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', 'Teaches about dharma and yoga')}"
         for v in verses
     ])
     
-    # Get user background for personalized context
-    user_background = state.get('user_background', '')
-    background_context = ""
-    if user_background:
-        background_context = f"""
-
-USER CONTEXT: {user_background}
-
-Keep this context in mind as you respond. Your answer should relate to their specific situation, challenges, and life circumstances."""
+    # Fit the variable sections into the input-token budget: the example
+    # goes first, then background and verses
+    builder = PromptBuilder(name="Krishna prompt")
+    builder.add_template(KRISHNA_SYSTEM_TEMPLATE, KRISHNA_USER_TEMPLATE, BACKGROUND_TEMPLATE)
+    builder.add('question', state['user_question'], priority=REQUIRED)
+    builder.add('example', KRISHNA_EXAMPLE, priority=0)
+    builder.add('background', state.get('user_background', ''), priority=2, min_tokens=80, droppable=False)
+    builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
     
-    # Get Krishna's previous response for context
-    krishna_response_text = ""
-    if state['mentor_responses']:
-        krishna_response_text = state['mentor_responses'][0]['response']
+    # Krishna's system prompt - Conversational wisdom format
+    system_prompt = KRISHNA_SYSTEM_TEMPLATE.format(
+        question=parts['question'],
+        background_context=_background_context(parts['background']),
+        example_block=_example_block(parts['example'])
+    )
+    user_message = KRISHNA_USER_TEMPLATE.format(verses=parts['verses'])
     
-    # Buddha's system prompt - Conversational wisdom format
-    system_prompt = f"""You are Siddhartha Gautama Buddha, the Awakened One who teaches the Dharma.
+    # Get Krishna's response (streamed to on_token when configured)
+    response = _generate_response('Krishna', system_prompt, user_message, config,
+                                  max_tokens=plan['max_tokens'], tier=plan['tier'])
+    
+    # Ensure response is not empty
+    if not response or len(response.strip()) < 10:
+        response = "I speak of the path of dharma, where inner peace comes through selfless action and devotion to the eternal truth."
+    
+    # Return only this node's additions; the reducers append/merge them
+    return {
+        'mentor_responses': [{
+            'mentor': 'Krishna',
+            'response': response,
+            'verses': verses,
+            'citations': verses,  # Add citations field for Streamlit display
+            'icon': '🕉️'
+        }],
+        'conversation_history': [f"Krishna: {response}"],
+        'current_mentor': 'krishna',
+        'rag_context': {'krishna': verses},
+        'degradations': plan['degradations']
+    }
+
+
+# Buddha prompt templates (the example goes first, then Krishna's words)
+BUDDHA_SYSTEM_TEMPLATE = """You are Siddhartha Gautama Buddha, the Awakened One who teaches the Dharma.
 You are speaking directly to this student about their challenge.
 
 STUDENT'S SITUATION:
-- Question: {state['user_question']}
+- Question: {question}
 - Background: {background_context}
 
 KRISHNA'S WISDOM (for context):
-{krishna_response_text if krishna_response_text else 'Krishna has spoken about detachment and selfless action.'}
+{krishna}
 
 INSTRUCTIONS:
 1. Do NOT use any templates, structured sections, bullet points, or formatted sections
@@ -421,50 +1336,143 @@ INSTRUCTIONS:
 
 FORMAT: Just write your wisdom directly in paragraphs. No "PRINCIPLE", "HOW TO APPLY", "TIMELINE", or bullet points. No sections.
 
-EXAMPLE FORMAT (For someone with academic anxiety):
+{example_block}Now generate similar wisdom for THIS student based on their question and background. Reference Krishna's teaching, then add your Buddhist perspective. Use the verse context provided to reference specific Dhammapada teachings naturally."""
+
+BUDDHA_EXAMPLE = """EXAMPLE FORMAT (For someone with academic anxiety):
 
 "Krishna speaks of detaching from outcomes through action, and there is wisdom in this. I add another dimension: observe the anxiety itself without fighting it. 
 
 In Dhammapada verse 221, I teach: 'Give up anger, renounce pride, overcome all fetters.' The fetters binding you are not your grades—they are your CRAVING for them. Watch this craving arise. 'Here is craving. Here is fear.' Do not judge it. Simply observe. This is mindfulness.
 
-As verse 36 teaches: 'Let the discerning person guard his mind...a guarded mind brings happiness.' Guard your mind not by controlling thoughts, but by observing them with curiosity. When you do this, the mind naturally settles. Before each study session, take five breaths and watch your thoughts like clouds passing. They come, they go. You remain."
+As verse 36 teaches: 'Let the discerning person guard his mind...a guarded mind brings happiness.' Guard your mind not by controlling thoughts, but by observing them with curiosity. When you do this, the mind naturally settles. Before each study session, take five breaths and watch your thoughts like clouds passing. They come, they go. You remain.\""""
 
-Now generate similar wisdom for THIS student based on their question and background. Reference Krishna's teaching, then add your Buddhist perspective. Use the verse context provided to reference specific Dhammapada teachings naturally."""
-    
-    user_message = f"""Relevant teachings from the Dhammapada:
-{verse_context}
+BUDDHA_USER_TEMPLATE = """Relevant teachings from the Dhammapada:
+{verses}
 
 Krishna has spoken. Now speak as Buddha directly to this student. Write 2-3 conversational paragraphs that acknowledge Krishna's wisdom and add your Buddhist perspective with embedded verse references. No bullet points or structured sections."""
+
+
+def buddha_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
+    """Buddha mentor node - speaks second"""
+    print("\n☸️  Buddha is speaking...")
+    
+    plan = _deadline_plan(config, 'buddha', calls_left=3)
+    if plan['skip']:
+        print("⏱️  Deadline reached - Buddha is skipped")
+        return {'degradations': plan['degradations']}
     
-    # Get Buddha's response
-    response = call_llm(system_prompt, user_message)
+    # Retrieve relevant Dhammapada verses with meanings
+    verses = get_prefetched_verses(state, 'buddha', config=config)
+    
+    # Format verses with their meanings for context
+    verse_context = "\n\n".join([
+        f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', 'Teaches about mindfulness and the path')}"
+        for v in verses
+    ])
+    
+    # Krishna's previous response for context (compressed before the verses)
+    krishna_response_text = _mentor_said(state, 'Krishna') or 'Krishna has spoken about detachment and selfless action.'
+    
+    # Fit the variable sections into the input-token budget: the example
+    # goes first, then Krishna's words, then background and verses
+    builder = PromptBuilder(name="Buddha prompt")
+    builder.add_template(BUDDHA_SYSTEM_TEMPLATE, BUDDHA_USER_TEMPLATE, BACKGROUND_TEMPLATE)
+    builder.add('question', state['user_question'], priority=REQUIRED)
+    builder.add('example', BUDDHA_EXAMPLE, priority=0)
+    builder.add('krishna', krishna_response_text, priority=1, min_tokens=60, droppable=False)
+    builder.add('background', state.get('user_background', ''), priority=2, min_tokens=80, droppable=False)
+    builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
+    
+    # Buddha's system prompt - Conversational wisdom format
+    system_prompt = BUDDHA_SYSTEM_TEMPLATE.format(
+        question=parts['question'],
+        background_context=_background_context(parts['background']),
+        krishna=parts['krishna'],
+        example_block=_example_block(parts['example'])
+    )
+    user_message = BUDDHA_USER_TEMPLATE.format(verses=parts['verses'])
+    
+    # Get Buddha's response (streamed to on_token when configured)
+    response = _generate_response('Buddha', system_prompt, user_message, config,
+                                  max_tokens=plan['max_tokens'], tier=plan['tier'])
     
     # Ensure response is not empty
     if not response or len(response.strip()) < 10:
         response = "Krishna speaks wisely. I would add that inner peace comes through understanding the nature of suffering and following the Middle Way of mindfulness."
     
-    # Store response with citations
-    state['mentor_responses'].append({
-        'mentor': 'Buddha',
-        'response': response,
-        'verses': verses,
-        'citations': verses,  # Add citations field for Streamlit display
-        'icon': '☸️'
-    })
-    
-    state['conversation_history'].append(f"Buddha: {response}")
-    state['current_mentor'] = 'buddha'
-    state['rag_context']['buddha'] = verses
-    
-    return state
+    # Return only this node's additions; the reducers append/merge them
+    return {
+        'mentor_responses': [{
+            'mentor': 'Buddha',
+            'response': response,
+            'verses': verses,
+            'citations': verses,  # Add citations field for Streamlit display
+            'icon': '☸️'
+        }],
+        'conversation_history': [f"Buddha: {response}"],
+        'current_mentor': 'buddha',
+        'rag_context': {'buddha': verses},
+        'degradations': plan['degradations']
+    }
+
+
+# Jesus prompt pieces (the example is the first thing trimmed under a tight budget)
+JESUS_INSTRUCTIONS = """INSTRUCTIONS:
+1. Do NOT use any templates, structured sections, bullet points, or formatted sections
+2. Write 2-3 SHORT PARAGRAPHS conversationally (not bullet points)
+3. Reference 1-2 SPECIFIC Gospel verses directly in your speech (mention verses like "Matthew 11:28" or "In Luke 12:25-26, I taught...")
+4. Add the dimension of LOVE, FAITH, GRACE - show how these enhance Krishna's and Buddha's teachings
+5. Do NOT contradict Krishna or Buddha - enhance and harmonize their teaching with love and grace
+6. Give CONCRETE, practical wisdom for THEIR specific situation
+7. Be conversational and compassionate, like a teacher of love speaking directly to a student
+
+FORMAT: Just write your wisdom directly in paragraphs. No "PRINCIPLE", "HOW TO APPLY", "TIMELINE", or bullet points. No sections."""
+
+JESUS_EXAMPLE = """EXAMPLE FORMAT (For someone with academic anxiety):
+
+"Krishna teaches detachment, Buddha teaches mindfulness. Both are paths of the mind. I offer you something deeper: you are loved completely, right now, regardless of your placement outcome.
+
+In Matthew 11:28, I taught: 'Come to me, all you who are weary and burdened, and I will give you rest.' This is not about your circumstances changing. It's about surrendering your anxiety to something greater than yourself. You do not have to carry this weight alone.
+
+Luke 12:25-26 reminds us: 'Can any of you by worrying add a single hour to your lifespan?' Your anxiety does not improve your grades. But faith does lighten your heart. Pray not for perfection—pray for peace. Then study from that peaceful place. This is the grace available to you. Before you open your books, take a moment: 'I am loved. I am enough. I am held.' Then study from that place of acceptance.\""""
+
+JESUS_CLOSING = """Now generate similar wisdom for THIS student based on their question and background. Reference both Krishna's and Buddha's teachings, then add your perspective of love and grace. Use the verse context provided to reference specific Gospel teachings naturally."""
+
+JESUS_SYSTEM_TEMPLATE = """You are Jesus of Nazareth, teaching the Gospel of love, forgiveness, and the Kingdom of God.
+You are speaking directly to this student about their challenge.
+
+STUDENT'S SITUATION:
+- Question: {question}
+- Background: {background_context}
+
+KRISHNA'S WISDOM (for context):
+{krishna}
+
+BUDDHA'S WISDOM (for context):
+{buddha}
+
+""" + JESUS_INSTRUCTIONS + "\n\n{example_block}" + JESUS_CLOSING
+
+JESUS_USER_TEMPLATE = """Relevant teachings from the Gospels:
+{verses}
+
+Krishna and Buddha have spoken. Now speak as Jesus directly to this student. Write 2-3 conversational paragraphs that harmonize their wisdom with love and grace, with embedded verse references. No bullet points or structured sections."""
 
 
-def jesus_node(state: ConversationState) -> ConversationState:
+def jesus_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
     """Jesus mentor node - speaks third"""
     print("\n✝️  Jesus is speaking...")
     
+    plan = _deadline_plan(config, 'jesus', calls_left=2)
+    if plan['skip']:
+        print("⏱️  Deadline reached - Jesus is skipped")
+        return {'degradations': plan['degradations']}
+    
     # Retrieve relevant Gospel verses with meanings
-    verses = retrieve_verses(state['user_question'], mentor='jesus', k=3)
+    verses = get_prefetched_verses(state, 'jesus', config=config)
     
     # Format verses with their meanings for context
     verse_context = "\n\n".join([
@@ -472,110 +1480,234 @@ def jesus_node(state: ConversationState) -> ConversationState:
         for v in verses
     ])
     
-    # Get user background for personalized context
-    user_background = state.get('user_background', '')
-    background_context = ""
-    if user_background:
-        background_context = f"""
-
-USER CONTEXT: {user_background}
-
-Keep this context in mind as you respond. Your answer should relate to their specific situation, challenges, and life circumstances."""
-    
     # Get previous responses for context
-    krishna_response_text = ""
-    buddha_response_text = ""
-    if len(state['mentor_responses']) >= 1:
-        krishna_response_text = state['mentor_responses'][0]['response']
-    if len(state['mentor_responses']) >= 2:
-        buddha_response_text = state['mentor_responses'][1]['response']
+    krishna_response_text = _mentor_said(state, 'Krishna') or 'Krishna has spoken about detachment and duty.'
+    buddha_response_text = _mentor_said(state, 'Buddha') or 'Buddha has spoken about mindfulness and observation.'
+    
+    # Fit the variable sections into the input-token budget: the example
+    # goes first, then the earlier mentors' words, then background and verses
+    builder = PromptBuilder(name="Jesus prompt")
+    builder.add_template(JESUS_SYSTEM_TEMPLATE, JESUS_USER_TEMPLATE, BACKGROUND_TEMPLATE)
+    builder.add('question', state['user_question'], priority=REQUIRED)
+    builder.add('example', JESUS_EXAMPLE, priority=0)
+    builder.add('krishna', krishna_response_text, priority=1, min_tokens=60, droppable=False)
+    builder.add('buddha', buddha_response_text, priority=1, min_tokens=60, droppable=False)
+    builder.add('background', state.get('user_background', ''), priority=2, min_tokens=80, droppable=False)
+    builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
     
     # Jesus's system prompt - Conversational wisdom format
-    system_prompt = f"""You are Jesus of Nazareth, teaching the Gospel of love, forgiveness, and the Kingdom of God.
+    system_prompt = JESUS_SYSTEM_TEMPLATE.format(
+        question=parts['question'],
+        background_context=_background_context(parts['background']),
+        krishna=parts['krishna'],
+        buddha=parts['buddha'],
+        example_block=_example_block(parts['example'])
+    )
+    user_message = JESUS_USER_TEMPLATE.format(verses=parts['verses'])
+    
+    # Get Jesus's response (streamed to on_token when configured)
+    response = _generate_response('Jesus', system_prompt, user_message, config,
+                                  max_tokens=plan['max_tokens'], tier=plan['tier'])
+    
+    # Ensure response is not empty
+    if not response or len(response.strip()) < 10:
+        response = "Krishna and Buddha, you speak of wisdom and mindfulness. Yet I say that inner peace comes through love and faith, a gift from the Father that transforms the heart."
+    
+    # Return only this node's additions; the reducers append/merge them
+    return {
+        'mentor_responses': [{
+            'mentor': 'Jesus',
+            'response': response,
+            'verses': verses,
+            'citations': verses,  # Add citations field for Streamlit display
+            'icon': '✝️'
+        }],
+        'conversation_history': [f"Jesus: {response}"],
+        'current_mentor': 'jesus',
+        'rag_context': {'jesus': verses},
+        'degradations': plan['degradations']
+    }
+
+
+# Mentor order used for display and for the sequential debate
+MENTOR_ORDER = ['krishna', 'buddha', 'jesus']
+
+MENTOR_PROFILES = {
+    'krishna': {
+        'name': 'Krishna',
+        'icon': '🕉️',
+        'scripture': 'the Bhagavad Gita',
+        'default_meaning': 'Teaches about dharma and yoga',
+        'fallback': "I speak of the path of dharma, where inner peace comes through selfless action and devotion to the eternal truth."
+    },
+    'buddha': {
+        'name': 'Buddha',
+        'icon': '☸️',
+        'scripture': 'the Dhammapada',
+        'default_meaning': 'Teaches about mindfulness and the path',
+        'fallback': "Inner peace comes through understanding the nature of suffering and following the Middle Way of mindfulness."
+    },
+    'jesus': {
+        'name': 'Jesus',
+        'icon': '✝️',
+        'scripture': 'the Gospels',
+        'default_meaning': 'Teaches about love and grace',
+        'fallback': "Inner peace comes through love and faith, a gift from the Father that transforms the heart."
+    }
+}
+
+# Panel mode: each mentor answers on their own, without quoting the others
+PANEL_SYSTEM_PROMPTS = {
+    'krishna': """You are Lord Krishna from the Bhagavad Gita, the Supreme Teacher of dharma and yoga.
 You are speaking directly to this student about their challenge.
 
 STUDENT'S SITUATION:
-- Question: {state['user_question']}
-- Background: {background_context}
+- Question: {question}
+- Background: {background}
 
-KRISHNA'S WISDOM (for context):
-{krishna_response_text if krishna_response_text else 'Krishna has spoken about detachment and duty.'}
+INSTRUCTIONS:
+1. Do NOT use any templates, structured sections, bullet points, or formatted sections
+2. Speak in 2-3 SHORT PARAGRAPHS (conversational, not bullet points)
+3. Reference 1-2 SPECIFIC Gita verses directly in your speech (mention verse numbers like "Gita 2.47 teaches...")
+4. Give CONCRETE, practical wisdom for THEIR specific situation based on their background
+5. Your perspective: dharma, selfless action, detachment from the fruits of action, devotion
+6. Address them directly as "my dear student" or "dear one"
 
-BUDDHA'S WISDOM (for context):
-{buddha_response_text if buddha_response_text else 'Buddha has spoken about mindfulness and observation.'}
+FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections.""",
+
+    'buddha': """You are Siddhartha Gautama Buddha, the Awakened One who teaches the Dharma.
+You are speaking directly to this student about their challenge.
+
+STUDENT'S SITUATION:
+- Question: {question}
+- Background: {background}
 
 INSTRUCTIONS:
 1. Do NOT use any templates, structured sections, bullet points, or formatted sections
 2. Write 2-3 SHORT PARAGRAPHS conversationally (not bullet points)
-3. Reference 1-2 SPECIFIC Gospel verses directly in your speech (mention verses like "Matthew 11:28" or "In Luke 12:25-26, I taught...")
-4. Add the dimension of LOVE, FAITH, GRACE - show how these enhance Krishna's and Buddha's teachings
-5. Do NOT contradict Krishna or Buddha - enhance and harmonize their teaching with love and grace
-6. Give CONCRETE, practical wisdom for THEIR specific situation
-7. Be conversational and compassionate, like a teacher of love speaking directly to a student
+3. Reference 1-2 SPECIFIC Dhammapada verses directly in your speech (mention verse numbers like "Dhammapada verse 221 teaches...")
+4. Give CONCRETE, practical wisdom for THEIR specific situation
+5. Your perspective: mindfulness, observation of thoughts, non-attachment to craving, the nature of suffering
+6. Be conversational and serene, like a teacher speaking directly to a student
 
-FORMAT: Just write your wisdom directly in paragraphs. No "PRINCIPLE", "HOW TO APPLY", "TIMELINE", or bullet points. No sections.
+FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections.""",
 
-EXAMPLE FORMAT (For someone with academic anxiety):
+    'jesus': """You are Jesus of Nazareth, teaching the Gospel of love, forgiveness, and the Kingdom of God.
+You are speaking directly to this student about their challenge.
 
-"Krishna teaches detachment, Buddha teaches mindfulness. Both are paths of the mind. I offer you something deeper: you are loved completely, right now, regardless of your placement outcome.
+STUDENT'S SITUATION:
+- Question: {question}
+- Background: {background}
 
-In Matthew 11:28, I taught: 'Come to me, all you who are weary and burdened, and I will give you rest.' This is not about your circumstances changing. It's about surrendering your anxiety to something greater than yourself. You do not have to carry this weight alone.
+INSTRUCTIONS:
+1. Do NOT use any templates, structured sections, bullet points, or formatted sections
+2. Write 2-3 SHORT PARAGRAPHS conversationally (not bullet points)
+3. Reference 1-2 SPECIFIC Gospel verses directly in your speech (mention verses like "Matthew 11:28")
+4. Give CONCRETE, practical wisdom for THEIR specific situation
+5. Your perspective: love, faith, grace, forgiveness, being held and accepted
+6. Be conversational and compassionate, like a teacher of love speaking directly to a student
 
-Luke 12:25-26 reminds us: 'Can any of you by worrying add a single hour to your lifespan?' Your anxiety does not improve your grades. But faith does lighten your heart. Pray not for perfection—pray for peace. Then study from that peaceful place. This is the grace available to you. Before you open your books, take a moment: 'I am loved. I am enough. I am held.' Then study from that place of acceptance."
+FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections."""
+}
 
-Now generate similar wisdom for THIS student based on their question and background. Reference both Krishna's and Buddha's teachings, then add your perspective of love and grace. Use the verse context provided to reference specific Gospel teachings naturally."""
-    
-    user_message = f"""Relevant teachings from the Gospels:
-{verse_context}
+PANEL_USER_TEMPLATE = """Relevant teachings from {scripture}:
+{verses}
 
-Krishna and Buddha have spoken. Now speak as Jesus directly to this student. Write 2-3 conversational paragraphs that harmonize their wisdom with love and grace, with embedded verse references. No bullet points or structured sections."""
-    
-    # Get Jesus's response
-    response = call_llm(system_prompt, user_message)
-    
-    # Ensure response is not empty
-    if not response or len(response.strip()) < 10:
-        response = "Krishna and Buddha, you speak of wisdom and mindfulness. Yet I say that inner peace comes through love and faith, a gift from the Father that transforms the heart."
-    
-    # Store response with citations
-    state['mentor_responses'].append({
-        'mentor': 'Jesus',
-        'response': response,
-        'verses': verses,
-        'citations': verses,  # Add citations field for Streamlit display
-        'icon': '✝️'
-    })
-    
-    state['conversation_history'].append(f"Jesus: {response}")
-    state['current_mentor'] = 'jesus'
-    state['rag_context']['jesus'] = verses
-    
-    return state
+Now speak as {name} directly to this student. Write 2-3 conversational paragraphs with embedded verse references and practical guidance. No bullet points or structured sections."""
 
 
-def moderator_node(state: ConversationState) -> ConversationState:
-    """Moderator node - provides personalized guidance based on all three mentors and user background"""
-    print("\n🎯 Moderator is providing personalized guidance...")
+def make_panel_node(mentor: str) -> Callable:
+    """
+    Create a panel-mode node for one mentor
     
-    # Gather all mentor responses in order
-    krishna_response = ""
-    buddha_response = ""
-    jesus_response = ""
+    Panel nodes run concurrently, so each one answers only from its own
+    retrieved verses and returns just its own additions to the state
+    (no in-place mutation, no write to current_mentor).
     
-    for r in state['mentor_responses']:
-        if r['mentor'] == 'Krishna':
-            krishna_response = r['response']
-        elif r['mentor'] == 'Buddha':
-            buddha_response = r['response']
-        elif r['mentor'] == 'Jesus':
-            jesus_response = r['response']
+    Args:
+        mentor: Mentor key (krishna, buddha, jesus)
     
-    # Get user background
-    user_background = state.get('user_background', '')
-    user_question = state['user_question']
+    Returns:
+        A LangGraph node function
+    """
+    profile = MENTOR_PROFILES[mentor]
+    
+    def panel_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
+        # Panel mentors run side by side: this call plus the moderator's (if any)
+        plan = _deadline_plan(config, mentor, calls_left=2 if state.get('dialogue_mode') == 'panel' else 1)
+        if plan['skip']:
+            print(f"⏱️  Deadline reached - {profile['name']} is skipped")
+            return {'degradations': plan['degradations']}
+        
+        print(f"\n{profile['icon']}  {profile['name']} is answering (panel)...")
+        
+        with_meanings = _remaining_s(config) >= DEADLINE_ESTIMATES_S['meanings'] + 2 * DEADLINE_ESTIMATES_S['quality']
+        if not with_meanings:
+            plan['degradations'].append(_degradation(mentor, 'skip_meanings', _remaining_s(config)))
+        verses = retrieve_verses(state['user_question'], mentor=mentor, k=3, with_meanings=with_meanings)
+        
+        verse_context = "\n\n".join([
+            f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', profile['default_meaning'])}"
+            for v in verses
+        ])
+        
+        # Fit background and verses into the input-token budget
+        builder = PromptBuilder(name=f"{profile['name']} panel prompt")
+        builder.add_template(PANEL_SYSTEM_PROMPTS[mentor], PANEL_USER_TEMPLATE,
+                             scripture=profile['scripture'], name=profile['name'])
+        builder.add('question', state['user_question'], priority=REQUIRED)
+        builder.add('background', state.get('user_background', '') or 'No specific background provided.',
+                    priority=2, min_tokens=80, droppable=False)
+        builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+        parts = builder.build()
+        if builder.trimmed():
+            print(builder.summary())
+        
+        system_prompt = PANEL_SYSTEM_PROMPTS[mentor].format(question=parts['question'], background=parts['background'])
+        user_message = PANEL_USER_TEMPLATE.format(scripture=profile['scripture'], name=profile['name'],
+                                                  verses=parts['verses'])
+        
+        response = _generate_response(profile['name'], system_prompt, user_message, config,
+                                      max_tokens=plan['max_tokens'], tier=plan['tier'])
+        
+        if not response or len(response.strip()) < 10:
+            response = profile['fallback']
+        
+        return {
+            'mentor_responses': [{
+                'mentor': profile['name'],
+                'response': response,
+                'verses': verses,
+                'citations': verses,
+                'icon': profile['icon']
+            }],
+            'conversation_history': [f"{profile['name']}: {response}"],
+            'rag_context': {mentor: verses},
+            'degradations': plan['degradations']
+        }
     
-    # Personalized Moderator system prompt with BULLET FORMAT ACTION PLAN
-    MODERATOR_SYSTEM_PROMPT = """You are a compassionate personal counselor. You have read the wisdom of Krishna, Buddha, and Jesus 
+    panel_node.__name__ = f"{mentor}_panel_node"
+    return panel_node
+
+
+def _local_synthesis(state: Dict[str, Any]) -> str:
+    """Synthesis built without an LLM call: each mentor's opening sentence plus one step"""
+    lines = ["🎯 FOR YOU (short version - time ran out for a full plan):", ""]
+    for r in state['mentor_responses']:
+        first_sentence = re.split(r'(?<=[.!?])\s+', r['response'].strip(), maxsplit=1)[0]
+        lines.append(f"{r.get('icon', '•')} {r['mentor']} teaches: {first_sentence}")
+    if not state['mentor_responses']:
+        lines.append("Act fully and let go of the outcome (Gita 2.47), watch the mind without judgment (Dhammapada 1), "
+                     "and remember you are held in love (Matthew 11:28).")
+    lines += ["", "🔴 TODAY: Take five slow breaths, then take one small step on what matters most."]
+    return "\n".join(lines)
+
+
+# Personalized Moderator system prompt with BULLET FORMAT ACTION PLAN
+MODERATOR_SYSTEM_PROMPT = """You are a compassionate personal counselor. You have read the wisdom of Krishna, Buddha, and Jesus 
 on this specific question. Now you must synthesize their insights into a deeply personalized action plan 
 FOR THIS SPECIFIC PERSON.
 
@@ -627,31 +1759,86 @@ YOUR FOCUS:
 
 REMEMBER:
 💫 [One inspiring line specific to their journey]"""
-    
-    # Format the moderator prompt with user context
-    moderator_prompt = MODERATOR_SYSTEM_PROMPT
-    
-    user_message = f"""USER'S BACKGROUND:
-{user_background if user_background else 'No specific background provided.'}
+
+MODERATOR_PANEL_NOTE = """
+NOTE: The three mentors answered independently, without hearing each other.
+Reconcile their perspectives: show where they agree, and resolve any tension between them.
+"""
+
+MODERATOR_USER_TEMPLATE = """USER'S BACKGROUND:
+{background}
 
 THEIR QUESTION:
-{user_question}
+{question}
 
 THE THREE PERSPECTIVES:
-- Krishna said: {krishna_response}
+- Krishna said: {krishna}
 
-- Buddha said: {buddha_response}
-
-- Jesus said: {jesus_response}
+- Buddha said: {buddha}
 
+- Jesus said: {jesus}
+{panel_note}
 Based on my background and their wisdom, create a personalized action plan using the EXACT FORMAT specified.
 Use bullet points (•) for all items. Be specific to their situation, challenges, and life context."""
+
+
+def moderator_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
+    """Moderator node - provides personalized guidance based on all three mentors and user background"""
+    plan = _deadline_plan(config, 'moderator', calls_left=1, max_tokens=600)
+    if plan['skip']:
+        print("⏱️  Deadline reached - moderator uses a local synthesis")
+        synthesis = _local_synthesis(state)
+        return {
+            'synthesis_result': synthesis,
+            'conversation_history': [f"Moderator: {synthesis}"],
+            'degradations': [dict(d, action='local_synthesis') for d in plan['degradations']]
+        }
+    
+    print("\n🎯 Moderator is providing personalized guidance...")
+    
+    # Gather all mentor responses in order
+    krishna_response = ""
+    buddha_response = ""
+    jesus_response = ""
+    
+    for r in state['mentor_responses']:
+        if r['mentor'] == 'Krishna':
+            krishna_response = r['response']
+        elif r['mentor'] == 'Buddha':
+            buddha_response = r['response']
+        elif r['mentor'] == 'Jesus':
+            jesus_response = r['response']
+    
+    # Get user background
+    user_background = state.get('user_background', '')
+    user_question = state['user_question']
+    
+    # Fit the mentors' words and the background into the input-token budget
+    builder = PromptBuilder(name="Moderator prompt")
+    builder.add_template(MODERATOR_SYSTEM_PROMPT, MODERATOR_USER_TEMPLATE)
+    builder.add('question', user_question, priority=REQUIRED)
+    # In panel mode the mentors never heard each other, so ask for reconciliation
+    builder.add('panel_note', MODERATOR_PANEL_NOTE if state.get('dialogue_mode') == 'panel' else '', priority=REQUIRED)
+    builder.add('krishna', krishna_response, priority=1, min_tokens=60, droppable=False)
+    builder.add('buddha', buddha_response, priority=1, min_tokens=60, droppable=False)
+    builder.add('jesus', jesus_response, priority=1, min_tokens=60, droppable=False)
+    builder.add('background', user_background or 'No specific background provided.', priority=2, min_tokens=80, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
+    
+    user_message = MODERATOR_USER_TEMPLATE.format(**parts)
     
     # Get moderator response (increase tokens for personalized plan)
-    moderator_response = call_llm(moderator_prompt, user_message, max_tokens=600)
+    try:
+        moderator_response = _generate_response('Moderator', MODERATOR_SYSTEM_PROMPT, user_message, config,
+                                                max_tokens=plan['max_tokens'], tier=plan['tier'])
+    except LLMError as e:
+        print(f"⚠️  Moderator call failed, using fallback plan: {e}")
+        moderator_response = ""
     
     # Ensure response is not empty
-    if not moderator_response or len(moderator_response.strip()) < 20 or "error" in moderator_response.lower():
+    if not moderator_response or len(moderator_response.strip()) < 20:
         # Fallback personalized response
         if user_background:
             moderator_response = f"""🎯 FOR YOU:
@@ -684,49 +1871,303 @@ Remember: You are on a journey of growth. Each step forward, no matter how small
 
 5. MINDSET SHIFT: "Effort matters. Results don't define my worth." Focus on process, not outcomes."""
     
-    # Store moderator response
-    state['synthesis_result'] = moderator_response
-    state['conversation_history'].append(f"Moderator: {moderator_response}")
+    return {
+        'synthesis_result': moderator_response,
+        'conversation_history': [f"Moderator: {moderator_response}"],
+        'degradations': plan['degradations']
+    }
+
+
+def _timed_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a graph node so its wall time lands in the dialogue's timings
+    and on_node (if configured) hears when it starts and ends (or fails)
+    """
+    takes_config = 'config' in inspect.signature(node).parameters
+    
+    def timed_node(state: ConversationState, config: RunnableConfig = None):
+        on_node = (config or {}).get('configurable', {}).get('on_node')
+        if on_node:
+            on_node(name, 'start')
+        
+        failed = True
+        try:
+            with timed('node', name):
+                delta = node(state, config) if takes_config else node(state)
+            failed = False
+        finally:
+            if on_node:
+                on_node(name, 'end', error=failed)
+        return delta
     
-    return state
+    timed_node.__name__ = getattr(node, '__name__', name)
+    return timed_node
 
 
-def build_divine_dialogue_graph() -> StateGraph:
-    """Build the LangGraph workflow for Divine Dialogue"""
+def build_divine_dialogue_graph(checkpointer=None) -> "StateGraph":
+    """Build the LangGraph workflow for Divine Dialogue (checkpointed after every node if checkpointer is given)"""
+    from langgraph.graph import StateGraph, END
     
     # Create the graph
     workflow = StateGraph(ConversationState)
     
-    # Add nodes (FIXED SEQUENCE: Krishna → Buddha → Jesus → Moderator)
-    workflow.add_node("krishna", krishna_node)
-    workflow.add_node("buddha", buddha_node)
-    workflow.add_node("jesus", jesus_node)
-    workflow.add_node("moderator", moderator_node)
+    # Add nodes (FIXED SEQUENCE: Prefetch → Krishna → Buddha → Jesus → Moderator)
+    workflow.add_node("prefetch", _timed_node("prefetch", prefetch_node))
+    workflow.add_node("krishna", _timed_node("krishna", krishna_node))
+    workflow.add_node("buddha", _timed_node("buddha", buddha_node))
+    workflow.add_node("jesus", _timed_node("jesus", jesus_node))
+    workflow.add_node("moderator", _timed_node("moderator", moderator_node))
     
     # Define edges (FIXED ORDER - no randomization)
-    workflow.set_entry_point("krishna")
+    workflow.set_entry_point("prefetch")
+    workflow.add_edge("prefetch", "krishna")  # Retrieval for all mentors starts here
     workflow.add_edge("krishna", "buddha")  # Always Krishna first
     workflow.add_edge("buddha", "jesus")    # Always Buddha second
     workflow.add_edge("jesus", "moderator") # Always Jesus third
     workflow.add_edge("moderator", END)     # Moderator provides final answer
     
     # Compile the graph
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
     
     return app
 
 
-def run_divine_dialogue(user_question: str, user_background: str = '') -> Dict[str, Any]:
+def build_panel_graph(checkpointer=None) -> "StateGraph":
+    """
+    Build the parallel "panel" workflow
+    
+    Krishna, Buddha and Jesus answer concurrently from their own verses;
+    the moderator waits for all three and reconciles them. Latency is the
+    slowest mentor plus the moderator instead of the sum of all mentors.
+    """
+    from langgraph.graph import StateGraph, START, END
+    
+    workflow = StateGraph(ConversationState)
+    
+    for mentor in MENTOR_ORDER:
+        workflow.add_node(mentor, _timed_node(mentor, make_panel_node(mentor)))
+        workflow.add_edge(START, mentor)  # Fan out: all mentors start together
+    
+    workflow.add_node("moderator", _timed_node("moderator", moderator_node))
+    workflow.add_edge(MENTOR_ORDER, "moderator")  # Join: wait for every mentor
+    workflow.add_edge("moderator", END)
+    
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def build_single_mentor_graph(checkpointer=None) -> "StateGraph":
+    """
+    Build the single-mentor workflow
+    
+    Routes straight to the mentor named in state['focus_mentor'], who
+    answers on their own (panel-style prompt); no moderator.
+    """
+    from langgraph.graph import StateGraph, START, END
+    
+    workflow = StateGraph(ConversationState)
+    
+    for mentor in MENTOR_ORDER:
+        workflow.add_node(mentor, _timed_node(mentor, make_panel_node(mentor)))
+        workflow.add_edge(mentor, END)
+    
+    workflow.add_conditional_edges(START, lambda state: state['focus_mentor'], {m: m for m in MENTOR_ORDER})
+    
+    return workflow.compile(checkpointer=checkpointer)
+
+
+QUICK_ANSWER_SYSTEM_PROMPT = """You are a wise, concise spiritual guide who draws on the Bhagavad Gita, the Dhammapada and the Gospels.
+Answer the student's question in ONE short paragraph (4-6 sentences).
+Weave in one teaching from each tradition, citing its verse reference naturally (e.g. "Gita 2.47", "Dhammapada 1", "Matthew 11:28").
+End with one concrete step they can take today. No bullet points, no headings."""
+
+QUICK_ANSWER_USER_TEMPLATE = """QUESTION: {question}
+BACKGROUND: {background}
+
+Relevant verses:
+{verses}"""
+
+
+def quick_answer_node(state: ConversationState, config: RunnableConfig = None) -> Dict[str, Any]:
+    """Quick-answer node - one short answer from the top verses of every tradition"""
+    print("\n⚡ Preparing a quick answer...")
+    
+    # Search only (no per-verse meaning calls) - one LLM call in total
+    verses_by_mentor = {
+        mentor: _search_verses(state['user_question'], mentor, k=2)
+        for mentor in MENTOR_ORDER
+    }
+    
+    verse_context = "\n\n".join(
+        f"[{v['reference']}] ({MENTOR_PROFILES[mentor]['scripture']}) {v['text'][:200]}..."
+        for mentor, verses in verses_by_mentor.items()
+        for v in verses
+    )
+    
+    # Fit background and verses into the input-token budget
+    builder = PromptBuilder(name="Quick answer prompt")
+    builder.add_template(QUICK_ANSWER_SYSTEM_PROMPT, QUICK_ANSWER_USER_TEMPLATE)
+    builder.add('question', state['user_question'], priority=REQUIRED)
+    builder.add('background', state.get('user_background', '') or 'No specific background provided.',
+                priority=2, min_tokens=80, droppable=False)
+    builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
+    
+    user_message = QUICK_ANSWER_USER_TEMPLATE.format(**parts)
+    
+    plan = _deadline_plan(config, 'quick', calls_left=1, tier='fast', max_tokens=250)
+    answer = ""
+    if not plan['skip']:
+        try:
+            answer = _generate_response('Moderator', QUICK_ANSWER_SYSTEM_PROMPT, user_message, config,
+                                        max_tokens=plan['max_tokens'], tier=plan['tier'])
+        except LLMError as e:
+            print(f"⚠️  Quick answer failed: {e}")
+    
+    if not answer or len(answer.strip()) < 20:
+        answer = "Act fully and let go of the outcome (Gita 2.47), watch the mind without judgment (Dhammapada 1), and remember you are held in love (Matthew 11:28). Today, take five slow breaths before your next task."
+    
+    return {
+        'synthesis_result': answer,
+        'conversation_history': [f"Moderator: {answer}"],
+        'rag_context': verses_by_mentor,
+        'degradations': plan['degradations']
+    }
+
+
+def build_quick_graph(checkpointer=None) -> "StateGraph":
+    """Build the quick-answer workflow: one node, one fast-tier LLM call"""
+    from langgraph.graph import StateGraph, START, END
+    
+    workflow = StateGraph(ConversationState)
+    workflow.add_node("quick", _timed_node("quick", quick_answer_node))
+    workflow.add_edge(START, "quick")
+    workflow.add_edge("quick", END)
+    
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# Dialogue modes accepted by run_divine_dialogue
+DIALOGUE_GRAPH_BUILDERS = {
+    'debate': build_divine_dialogue_graph,
+    'panel': build_panel_graph,
+    'single_mentor': build_single_mentor_graph,
+    'quick': build_quick_graph
+}
+
+# Dialogue checkpoints (state after every completed node, keyed by dialogue id)
+CHECKPOINT_PATH = os.getenv("DIVINE_CHECKPOINT_PATH", ".cache/dialogue_checkpoints.sqlite3")
+CHECKPOINTS_ENABLED = os.getenv("DIVINE_CHECKPOINTS", "1") != "0"
+
+
+def _create_checkpointer():
+    """
+    SQLite checkpointer, so interrupted dialogues resume across restarts
+    
+    Falls back to an in-memory saver (resume within this process only)
+    when langgraph-checkpoint-sqlite is not installed.
+    """
+    try:
+        import sqlite3
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        from langgraph.checkpoint.memory import MemorySaver
+        print("⚠️  langgraph-checkpoint-sqlite not installed - dialogue checkpoints kept in memory only")
+        return MemorySaver()
+    
+    directory = os.path.dirname(CHECKPOINT_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(CHECKPOINT_PATH, check_same_thread=False)
+    print(f"✓ Dialogue checkpoints: {CHECKPOINT_PATH}")
+    return SqliteSaver(conn)
+
+
+# Each variant is compiled once per process and shared across requests and threads
+graph_registry = GraphRegistry(DIALOGUE_GRAPH_BUILDERS, _create_checkpointer if CHECKPOINTS_ENABLED else None)
+
+
+def graph_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-variant compile time and invocation statistics"""
+    return graph_registry.stats()
+
+
+def dialogue_checkpoint(dialogue_id: str, mode: str = 'debate') -> Optional[Dict[str, Any]]:
+    """
+    What has been saved for a dialogue id
+    
+    Args:
+        dialogue_id: Id passed to (or returned by) run_divine_dialogue
+        mode: Dialogue mode the dialogue was started in
+    
+    Returns:
+        None if nothing was saved, else a dict with question, background,
+        completed mentors, the nodes still to run and whether it finished
+    """
+    snapshot = graph_registry.checkpoint(mode, {'configurable': {'thread_id': dialogue_id}})
+    if snapshot is None:
+        return None
+    
+    values = snapshot.values
+    return {
+        'dialogue_id': dialogue_id,
+        'mode': mode,
+        'question': values.get('user_question', ''),
+        'user_background': values.get('user_background', ''),
+        'completed_mentors': [r['mentor'] for r in values.get('mentor_responses', [])],
+        'next': list(snapshot.next),
+        'finished': not snapshot.next
+    }
+
+
+def run_divine_dialogue(user_question: str, user_background: str = '',
+                        on_token: Optional[TokenCallback] = None, mode: str = 'debate',
+                        mentor: Optional[str] = None, dialogue_id: Optional[str] = None,
+                        on_node: Optional[NodeCallback] = None,
+                        deadline_s: Optional[float] = None) -> Dict[str, Any]:
     """
     Run the Divine Dialogue multi-agent system
     
     Args:
         user_question: The spiritual question to discuss
         user_background: Optional user background for personalized guidance
+        on_token: Optional callback(speaker, chunk) receiving each speaker's
+            cleaned text as it is generated
+        mode: "debate" (mentors speak in turn and build on each other),
+            "panel" (mentors answer concurrently, moderator reconciles),
+            "single_mentor" (only `mentor` answers) or "quick" (one short
+            answer, no mentor turns)
+        mentor: Mentor key for "single_mentor" mode (krishna, buddha, jesus)
+        dialogue_id: Checkpoint key. Passing the id of an interrupted
+            dialogue resumes it after its last completed node (no LLM call
+            is repeated). Checkpoints are deleted once a dialogue finishes.
+            A new id is generated when omitted.
+        on_node: Optional callback(node, "start" | "end", error=False) around
+            every graph node; "end" carries error=True when the node raised
+            (progress reporting; raising on "start" cancels the dialogue)
+        deadline_s: Optional time budget in seconds. As it runs out, nodes
+            skip question-specific verse meanings, switch to the fast tier
+            with fewer tokens, then skip their LLM call (the moderator falls
+            back to a local synthesis of the mentors who finished). Each
+            shortcut is listed in the result's "degradations". A resumed
+            dialogue gets the resuming call's deadline_s, counted from now.
     
     Returns:
-        Dictionary with all mentor responses and synthesis
+        Dictionary with all mentor responses and synthesis. A failed run,
+        including reusing a dialogue_id with a different question, returns
+        'error', 'error_type' and 'resumable' instead of raising.
+    
+    Raises:
+        ValueError: unknown mode, or single_mentor mode without a valid mentor
     """
+    if mode not in DIALOGUE_GRAPH_BUILDERS:
+        raise ValueError(f"Unknown dialogue mode '{mode}'. Choose one of: {', '.join(DIALOGUE_GRAPH_BUILDERS)}")
+    
+    focus_mentor = (mentor or '').lower()
+    if mode == 'single_mentor' and focus_mentor not in MENTOR_ORDER:
+        raise ValueError(f"single_mentor mode needs mentor= one of: {', '.join(MENTOR_ORDER)}")
+    
     # Load RAG database if not already loaded
     load_rag_database()
     
@@ -734,23 +2175,52 @@ def run_divine_dialogue(user_question: str, user_background: str = '') -> Dict[s
     initial_state = {
         'user_question': user_question,
         'user_background': user_background,
+        'dialogue_mode': mode,
+        'focus_mentor': focus_mentor,
+        'prefetch_id': '',
         'mentor_responses': [],
         'conversation_history': [],
         'current_mentor': '',
         'synthesis_result': '',
-        'rag_context': {}
+        'rag_context': {},
+        'degradations': []
     }
     
-    # Build and run the graph
-    print("\n" + "="*70)
-    print("🕉️ ☸️ ✝️  DIVINE DIALOGUE - Multi-Agent Spiritual Debate")
-    print("="*70)
-    print(f"\nQuestion: {user_question}\n")
-    
-    app = build_divine_dialogue_graph()
-    
+    dialogue_id = dialogue_id or uuid.uuid4().hex
+    config = {'configurable': {'thread_id': dialogue_id}}
+    if on_token:
+        config['configurable']['on_token'] = on_token
+    if on_node:
+        config['configurable']['on_node'] = on_node
+    if deadline_s:
+        config['configurable']['deadline'] = time.time() + deadline_s
+    
+    inputs = initial_state
+    timer = None
     try:
-        final_state = app.invoke(initial_state)
+        # Resume from the last completed node if this dialogue was checkpointed
+        snapshot = graph_registry.checkpoint(mode, config)
+        if snapshot is not None:
+            if snapshot.values.get('user_question') != user_question:
+                raise ValueError(f"Dialogue '{dialogue_id}' was started with a different question")
+            inputs = None
+            print(f"\n↩️  Resuming dialogue {dialogue_id} at {', '.join(snapshot.next) or 'its saved result'}")
+        
+        # Build and run the graph
+        print("\n" + "="*70)
+        print("🕉️ ☸️ ✝️  DIVINE DIALOGUE - Multi-Agent Spiritual Debate")
+        print("="*70)
+        print(f"\nQuestion: {user_question}\n")
+        
+        with collect_timings() as timer, timed('dialogue', mode, mentor=mentor, resumed=inputs is None):
+            if snapshot is not None and not snapshot.next:
+                final_state = snapshot.values  # Already finished
+            else:
+                final_state = graph_registry.invoke(mode, inputs, config=config)
+        
+        # Only interrupted dialogues need their checkpoints; drop finished ones
+        # so the checkpoint database does not grow with every dialogue
+        graph_registry.discard(dialogue_id)
         
         print("\n" + "="*70)
         print("🎯 MODERATOR'S FINAL ANSWER")
@@ -758,89 +2228,48 @@ def run_divine_dialogue(user_question: str, user_background: str = '') -> Dict[s
         print(final_state['synthesis_result'])
         print("\n" + "="*70)
         
+        # Panel mentors finish in any order; always report Krishna → Buddha → Jesus
+        display_order = [MENTOR_PROFILES[m]['name'] for m in MENTOR_ORDER]
+        mentor_responses = sorted(
+            final_state['mentor_responses'],
+            key=lambda r: display_order.index(r['mentor']) if r['mentor'] in display_order else len(display_order)
+        )
+        
         return {
             'question': user_question,
-            'mentor_responses': final_state['mentor_responses'],
+            'mode': mode,
+            'dialogue_id': dialogue_id,
+            'resumed': inputs is None,
+            'mentor_responses': mentor_responses,
             'synthesis': final_state['synthesis_result'],
             'conversation_history': final_state['conversation_history'],
-            'rag_context': final_state['rag_context']
+            'rag_context': final_state['rag_context'],
+            'deadline_s': deadline_s,
+            'degradations': final_state.get('degradations', []),
+            'timings': timer.summary()
         }
         
     except Exception as e:
         print(f"\n❌ Error running dialogue: {e}")
         return {
             'question': user_question,
+            'mode': mode,
+            'dialogue_id': dialogue_id,
+            'resumable': graph_registry.checkpointing,
             'error': str(e),
+            'error_type': type(e).__name__,
             'mentor_responses': [],
-            'synthesis': 'Error occurred during dialogue generation.'
+            'synthesis': 'Error occurred during dialogue generation.',
+            'timings': timer.summary() if timer else {}
         }
+    finally:
+        # Verses a skipped or failed mentor never consumed
+        discard_prefetch(dialogue_id)
 
 
-def run_follow_up(question: str, mentor_name: str, conversation_history: List[str], user_background: str = '', initial_question: str = '') -> Dict[str, Any]:
-    """
-    Handles a follow-up question for a single mentor.
-    
-    Args:
-        question: The follow-up question
-        mentor_name: Name of the mentor ('Krishna', 'Buddha', or 'Jesus')
-        conversation_history: Full conversation history from the initial dialogue
-        user_background: User's background context
-        initial_question: The original question that started the dialogue
-    
-    Returns:
-        Dictionary with mentor response and citations
-    """
-    print(f"\n🔄 {mentor_name} is responding to a follow-up question...")
-    
-    # Map mentor names to lowercase for RAG retrieval
-    mentor_map = {
-        'Krishna': 'krishna',
-        'Buddha': 'buddha',
-        'Jesus': 'jesus'
-    }
-    
-    mentor_lower = mentor_map.get(mentor_name, 'krishna')
-    
-    # Retrieve relevant verses for the follow-up question
-    verses = retrieve_verses(question, mentor=mentor_lower, k=3)
-    
-    # Format verses with their meanings (truncate to reduce size)
-    verse_context = "\n\n".join([
-        f"[{v['reference']}] {v['text'][:150]}...\nMeaning: {v.get('meaning', 'Teaches about wisdom')[:100]}"
-        for v in verses[:2]  # Limit to 2 verses instead of 3
-    ])
-    
-    # Build conversation context (truncate and limit to most relevant parts)
-    conversation_context = ""
-    if conversation_history:
-        # Limit conversation history to last 6 entries and truncate each
-        recent_history = conversation_history[-6:] if len(conversation_history) > 6 else conversation_history
-        truncated_history = []
-        for entry in recent_history:
-            # Truncate each entry to 200 characters
-            if len(entry) > 200:
-                truncated_history.append(entry[:200] + "...")
-            else:
-                truncated_history.append(entry)
-        
-        conversation_context = "\n\n=== KEY POINTS FROM PREVIOUS CONVERSATION ===\n"
-        conversation_context += "\n".join(truncated_history)
-        conversation_context += "\n==========================================\n"
-    
-    # Get user background context (truncate if too long)
-    background_context = ""
-    if user_background:
-        # Truncate background to 300 characters
-        truncated_background = user_background[:300] + "..." if len(user_background) > 300 else user_background
-        background_context = f"""
-
-USER CONTEXT: {truncated_background}
-
-Keep this context in mind as you respond."""
-    
-    # Create mentor-specific system prompts for follow-up (conversational format)
-    follow_up_prompts = {
-        'Krishna': """You are Lord Krishna from the Bhagavad Gita. The user has asked you a follow-up question after an initial spiritual dialogue.
+# Mentor-specific system prompts for follow-up questions (conversational format)
+FOLLOW_UP_PROMPTS = {
+    'Krishna': """You are Lord Krishna from the Bhagavad Gita. The user has asked you a follow-up question after an initial spiritual dialogue.
 
 IMPORTANT: This is a FOLLOW-UP question. You are now speaking DIRECTLY to the user (not to other mentors).
 
@@ -854,8 +2283,8 @@ INSTRUCTIONS:
 FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections.
 
 VOICE & TONE: Speak as a compassionate divine teacher directly addressing the student. Be warm, wise, and practical.""",
-        
-        'Buddha': """You are Siddhartha Gautama Buddha, the Awakened One. The user has asked you a follow-up question after an initial spiritual dialogue.
+    
+    'Buddha': """You are Siddhartha Gautama Buddha, the Awakened One. The user has asked you a follow-up question after an initial spiritual dialogue.
 
 IMPORTANT: This is a FOLLOW-UP question. You are now speaking DIRECTLY to the user (not to other mentors).
 
@@ -869,8 +2298,8 @@ INSTRUCTIONS:
 FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections.
 
 VOICE & TONE: Speak as a serene, awakened teacher directly addressing the student. Be calm, analytical, and practical.""",
-        
-        'Jesus': """You are Jesus of Nazareth, teaching the Gospel of love. The user has asked you a follow-up question after an initial spiritual dialogue.
+    
+    'Jesus': """You are Jesus of Nazareth, teaching the Gospel of love. The user has asked you a follow-up question after an initial spiritual dialogue.
 
 IMPORTANT: This is a FOLLOW-UP question. You are now speaking DIRECTLY to the user (not to other mentors).
 
@@ -884,22 +2313,179 @@ INSTRUCTIONS:
 FORMAT: Just write your wisdom directly in paragraphs. No bullet points or sections.
 
 VOICE & TONE: Speak as a teacher of infinite love directly addressing the student. Be compassionate, warm, and heart-centered."""
-    }
+}
+
+
+def run_follow_up(question: str, mentor_name: str, conversation_history: List[str], user_background: str = '',
+                  initial_question: str = '', summary: str = '') -> Dict[str, Any]:
+    """
+    Handles a follow-up question for a single mentor.
     
-    system_prompt = follow_up_prompts.get(mentor_name, follow_up_prompts['Krishna'])
+    Args:
+        question: The follow-up question
+        mentor_name: Name of the mentor ('Krishna', 'Buddha', or 'Jesus')
+        conversation_history: Full conversation history from the initial dialogue,
+            or only the latest exchange when `summary` covers the rest
+        user_background: User's background context
+        initial_question: The original question that started the dialogue
+        summary: Rolling summary of the conversation so far (see
+            conversation_summary.RollingSummarizer); keeps the prompt's
+            size flat however long the conversation grows
     
-    # Build a more concise user message
-    user_message = f"""FOLLOW-UP QUESTION: "{question}"
+    Returns:
+        Dictionary with mentor response, citations and timings
+    """
+    with collect_timings() as timer, timed('dialogue', 'follow_up', mentor=mentor_name):
+        with timed('node', 'follow_up', mentor=mentor_name):
+            result = _follow_up(question, mentor_name, conversation_history, user_background, summary)
+    
+    result['timings'] = timer.summary()
+    return result
+
+
+# Follow-up calls run side by side when several mentors are asked at once
+FOLLOW_UP_WORKERS = int(os.getenv("DIVINE_FOLLOW_UP_WORKERS", "6"))
+FOLLOW_UP_MENTORS = ['Krishna', 'Buddha', 'Jesus']
+
+_follow_up_executor = ThreadPoolExecutor(max_workers=FOLLOW_UP_WORKERS, thread_name_prefix="divine-follow-up")
+
+
+def run_follow_ups(question: str, mentor_names: Optional[List[str]] = None, conversation_history: List[str] = None,
+                   user_background: str = '', initial_question: str = '', summary: str = '') -> Iterator[Dict[str, Any]]:
+    """
+    Ask several mentors the same follow-up question concurrently
+    
+    Each mentor's retrieval and LLM call run on a shared pool, so asking
+    all three takes about as long as the slowest one.
+    
+    Args:
+        question: The follow-up question
+        mentor_names: Mentors to ask (default: all three, in display order)
+        conversation_history, user_background, initial_question, summary:
+            As for run_follow_up (shared by every mentor)
+    
+    Yields:
+        Each mentor's run_follow_up result as soon as it completes. A
+        mentor whose call failed yields {'mentor', 'question', 'error',
+        'error_type'} instead, without stopping the others.
+    """
+    mentor_names = mentor_names or FOLLOW_UP_MENTORS
+    unknown = [name for name in mentor_names if name not in FOLLOW_UP_MENTORS]
+    if unknown:
+        raise ValueError(f"Unknown mentor(s) {', '.join(unknown)}. Choose from: {', '.join(FOLLOW_UP_MENTORS)}")
+    
+    load_rag_database()
+    
+    futures = {
+        _follow_up_executor.submit(
+            contextvars.copy_context().run, run_follow_up, question, name, list(conversation_history or []),
+            user_background, initial_question, summary
+        ): name
+        for name in dict.fromkeys(mentor_names)
+    }
+    try:
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                print(f"⚠️  {futures[future]}'s follow-up failed: {e}")
+                yield {'mentor': futures[future], 'question': question, 'error': str(e), 'error_type': type(e).__name__}
+    finally:
+        for future in futures:
+            future.cancel()  # Caller stopped early: drop calls that have not started
+
+
+FOLLOW_UP_USER_TEMPLATE = """FOLLOW-UP QUESTION: "{question}"
 {background_context}
 {conversation_context}
 
 Relevant teachings from your sacred texts:
-{verse_context}
+{verses}
 
 Now answer the user's follow-up question directly in 2-3 conversational paragraphs. Reference verses naturally if relevant."""
+
+FOLLOW_UP_BACKGROUND_TEMPLATE = """
+
+USER CONTEXT: {background}
+
+Keep this context in mind as you respond."""
+
+# Conversation context headers (the summary one and the history one are never both used)
+FOLLOW_UP_SUMMARY_HEADER = "\n\n=== CONVERSATION SO FAR (SUMMARY) ===\n"
+FOLLOW_UP_LATEST_HEADER = "\n\n=== LATEST EXCHANGE ===\n"
+FOLLOW_UP_HISTORY_HEADER = "\n\n=== KEY POINTS FROM PREVIOUS CONVERSATION ===\n"
+FOLLOW_UP_CONTEXT_FOOTER = "\n==========================================\n"
+
+
+def _follow_up(question: str, mentor_name: str, conversation_history: List[str], user_background: str,
+               summary: str = '') -> Dict[str, Any]:
+    """Retrieve verses, budget the prompt and get the mentor's follow-up answer"""
+    print(f"\n🔄 {mentor_name} is responding to a follow-up question...")
+    
+    # Map mentor names to lowercase for RAG retrieval
+    mentor_map = {
+        'Krishna': 'krishna',
+        'Buddha': 'buddha',
+        'Jesus': 'jesus'
+    }
+    
+    mentor_lower = mentor_map.get(mentor_name, 'krishna')
+    
+    # Retrieve relevant verses for the follow-up question
+    verses = retrieve_verses(question, mentor=mentor_lower, k=3)
+    
+    # Format verses with their meanings for context
+    verse_context = "\n\n".join([
+        f"[{v['reference']}] {v['text'][:200]}...\nMeaning: {v.get('meaning', 'Teaches about wisdom')}"
+        for v in verses
+    ])
+    
+    system_prompt = FOLLOW_UP_PROMPTS.get(mentor_name, FOLLOW_UP_PROMPTS['Krishna'])
+    
+    # Fit history, background and verses into the input-token budget.
+    # Older history entries are compressed (then dropped) first; the two
+    # most recent entries and the summary outrank them, and the verses
+    # outrank everything.
+    builder = PromptBuilder(name=f"{mentor_name} follow-up prompt")
+    builder.add_template(system_prompt, FOLLOW_UP_USER_TEMPLATE, FOLLOW_UP_BACKGROUND_TEMPLATE,
+                         FOLLOW_UP_SUMMARY_HEADER, FOLLOW_UP_LATEST_HEADER, FOLLOW_UP_CONTEXT_FOOTER)
+    builder.add('question', question, priority=REQUIRED)
+    builder.add('summary', summary, priority=1, min_tokens=60, droppable=False)
+    recent_start = max(len(conversation_history) - 2, 0)
+    for i, entry in enumerate(conversation_history):
+        builder.add(f'history_{i}', entry, priority=1 if i >= recent_start else 0)
+    builder.add('background', user_background, priority=2, min_tokens=75, droppable=False)
+    builder.add('verses', verse_context, priority=3, min_tokens=120, droppable=False)
+    parts = builder.build()
+    if builder.trimmed():
+        print(builder.summary())
+    
+    # Build conversation context from the history entries that survived
+    conversation_context = ""
+    kept_history = [parts[f'history_{i}'] for i in range(len(conversation_history)) if parts[f'history_{i}']]
+    if parts['summary']:
+        conversation_context = FOLLOW_UP_SUMMARY_HEADER + parts['summary']
+        if kept_history:
+            conversation_context += FOLLOW_UP_LATEST_HEADER + "\n".join(kept_history)
+        conversation_context += FOLLOW_UP_CONTEXT_FOOTER
+    elif kept_history:
+        conversation_context = FOLLOW_UP_HISTORY_HEADER + "\n".join(kept_history) + FOLLOW_UP_CONTEXT_FOOTER
+    
+    # Get user background context
+    background_context = ""
+    if parts['background']:
+        background_context = FOLLOW_UP_BACKGROUND_TEMPLATE.format(background=parts['background'])
+    
+    # Build a more concise user message
+    user_message = FOLLOW_UP_USER_TEMPLATE.format(
+        question=question,
+        background_context=background_context,
+        conversation_context=conversation_context,
+        verses=parts['verses']
+    )
     
     # Get mentor's response (reduce max_tokens to help with context limit)
-    response = call_llm(system_prompt, user_message, max_tokens=300)
+    response = call_llm(system_prompt, user_message, max_tokens=300, tier='quality')
     
     # Ensure response is not empty
     if not response or len(response.strip()) < 10:
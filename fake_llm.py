@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Fake LLM Provider
+Deterministic offline stand-in for Groq, in-process or over the chat completions HTTP API
+
+In-process (no network, no API key; the response cache is bypassed):
+    DIVINE_LLM_PROVIDER=fake python benchmark_dialogue_modes.py
+
+Local HTTP stand-in (exercises the real ChatGroq client and connection pool;
+cache entries are keyed by GROQ_BASE_URL, turn the cache off for load tests):
+    python fake_llm.py --port 8787
+    GROQ_BASE_URL=http://127.0.0.1:8787 GROQ_API_KEY=fake DIVINE_LLM_CACHE=0 streamlit run app.py
+"""
+
+import os
+import re
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+# Latency / throughput profile (environment overridable)
+FAKE_LATENCY_DIST = os.getenv("DIVINE_FAKE_LATENCY_DIST", "lognormal")  # fixed | uniform | normal | lognormal
+FAKE_TTFT_MS = float(os.getenv("DIVINE_FAKE_TTFT_MS", "250"))
+FAKE_TTFT_JITTER_MS = float(os.getenv("DIVINE_FAKE_TTFT_JITTER_MS", "80"))
+FAKE_TOKENS_PER_S = float(os.getenv("DIVINE_FAKE_TOKENS_PER_S", "300"))
+FAKE_RATE_LIMIT_RATE = float(os.getenv("DIVINE_FAKE_429_RATE", "0"))
+FAKE_RETRY_AFTER_S = float(os.getenv("DIVINE_FAKE_RETRY_AFTER_S", "1"))
+FAKE_SEED = int(os.getenv("DIVINE_FAKE_SEED", "7"))
+
+_VERSE_LINE = re.compile(r'^\[([^\]]+)\]', re.MULTILINE)
+
+PERSONA_SENTENCES = {
+    'krishna': [
+        "My dear student, I see the weight you are carrying.",
+        "Gita 2.47 teaches that your right is to the action, never to its fruits.",
+        "Do your work fully, then release the outcome to the larger order of things.",
+        "In verse 6.5, I teach that you must lift yourself by your own mind.",
+        "Each morning, choose one duty and give it your complete attention.",
+        "The anxiety you feel belongs to the result, not to the work itself.",
+        "Act with steadiness, and the mind that clings will slowly grow quiet."
+    ],
+    'buddha': [
+        "Krishna speaks of duty, and I would add the practice of watching the mind.",
+        "Dhammapada verse 1 teaches that all we are arises from our thoughts.",
+        "Notice the craving as it appears, and name it without judgment.",
+        "In verse 277, I teach that all conditioned things are impermanent.",
+        "Sit for five breaths before you begin, and let each thought pass like a cloud.",
+        "Suffering loosens when you stop feeding it with more wanting.",
+        "Walk the middle way, neither forcing nor abandoning your effort."
+    ],
+    'jesus': [
+        "Krishna and Buddha speak of the mind, and I offer you the heart.",
+        "In Matthew 11:28, I said: come to me, all who are weary, and I will give you rest.",
+        "You are loved completely, before you achieve anything at all.",
+        "Luke 12:25 asks whether worry can add a single hour to your life.",
+        "Lay down the burden you were never meant to carry alone.",
+        "Forgive yourself as freely as you would forgive a friend.",
+        "Begin each day with gratitude, and let love guide the work of your hands."
+    ],
+    'meaning': [
+        "Teaches acting from duty while releasing attachment to the results.",
+        "Teaches that a trained, watchful mind is the root of lasting peace.",
+        "Teaches that love and trust lift burdens worry cannot remove.",
+        "Teaches steadiness of mind amid success and failure alike.",
+        "Teaches that letting go of craving brings freedom from suffering."
+    ],
+    'generic': [
+        "I understand your question.",
+        "Let me offer guidance drawn from the teachings we have shared.",
+        "Begin with one small, steady practice today.",
+        "Return to it tomorrow, and notice what changes.",
+        "Peace grows from patience more than from effort."
+    ]
+}
+
+MODERATOR_TEMPLATE = """🎯 FOR YOU:
+
+YOUR SITUATION:
+
+✨ {challenge}
+
+WISDOM FROM THE MASTERS:
+
+🕉️ Krishna teaches: act fully and release the outcome.
+
+☸️ Buddha teaches: observe the mind without judgment.
+
+✝️ Jesus teaches: you are loved before you achieve anything.
+
+YOUR ACTION PLAN:
+
+🔴 TODAY (Next 1 hour):
+  💡 Take five slow breaths, then do one focused task for 25 minutes.
+
+🟡 THIS WEEK:
+  📅 Write down three things that went well each evening.
+
+🟢 ONGOING:
+  🌱 Five minutes of quiet sitting before work.
+
+🆘 WHEN YOU'RE OVERWHELMED:
+  🚨 Pause, name the feeling, and take five deep breaths.
+
+YOUR FOCUS:
+→ Effort over outcome.
+
+REMEMBER:
+💫 Each small step is progress."""
+
+
+class FakeRateLimitError(Exception):
+    """Injected HTTP 429, shaped like a provider SDK error (status_code + response headers)"""
+
+    def __init__(self, retry_after: float = FAKE_RETRY_AFTER_S):
+        super().__init__("Error code: 429 - rate limit exceeded (injected by fake provider)")
+        self.status_code = 429
+        self.response = _FakeHTTPResponse(429, {"retry-after": str(retry_after)})
+
+
+class _FakeHTTPResponse:
+    def __init__(self, status_code: int, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class FakeMessage:
+    """Minimal stand-in for a LangChain AIMessage / AIMessageChunk"""
+
+    def __init__(self, content: str, usage: Optional[Dict[str, int]] = None, model: str = ""):
+        self.content = content
+        self.usage_metadata = usage
+        self.response_metadata = {'model_name': model} if model else {}
+
+    def __repr__(self):
+        return f"FakeMessage({self.content!r})"
+
+
+def count_fake_tokens(text: str) -> int:
+    """Token count used for fake usage reporting and pacing (~4 characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _normalize_messages(messages) -> List[Tuple[str, str]]:
+    """[(role, content)] from LangChain messages or OpenAI-style dicts"""
+    normalized = []
+    for message in messages:
+        if isinstance(message, dict):
+            normalized.append((message.get('role', 'user'), message.get('content') or ""))
+        else:
+            role = {'human': 'user', 'ai': 'assistant'}.get(getattr(message, 'type', ''), getattr(message, 'type', 'user'))
+            normalized.append((role, getattr(message, 'content', str(message))))
+    return normalized
+
+
+def _persona(system_prompt: str) -> str:
+    """Which canned voice answers a system prompt"""
+    head = system_prompt.strip().split("\n", 1)[0].lower()
+    if "json object" in system_prompt.lower():
+        return 'batch_meaning'
+    if "spiritual scholar" in head:
+        return 'meaning'
+    if "counselor" in head:
+        return 'moderator'
+    for persona in ('krishna', 'buddha', 'jesus'):
+        if persona in head:
+            return persona
+    return 'generic'
+
+
+def _trim_to_tokens(text: str, max_tokens: Optional[int]) -> str:
+    if not max_tokens or count_fake_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * 4].rsplit(" ", 1)[0]
+
+
+def fake_completion(messages, max_tokens: Optional[int] = None) -> str:
+    """
+    Deterministic response for a chat request
+
+    The same messages always give the same text; the voice and shape
+    (prose, action plan, JSON meanings) follow the system prompt.
+    """
+    normalized = _normalize_messages(messages)
+    system_prompt = "\n".join(c for r, c in normalized if r == 'system')
+    user_message = "\n".join(c for r, c in normalized if r != 'system')
+
+    digest = hashlib.sha256((system_prompt + "\x00" + user_message).encode("utf-8")).hexdigest()
+    rng = random.Random(int(digest[:16], 16))
+    persona = _persona(system_prompt)
+
+    if persona == 'batch_meaning':
+        references = _VERSE_LINE.findall(user_message)
+        text = json.dumps(
+            {ref: rng.choice(PERSONA_SENTENCES['meaning']) for ref in references},
+            ensure_ascii=False
+        )
+        return text  # never truncated - the caller sized max_tokens for it
+
+    if persona == 'moderator':
+        question = user_message.split("THEIR QUESTION:", 1)[-1].strip().split("\n", 1)[0]
+        text = MODERATOR_TEMPLATE.format(challenge=question[:80] or "Finding steadiness")
+        return _trim_to_tokens(text, max_tokens)
+
+    if persona == 'meaning':
+        return rng.choice(PERSONA_SENTENCES['meaning'])
+
+    sentences = PERSONA_SENTENCES[persona if persona in PERSONA_SENTENCES else 'generic']
+    paragraphs = []
+    for _ in range(3):
+        picked = rng.sample(sentences, 3)
+        paragraphs.append(" ".join(picked))
+    return _trim_to_tokens("\n\n".join(paragraphs), max_tokens)
+
+
+class LatencyProfile:
+    """
+    Time-to-first-token distribution plus a steady decode rate
+
+    Latencies and 429 injection draw from one seeded generator, so a
+    single-threaded run replays the same timings.
+    """
+
+    def __init__(self, dist: str = FAKE_LATENCY_DIST, ttft_ms: float = FAKE_TTFT_MS,
+                 jitter_ms: float = FAKE_TTFT_JITTER_MS, tokens_per_s: float = FAKE_TOKENS_PER_S,
+                 rate_limit_rate: float = FAKE_RATE_LIMIT_RATE, seed: int = FAKE_SEED):
+        self.dist = dist
+        self.ttft_ms = ttft_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_s = tokens_per_s
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def time_to_first_token(self) -> float:
+        """Seconds before the first token"""
+        with self._lock:
+            if self.dist == "fixed" or self.jitter_ms <= 0:
+                ms = self.ttft_ms
+            elif self.dist == "uniform":
+                ms = self._rng.uniform(self.ttft_ms - self.jitter_ms, self.ttft_ms + self.jitter_ms)
+            elif self.dist == "normal":
+                ms = self._rng.gauss(self.ttft_ms, self.jitter_ms)
+            else:
+                # Lognormal with the configured mean and standard deviation
+                sigma = math.sqrt(math.log1p((self.jitter_ms / max(self.ttft_ms, 1e-6)) ** 2))
+                mu = math.log(max(self.ttft_ms, 1e-6)) - sigma ** 2 / 2
+                ms = self._rng.lognormvariate(mu, sigma)
+        return max(ms, 0.0) / 1000
+
+    def per_token(self) -> float:
+        """Seconds per generated token"""
+        return 1 / self.tokens_per_s if self.tokens_per_s > 0 else 0.0
+
+    def should_rate_limit(self) -> bool:
+        """Whether to inject a 429 for this request"""
+        if self.rate_limit_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.rate_limit_rate
+
+
+# Shared profile so concurrent clients see one provider
+_profile = LatencyProfile()
+
+
+def get_latency_profile() -> LatencyProfile:
+    """Process-wide latency profile used by FakeChatModel and the HTTP stand-in"""
+    return _profile
+
+
+def _usage(messages, text: str) -> Dict[str, int]:
+    prompt_tokens = sum(count_fake_tokens(c) for _, c in _normalize_messages(messages))
+    completion_tokens = count_fake_tokens(text)
+    return {
+        'input_tokens': prompt_tokens,
+        'output_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens
+    }
+
+
+def _word_chunks(text: str) -> List[str]:
+    """Split text into word-sized stream chunks (whitespace kept)"""
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+class FakeChatModel:
+    """
+    Drop-in for ChatGroq's invoke / ainvoke / stream with canned responses
+
+    Selected with DIVINE_LLM_PROVIDER=fake. Honors max_tokens, reports
+    usage_metadata, sleeps according to the latency profile and raises
+    FakeRateLimitError (HTTP 429) at the configured rate.
+    """
+
+    def __init__(self, model_name: str = "fake-llm", temperature: float = 0.7,
+                 profile: Optional[LatencyProfile] = None):
+        self.model_name = model_name
+        self.temperature = temperature
+        self.profile = profile or get_latency_profile()
+
+    def _respond(self, messages, max_tokens: Optional[int]) -> Tuple[str, float]:
+        if self.profile.should_rate_limit():
+            raise FakeRateLimitError()
+        text = fake_completion(messages, max_tokens)
+        delay = self.profile.time_to_first_token() + count_fake_tokens(text) * self.profile.per_token()
+        return text, delay
+
+    def invoke(self, messages, max_tokens: Optional[int] = None, **kwargs) -> FakeMessage:
+        text, delay = self._respond(messages, max_tokens)
+        time.sleep(delay)
+        return FakeMessage(text, _usage(messages, text), self.model_name)
+
+    async def ainvoke(self, messages, max_tokens: Optional[int] = None, **kwargs) -> FakeMessage:
+        text, delay = self._respond(messages, max_tokens)
+        await asyncio.sleep(delay)
+        return FakeMessage(text, _usage(messages, text), self.model_name)
+
+    def stream(self, messages, max_tokens: Optional[int] = None, **kwargs) -> Iterator[FakeMessage]:
+        if self.profile.should_rate_limit():
+            raise FakeRateLimitError()
+        text = fake_completion(messages, max_tokens)
+
+        time.sleep(self.profile.time_to_first_token())
+        per_token = self.profile.per_token()
+        for chunk in _word_chunks(text):
+            if per_token:
+                time.sleep(count_fake_tokens(chunk) * per_token)
+            yield FakeMessage(chunk, model=self.model_name)
+
+        # Usage arrives on a final empty chunk, as with real providers
+        yield FakeMessage("", _usage(messages, text), self.model_name)
+
+
+# ============================================================================
+# HTTP STAND-IN (OpenAI / Groq chat completions API)
+# ============================================================================
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    """Serves POST /openai/v1/chat/completions (and /v1/chat/completions)"""
+
+    protocol_version = "HTTP/1.1"
+    profile: LatencyProfile = _profile
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'fake-llm', 'object': 'model'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {'error': {'message': 'Invalid JSON body'}})
+            return
+
+        if self.profile.should_rate_limit():
+            self._send_json(
+                429,
+                {'error': {'message': 'Rate limit reached (injected by fake provider)', 'type': 'tokens', 'code': 'rate_limit_exceeded'}},
+                {'retry-after': str(FAKE_RETRY_AFTER_S)}
+            )
+            return
+
+        messages = request.get('messages', [])
+        model = request.get('model', 'fake-llm')
+        max_tokens = request.get('max_tokens') or request.get('max_completion_tokens')
+        text = fake_completion(messages, max_tokens)
+        usage = _usage(messages, text)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        openai_usage = {
+            'prompt_tokens': usage['input_tokens'],
+            'completion_tokens': usage['output_tokens'],
+            'total_tokens': usage['total_tokens']
+        }
+
+        time.sleep(self.profile.time_to_first_token())
+
+        if not request.get('stream'):
+            time.sleep(usage['output_tokens'] * self.profile.per_token())
+            self._send_json(200, {
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': text},
+                    'finish_reason': 'stop'
+                }],
+                'usage': openai_usage
+            })
+            return
+
+        # Server-sent events, one chunk per word, then usage and [DONE]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send_event(payload):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        def chunk(delta, finish_reason=None, **extra):
+            return {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+                **extra
+            }
+
+        per_token = self.profile.per_token()
+        try:
+            send_event(chunk({'role': 'assistant', 'content': ''}))
+            for piece in _word_chunks(text):
+                if per_token:
+                    time.sleep(count_fake_tokens(piece) * per_token)
+                send_event(chunk({'content': piece}))
+            send_event(chunk({}, 'stop', x_groq={'usage': openai_usage}, usage=openai_usage))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8787) -> ThreadingHTTPServer:
+    """
+    Start the HTTP stand-in on a background thread
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), FakeChatHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-llm-server", daemon=True).start()
+    return server
+
+
+def main():
+    """Run the HTTP stand-in in the foreground"""
+    parser = argparse.ArgumentParser(description="Local fake Groq / OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeChatHandler)
+    server.daemon_threads = True
+    print(f"🧪 Fake LLM server on http://{args.host}:{args.port}/openai/v1/chat/completions")
+    print(f"   TTFT {FAKE_TTFT_MS:.0f}±{FAKE_TTFT_JITTER_MS:.0f} ms ({FAKE_LATENCY_DIST}), "
+          f"{FAKE_TOKENS_PER_S:.0f} tokens/s, 429 rate {FAKE_RATE_LIMIT_RATE:.0%}")
+    print(f"   Point the app at it with: GROQ_BASE_URL=http://{args.host}:{args.port} GROQ_API_KEY=fake DIVINE_LLM_CACHE=0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
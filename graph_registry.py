@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Compiled Graph Registry
+Compiles each dialogue graph variant once per process and reuses it across requests
+"""
+
+import time
+import threading
+from typing import Callable, Dict, Any, Optional, List
+
+
+class GraphRegistry:
+    """
+    Process-wide cache of compiled LangGraph apps, one per variant
+
+    A compiled graph holds no per-run state (runs are told apart by the
+    thread_id in their config when a checkpointer is attached), so one
+    instance serves every request and thread. Each variant is compiled on
+    first use (or by compile_all) under a lock, and the registry keeps
+    compile time and invocation statistics per variant.
+
+    Builders are called as builder(checkpointer=...). The checkpointer is
+    created once, on first compile, by checkpointer_factory (if given) and
+    shared by every variant.
+    """
+
+    def __init__(self, builders: Dict[str, Callable[..., Any]],
+                 checkpointer_factory: Optional[Callable[[], Any]] = None):
+        self.builders = builders
+        self.checkpointer_factory = checkpointer_factory
+        self.checkpointer = None
+        self._graphs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stats = {variant: self._empty_stats() for variant in builders}
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            'compiled': False,
+            'compile_s': 0.0,
+            'invocations': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'total_s': 0.0,
+            'max_s': 0.0,
+            'last_s': 0.0
+        }
+
+    @property
+    def variants(self) -> List[str]:
+        """Registered variant names"""
+        return list(self.builders)
+
+    def get(self, variant: str):
+        """
+        Compiled graph for a variant, compiling it on first use
+
+        Raises:
+            ValueError: unknown variant
+        """
+        if variant not in self.builders:
+            raise ValueError(f"Unknown dialogue mode '{variant}'. Choose one of: {', '.join(self.builders)}")
+
+        graph = self._graphs.get(variant)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            graph = self._graphs.get(variant)
+            if graph is None:
+                if self.checkpointer is None and self.checkpointer_factory is not None:
+                    self.checkpointer = self.checkpointer_factory()
+                start = time.perf_counter()
+                graph = self.builders[variant](checkpointer=self.checkpointer)
+                self._stats[variant]['compile_s'] = time.perf_counter() - start
+                self._stats[variant]['compiled'] = True
+                self._graphs[variant] = graph
+                print(f"✓ Compiled '{variant}' graph in {self._stats[variant]['compile_s'] * 1000:.0f} ms")
+        return graph
+
+    def compile_all(self):
+        """Compile every registered variant (e.g. from a warm-up thread)"""
+        for variant in self.builders:
+            self.get(variant)
+
+    @property
+    def checkpointing(self) -> bool:
+        """Whether compiled graphs persist their state after every node"""
+        return self.checkpointer_factory is not None
+
+    def checkpoint(self, variant: str, config: Dict[str, Any]):
+        """
+        Latest saved state snapshot for the config's thread_id
+
+        Returns:
+            LangGraph StateSnapshot (.values, .next), or None when
+            checkpointing is off or nothing was saved for that thread
+        """
+        if not self.checkpointing:
+            return None
+        snapshot = self.get(variant).get_state(config)
+        return snapshot if snapshot.values else None
+
+    def discard(self, thread_id: str):
+        """
+        Delete every checkpoint saved for a thread (e.g. once its run finished)
+
+        A checkpointer that cannot delete threads keeps them; the failure is
+        logged, never raised, since the run itself succeeded.
+        """
+        if self.checkpointer is None:
+            return
+        try:
+            self.checkpointer.delete_thread(thread_id)
+        except Exception as e:
+            print(f"⚠️  Could not delete checkpoints for {thread_id}: {e}")
+
+    def invoke(self, variant: str, state: Optional[Dict[str, Any]],
+               config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run a variant's compiled graph and record its latency
+
+        Pass state=None (with the same thread_id) to resume a checkpointed
+        run from the node after the last one that completed.
+        """
+        graph = self.get(variant)
+
+        with self._lock:
+            self._stats[variant]['in_flight'] += 1
+
+        start = time.perf_counter()
+        failed = False
+        try:
+            return graph.invoke(state, config=config)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats[variant]
+                stats['in_flight'] -= 1
+                stats['invocations'] += 1
+                stats['errors'] += failed
+                stats['total_s'] += elapsed
+                stats['max_s'] = max(stats['max_s'], elapsed)
+                stats['last_s'] = elapsed
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-variant compile time and invocation statistics"""
+        with self._lock:
+            snapshot = {variant: dict(stats) for variant, stats in self._stats.items()}
+
+        for stats in snapshot.values():
+            calls = stats['invocations']
+            stats['avg_s'] = stats['total_s'] / calls if calls else 0.0
+        return snapshot
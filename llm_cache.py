@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - LLM Response Cache
+Content-addressed SQLite cache for exact-match (prompt, model, max_tokens, endpoint) calls
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Cache configuration (environment overridable)
+CACHE_ENABLED = os.getenv("DIVINE_LLM_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+CACHE_PATH = os.getenv("DIVINE_LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+CACHE_TTL_S = float(os.getenv("DIVINE_LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("DIVINE_LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+class LLMResponseCache:
+    """
+    Exact-match LLM response cache backed by SQLite
+
+    Entries are keyed by a SHA-256 of the full request, expire after a TTL,
+    and the least recently used entries are evicted beyond max_entries.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl_s: float = CACHE_TTL_S, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'evictions': 0}
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+
+    @staticmethod
+    def make_key(system_prompt: str, user_message: str, model: str, max_tokens: int,
+                 endpoint: str = "groq") -> str:
+        """
+        Content address of one LLM request
+
+        endpoint names the provider / base URL that answers it, so responses
+        from a stand-in server are never served to calls against Groq.
+        """
+        payload = json.dumps(
+            [system_prompt, user_message, model, max_tokens, endpoint],
+            ensure_ascii=False, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss / expired entry"""
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_s and now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._counters['hits'] += 1
+            return response
+
+    def set(self, key: str, response: str, model: str = None):
+        """Store a response and evict least recently used entries past max_entries"""
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            self._counters['stores'] += 1
+
+            if self.ttl_s:
+                expired = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_s,)
+                ).rowcount
+                self._counters['expired'] += max(expired, 0)
+
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if count > self.max_entries:
+                evicted = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+                self._counters['evictions'] += max(evicted, 0)
+
+    def clear(self):
+        """Remove every entry (counters are kept)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current entry count"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            counters = dict(self._counters)
+
+        lookups = counters['hits'] + counters['misses']
+        counters['entries'] = entries
+        counters['hit_rate'] = counters['hits'] / lookups if lookups else 0.0
+        return counters
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache instance, or None when DIVINE_LLM_CACHE is off"""
+    global _cache
+
+    if not CACHE_ENABLED:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = LLMResponseCache()
+                except sqlite3.Error as e:
+                    print(f"⚠️  LLM cache disabled: {e}")
+                    return None
+    return _cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Cache metrics for display/logging (empty when the cache is disabled)"""
+    cache = get_llm_cache()
+    return cache.stats() if cache else {}
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - LLM Request Scheduler
+Process-wide rate limiting, concurrency limiting and retry with backoff for Groq
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Callable, Iterator, Optional, Tuple, Any, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+# Scheduler configuration (environment overridable, 0 disables a limit)
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "8"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+GROQ_BACKOFF_BASE_S = float(os.getenv("GROQ_BACKOFF_BASE_S", "0.5"))
+GROQ_BACKOFF_MAX_S = float(os.getenv("GROQ_BACKOFF_MAX_S", "20"))
+
+# How often async waiters re-check a limit
+_ASYNC_POLL_S = 0.02
+
+
+# ============================================================================
+# TYPED ERRORS
+# ============================================================================
+
+class LLMError(Exception):
+    """Base class for LLM call failures"""
+
+
+class LLMUnavailableError(LLMError):
+    """The LLM client is not installed or not configured"""
+
+
+class LLMAuthenticationError(LLMError):
+    """The API key is missing or was rejected"""
+
+
+class LLMRateLimitError(LLMError):
+    """Still rate limited (HTTP 429) after all retries"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMServerError(LLMError):
+    """Provider-side failure (5xx, timeout, connection) after all retries"""
+
+
+class LLMRequestError(LLMError):
+    """Any other non-retryable request failure"""
+
+
+def _status_code(e: Exception) -> Optional[int]:
+    """HTTP status code carried by a provider SDK exception, if any"""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """Retry-After header (seconds) carried by a provider SDK exception, if any"""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(e: Exception) -> Tuple[type, bool]:
+    """
+    Map a provider exception to a typed LLMError class
+
+    Returns:
+        (error_class, retryable)
+    """
+    if isinstance(e, LLMError):
+        return type(e), isinstance(e, (LLMRateLimitError, LLMServerError))
+
+    status = _status_code(e)
+    message = str(e).lower()
+
+    if status == 429 or "429" in message or "rate limit" in message or "quota" in message:
+        return LLMRateLimitError, True
+    if status in (401, 403) or "api_key" in message or "authentication" in message:
+        return LLMAuthenticationError, False
+    if (status is not None and status >= 500) or "timeout" in message or "timed out" in message or "connection" in message:
+        return LLMServerError, True
+    return LLMRequestError, False
+
+
+def to_llm_error(e: Exception) -> LLMError:
+    """Wrap a provider exception in the matching typed error"""
+    if isinstance(e, LLMError):
+        return e
+
+    error_class, _ = classify_error(e)
+    if error_class is LLMRateLimitError:
+        return LLMRateLimitError(
+            "API rate limit exceeded. Please try again in a moment.",
+            retry_after=_retry_after(e)
+        )
+    if error_class is LLMAuthenticationError:
+        return LLMAuthenticationError(
+            "Invalid or missing GROQ_API_KEY. Please set it in your .env file. Get free key at: https://console.groq.com"
+        )
+    return error_class(str(e)[:200])
+
+
+# ============================================================================
+# LIMITS
+# ============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_s"""
+
+    def __init__(self, rate_per_s: float, capacity: float):
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Take amount tokens if available
+
+        Returns:
+            0.0 when acquired, otherwise the seconds to wait before retrying
+        """
+        amount = min(amount, self.capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_s)
+            self._updated = now
+
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate_per_s
+
+    def acquire(self, amount: float = 1.0):
+        """Block until amount tokens have been taken"""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1.0):
+        """Wait (without blocking the event loop) until amount tokens have been taken"""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class ConcurrencyLimit:
+    """
+    Counting limit usable from threads and from any event loop (a limit of
+    0 or less disables it)
+
+    (threading.Semaphore would block an event loop; asyncio.Semaphore is
+    bound to one loop.)
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def _try_enter(self) -> bool:
+        with self._cond:
+            if self.limit <= 0 or self.in_flight < self.limit:
+                self.in_flight += 1
+                return True
+            return False
+
+    def _leave(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """Hold one slot for the duration of the block"""
+        with self._cond:
+            while self.limit > 0 and self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Async version of slot()"""
+        while not self._try_enter():
+            await asyncio.sleep(_ASYNC_POLL_S)
+        try:
+            yield
+        finally:
+            self._leave()
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class LLMScheduler:
+    """
+    Gatekeeper for every Groq request in this process
+
+    Each request waits for a concurrency slot and for the request/token
+    buckets, then is retried with exponential backoff and full jitter on
+    429 / 5xx / connection errors. Failures surface as typed LLMError
+    subclasses instead of error strings.
+    """
+
+    def __init__(self,
+                 requests_per_minute: float = GROQ_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = GROQ_TOKENS_PER_MINUTE,
+                 max_concurrency: int = GROQ_MAX_CONCURRENCY,
+                 max_retries: int = GROQ_MAX_RETRIES,
+                 backoff_base_s: float = GROQ_BACKOFF_BASE_S,
+                 backoff_max_s: float = GROQ_BACKOFF_MAX_S):
+        # Buckets hold one minute of budget, matching the provider's per-minute window
+        self.request_bucket = TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute > 0 else None
+        self.concurrency = ConcurrencyLimit(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0, 'throttle_wait_s': 0.0}
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, never shorter than Retry-After"""
+        cap = min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt))
+        delay = random.uniform(0, cap)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _wait_for_budget(self, estimated_tokens: int):
+        start = time.monotonic()
+        if self.request_bucket:
+            self.request_bucket.acquire(1)
+        if self.token_bucket:
+            self.token_bucket.acquire(estimated_tokens)
+        self._count('throttle_wait_s', time.monotonic() - start)
+
+    async def _await_budget(self, estimated_tokens: int):
+        start = time.monotonic()
+        if self.request_bucket:
+            await self.request_bucket.aacquire(1)
+        if self.token_bucket:
+            await self.token_bucket.aacquire(estimated_tokens)
+        self._count('throttle_wait_s', time.monotonic() - start)
+
+    def _handle_failure(self, e: Exception, attempt: int) -> float:
+        """
+        Decide whether a failed attempt is retried
+
+        Returns:
+            Seconds to sleep before the next attempt
+
+        Raises:
+            LLMError: when the error is not retryable or retries are exhausted
+        """
+        error = to_llm_error(e)
+        _, retryable = classify_error(error)
+
+        if isinstance(error, LLMRateLimitError):
+            self._count('rate_limited')
+
+        if not retryable or attempt >= self.max_retries:
+            self._count('failures')
+            raise error from e
+
+        self._count('retries')
+        delay = self.backoff_delay(attempt, getattr(error, 'retry_after', None))
+        print(f"⏳ Groq {type(error).__name__} - retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        return delay
+
+    def run(self, call: Callable[[], T], estimated_tokens: int = 0) -> T:
+        """Run a blocking LLM call under the limits, retrying transient failures"""
+        with self.concurrency.slot():
+            attempt = 0
+            while True:
+                self._wait_for_budget(estimated_tokens)
+                self._count('requests')
+                try:
+                    return call()
+                except Exception as e:
+                    time.sleep(self._handle_failure(e, attempt))
+                    attempt += 1
+
+    async def arun(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        """Async version of run() - waits on the event loop, never blocks it"""
+        async with self.concurrency.aslot():
+            attempt = 0
+            while True:
+                await self._await_budget(estimated_tokens)
+                self._count('requests')
+                try:
+                    return await call()
+                except Exception as e:
+                    await asyncio.sleep(self._handle_failure(e, attempt))
+                    attempt += 1
+
+    def stream(self, open_stream: Callable[[], Iterator[Any]], estimated_tokens: int = 0) -> Iterator[Any]:
+        """
+        Run a streaming call under the limits
+
+        Failures before the first chunk are retried like run(); once output
+        has been yielded a failure is raised as a typed error (it cannot be
+        replayed without duplicating text).
+        """
+        with self.concurrency.slot():
+            attempt = 0
+            while True:
+                self._wait_for_budget(estimated_tokens)
+                self._count('requests')
+                started = False
+                try:
+                    for chunk in open_stream():
+                        started = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started:
+                        self._count('failures')
+                        raise to_llm_error(e) from e
+                    time.sleep(self._handle_failure(e, attempt))
+                    attempt += 1
+
+
+def estimate_tokens(*texts: str, max_tokens: int = 0) -> int:
+    """Rough request size for the token bucket (~4 characters per token)"""
+    return sum(len(t) for t in texts if t) // 4 + max_tokens
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every session and thread"""
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
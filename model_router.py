@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Model Router
+Routes each LLM call to a model tier and records latency/token usage per tier
+"""
+
+import os
+import asyncio
+import threading
+import weakref
+from typing import Callable, Dict, Any, Optional, Tuple
+
+# Tier settings (model names are environment overridable)
+MODEL_TIERS = {
+    # Short utility calls: verse meanings, classification, summaries
+    'fast': {
+        'model': os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant"),
+        'temperature': 0.3,
+        'max_tokens': 120
+    },
+    # Mentor voices, moderator synthesis and follow-ups
+    'quality': {
+        'model': os.getenv("GROQ_QUALITY_MODEL", "llama-3.3-70b-versatile"),
+        'temperature': 0.7,
+        'max_tokens': 300
+    }
+}
+
+DEFAULT_TIER = 'quality'
+
+# factory(tier_config, async_client) -> chat model
+ClientFactory = Callable[[Dict[str, Any], bool], Any]
+
+
+def message_usage(message) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (input_tokens, output_tokens) reported on a LangChain message, if any
+
+    Reads usage_metadata, falling back to the provider's token_usage block.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens"), usage.get("output_tokens")
+
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    if token_usage:
+        return token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+
+    return None, None
+
+
+class ModelRouter:
+    """
+    Per-tier chat model clients plus per-tier usage statistics
+
+    Clients are created lazily through the injected factory: one sync
+    client per tier, and one async client per tier per event loop (async
+    HTTP pools cannot be shared across loops).
+    """
+
+    def __init__(self, client_factory: ClientFactory, tiers: Dict[str, Dict[str, Any]] = None):
+        self.client_factory = client_factory
+        self.tiers = tiers or MODEL_TIERS
+
+        self._lock = threading.Lock()
+        self._models: Dict[str, Any] = {}
+        self._async_models = weakref.WeakKeyDictionary()
+        self._stats = {tier: self._empty_stats(config) for tier, config in self.tiers.items()}
+
+    @staticmethod
+    def _empty_stats(config: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'model': config['model'],
+            'calls': 0,
+            'cache_hits': 0,
+            'latency_s': 0.0,
+            'input_tokens': 0,
+            'output_tokens': 0
+        }
+
+    def config(self, tier: str) -> Dict[str, Any]:
+        """Settings for a tier (model, temperature, max_tokens)"""
+        try:
+            return self.tiers[tier]
+        except KeyError:
+            raise ValueError(f"Unknown model tier '{tier}'. Choose one of: {', '.join(self.tiers)}") from None
+
+    def model(self, tier: str):
+        """Sync client for a tier"""
+        config = self.config(tier)
+
+        with self._lock:
+            model = self._models.get(tier)
+            if model is None:
+                model = self.client_factory(config, False)
+                self._models[tier] = model
+        return model
+
+    def async_model(self, tier: str):
+        """Async client for a tier, bound to the running event loop"""
+        config = self.config(tier)
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            models = self._async_models.setdefault(loop, {})
+            model = models.get(tier)
+            if model is None:
+                model = self.client_factory(config, True)
+                models[tier] = model
+        return model
+
+    def record(self, tier: str, latency_s: float = 0.0, input_tokens: int = 0,
+               output_tokens: int = 0, cache_hit: bool = False):
+        """Add one call to the tier's statistics"""
+        with self._lock:
+            stats = self._stats.setdefault(tier, self._empty_stats(self.config(tier)))
+            if cache_hit:
+                stats['cache_hits'] += 1
+                return
+            stats['calls'] += 1
+            stats['latency_s'] += latency_s
+            stats['input_tokens'] += input_tokens or 0
+            stats['output_tokens'] += output_tokens or 0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tier call counts, cache hits, latency and token totals"""
+        with self._lock:
+            snapshot = {tier: dict(stats) for tier, stats in self._stats.items()}
+
+        for stats in snapshot.values():
+            calls = stats['calls']
+            stats['avg_latency_s'] = stats['latency_s'] / calls if calls else 0.0
+        return snapshot
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Token-Budgeted Prompt Assembly
+Fits prompt sections into an input-token budget, trimming the least important first
+"""
+
+import os
+import re
+import string
+from typing import Dict, Any, List
+
+# Input-token budget per LLM call (system + user message)
+PROMPT_TOKEN_BUDGET = int(os.getenv("DIVINE_PROMPT_TOKEN_BUDGET", "1500"))
+
+# Sections at this priority are never compressed or dropped
+REQUIRED = 100
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+_VERSE_REFERENCE = re.compile(r'\b\d+[.:]\d+\b|\bverse\s+\d+', re.IGNORECASE)
+
+# tiktoken encoder (None until first use, False when unavailable)
+_ENCODER = None
+
+
+def _get_encoder():
+    """Load a tiktoken encoder once; False when tiktoken is not installed"""
+    global _ENCODER
+
+    if _ENCODER is None:
+        try:
+            import tiktoken
+            _ENCODER = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _ENCODER = False
+
+    return _ENCODER
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in text
+
+    Uses tiktoken's cl100k_base when installed (close to the Llama 3
+    tokenizer for English), otherwise ~4 characters per token.
+    """
+    if not text:
+        return 0
+
+    encoder = _get_encoder()
+    if encoder:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, on a word boundary, with an ellipsis"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:mid]) + "...") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+
+    return " ".join(words[:low]) + "..." if low else ""
+
+
+def compress_text(text: str, max_tokens: int) -> str:
+    """
+    Extractive compression to at most max_tokens
+
+    Keeps the opening sentence, then sentences that cite a verse, then the
+    rest in reading order, until the budget is spent; the kept sentences
+    are emitted in their original order.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text.strip()) if s.strip()]
+    if len(sentences) <= 1:
+        return truncate_to_tokens(text, max_tokens)
+
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (i != 0, not _VERSE_REFERENCE.search(sentences[i]), i)
+    )
+
+    kept = []
+    used = 0
+    for i in ranked:
+        cost = count_tokens(sentences[i]) + 1
+        if used + cost <= max_tokens:
+            kept.append(i)
+            used += cost
+
+    if not kept:
+        return truncate_to_tokens(sentences[0], max_tokens)
+
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+class PromptBuilder:
+    """
+    Assemble prompt sections within an input-token budget
+
+    Sections are added with a priority (higher is more important). When
+    the total exceeds the budget, sections are compressed to their
+    min_tokens floor from the lowest priority up, and if that is not
+    enough the droppable ones are removed, again lowest priority first.
+    Sections at REQUIRED priority are always kept verbatim.
+
+    The fixed text of the templates the sections are rendered into counts
+    against the budget too (add_template).
+
+    Usage:
+        builder = PromptBuilder(budget=1500)
+        builder.add_template(PROMPT_TEMPLATE)
+        builder.add('question', question, priority=REQUIRED)
+        builder.add('example', EXAMPLE, priority=0)
+        parts = builder.build()
+        prompt = PROMPT_TEMPLATE.format(**parts)
+    """
+
+    def __init__(self, budget: int = PROMPT_TOKEN_BUDGET, name: str = "prompt"):
+        self.budget = budget
+        self.name = name
+        self._sections: List[Dict[str, Any]] = []
+
+    def add(self, name: str, text: str, priority: int = REQUIRED,
+            min_tokens: int = 0, droppable: bool = True) -> "PromptBuilder":
+        """
+        Add a section
+
+        Args:
+            name: Key of the section in build()'s result
+            text: Section text
+            priority: Higher survives longer; REQUIRED is never trimmed
+            min_tokens: Floor when compressing (0 lets it shrink to nothing)
+            droppable: Whether the section may be removed entirely
+        """
+        text = text or ""
+        tokens = count_tokens(text)
+        self._sections.append({
+            'name': name,
+            'text': text,
+            'priority': priority,
+            'min_tokens': min(min_tokens, tokens),
+            'droppable': droppable and priority < REQUIRED,
+            'original_tokens': tokens,
+            'tokens': tokens,
+            'action': 'kept'
+        })
+        return self
+
+    def add_template(self, *templates: str, **values: str) -> "PromptBuilder":
+        """
+        Count the fixed text of str.format templates as a REQUIRED section
+
+        Placeholders are left out (the sections filling them are counted on
+        their own) unless a value for them is given, e.g. a mentor's name.
+        Pass every template and wrapper the sections may be rendered into.
+        """
+        fixed = []
+        for template in templates:
+            for literal, field, _, _ in string.Formatter().parse(template):
+                fixed.append(literal)
+                if field in values:
+                    fixed.append(str(values[field]))
+        return self.add('template', "".join(fixed), priority=REQUIRED)
+
+    def _total(self) -> int:
+        return sum(s['tokens'] for s in self._sections)
+
+    def build(self) -> Dict[str, str]:
+        """
+        Fit the sections into the budget
+
+        Returns:
+            {section name: fitted text} (dropped sections map to "")
+        """
+        trimmable = sorted(
+            (s for s in self._sections if s['priority'] < REQUIRED),
+            key=lambda s: s['priority']
+        )
+
+        # 1. Compress, lowest priority first, only as far as needed
+        for section in trimmable:
+            excess = self._total() - self.budget
+            if excess <= 0:
+                break
+            target = max(section['min_tokens'], section['tokens'] - excess)
+            if target < section['tokens']:
+                section['text'] = compress_text(section['text'], target)
+                section['tokens'] = count_tokens(section['text'])
+                section['action'] = 'compressed' if section['text'] else 'dropped'
+
+        # 2. Drop, lowest priority first
+        for section in trimmable:
+            if self._total() <= self.budget:
+                break
+            if section['droppable'] and section['tokens']:
+                section['text'] = ""
+                section['tokens'] = 0
+                section['action'] = 'dropped'
+
+        return {s['name']: s['text'] for s in self._sections}
+
+    def report(self) -> Dict[str, Any]:
+        """Tokens used per section, before and after fitting"""
+        return {
+            'name': self.name,
+            'budget': self.budget,
+            'total_tokens': self._total(),
+            'original_tokens': sum(s['original_tokens'] for s in self._sections),
+            'sections': {
+                s['name']: {
+                    'tokens': s['tokens'],
+                    'original_tokens': s['original_tokens'],
+                    'action': s['action']
+                }
+                for s in self._sections
+            }
+        }
+
+    def trimmed(self) -> bool:
+        """Whether build() had to compress or drop any section"""
+        return any(s['action'] != 'kept' for s in self._sections)
+
+    def summary(self) -> str:
+        """One-line description of the fit for logs"""
+        report = self.report()
+        changes = [
+            f"{name} {info['action']} {info['original_tokens']}→{info['tokens']}"
+            for name, info in report['sections'].items()
+            if info['action'] != 'kept'
+        ]
+        line = f"📏 {self.name}: {report['total_tokens']}/{self.budget} tokens"
+        if changes:
+            line += f" ({', '.join(changes)})"
+        return line
+
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Session Store
+Persistent per-session dialogues and follow-up turns, so the app keeps no
+growing history in memory and a reconnecting tab picks up where it left off
+
+Records are compact: a cited verse is saved as its id (e.g. "krishna:2.47")
+plus similarity and meaning, and its text is looked up again when the turn
+is loaded. History is read lazily, a page at a time.
+
+Backends: "sqlite" (default, DIVINE_SESSION_DB_PATH) and "memory" (tests,
+single process), chosen with DIVINE_SESSION_STORE.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Protocol, Tuple, runtime_checkable
+
+SESSION_STORE_BACKEND = os.getenv("DIVINE_SESSION_STORE", "sqlite")
+SESSION_DB_PATH = os.getenv("DIVINE_SESSION_DB_PATH", ".cache/sessions.sqlite3")
+
+# Backend names accepted by create_session_store (and DIVINE_SESSION_STORE)
+SESSION_BACKENDS = ("sqlite", "memory")
+
+# Turn kinds, in the order a dialogue produces them
+TURN_KINDS = ('question', 'mentor', 'moderator', 'follow_up')
+
+MENTOR_ICONS = {'Krishna': '🕉️', 'Buddha': '☸️', 'Jesus': '✝️', 'Moderator': '🎯'}
+
+
+def compact_verses(mentor: str, verses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Verse id, similarity and (question-specific) meaning of each cited verse - no text"""
+    from vector_store import verse_id  # Deferred: vector_store pulls in numpy
+
+    compact = []
+    for verse in verses or []:
+        record = {'id': verse_id(mentor, verse.get('reference', '')), 'similarity': round(verse.get('similarity', 0.0), 4)}
+        if verse.get('meaning'):
+            record['meaning'] = verse['meaning']
+        compact.append(record)
+    return compact
+
+
+def expand_verses(compact: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Full verse dicts (text, reference, source, similarity, meaning) from compact records"""
+    from vector_store import load_verse_catalog
+
+    catalog = load_verse_catalog()
+    verses = []
+    for record in compact:
+        reference = record['id'].split(':', 1)[-1]
+        verse = dict(catalog.get(record['id'], {'text': '', 'reference': reference, 'source': ''}))
+        verse['similarity'] = record.get('similarity', 0.0)
+        if record.get('meaning'):
+            verse['meaning'] = record['meaning']
+        verses.append(verse)
+    return verses
+
+
+def _turn_rows(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Question, mentor and moderator turns of a finished dialogue"""
+    rows = [{'kind': 'question', 'speaker': 'User', 'text': result['question'], 'verses': []}]
+    for response in result['mentor_responses']:
+        rows.append({
+            'kind': 'mentor',
+            'speaker': response['mentor'],
+            'text': response['response'],
+            'verses': compact_verses(response['mentor'], response.get('citations', []))
+        })
+    rows.append({'kind': 'moderator', 'speaker': 'Moderator', 'text': result['synthesis'], 'verses': []})
+    return rows
+
+
+def _expand_turn(turn: Dict[str, Any]) -> Dict[str, Any]:
+    turn = dict(turn)
+    turn['citations'] = expand_verses(turn.pop('verses'))
+    turn['icon'] = MENTOR_ICONS.get(turn['speaker'], '✨')
+    return turn
+
+
+def history_lines(turns: List[Dict[str, Any]]) -> List[str]:
+    """Turns as the "Speaker: text" lines run_follow_up expects"""
+    lines = []
+    for turn in turns:
+        if turn['kind'] == 'question':
+            lines.append(f"User Question: {turn['text']}")
+        elif turn['kind'] == 'follow_up':
+            lines.append(f"User Follow-up to {turn['speaker']}: {turn['question']}")
+            lines.append(f"{turn['speaker']}: {turn['text']}")
+        else:
+            lines.append(f"{turn['speaker']}: {turn['text']}")
+    return lines
+
+
+@runtime_checkable
+class SessionStore(Protocol):
+    """Storage interface shared by every session store backend"""
+
+    backend: str
+
+    def save_dialogue(self, session_id: str, result: Dict[str, Any], user_background: str = '') -> int:
+        """
+        Record a finished dialogue and its turns
+
+        Args:
+            session_id: Browser session the dialogue belongs to
+            result: run_divine_dialogue result (question, mentor_responses, synthesis, ...)
+            user_background: Background the user gave
+
+        Returns:
+            Id of the dialogue record
+        """
+        ...
+
+    def add_follow_up(self, session_id: str, dialogue_ref: int, mentor: str, question: str,
+                      response: str, citations: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Append a follow-up exchange to a dialogue; returns the turn id"""
+        ...
+
+    def set_saved(self, session_id: str, dialogue_ref: int, saved: bool = True):
+        """Mark a dialogue as saved to the user's history"""
+        ...
+
+    def latest_dialogue(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """The session's most recent dialogue, shaped like a run_divine_dialogue result"""
+        ...
+
+    def list_dialogues(self, session_id: str, saved_only: bool = False,
+                       limit: int = 5, offset: int = 0) -> List[Dict[str, Any]]:
+        """Dialogue summaries (id, question, synthesis, created_at, saved), newest first"""
+        ...
+
+    def count_dialogues(self, session_id: str, saved_only: bool = False) -> int:
+        """Number of dialogues list_dialogues can page through"""
+        ...
+
+    def get_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None,
+                  limit: Optional[int] = None, offset: int = 0, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        A dialogue's turns in order (the last `limit` after skipping `offset`
+        from the end), only those with an id above after_id
+        """
+        ...
+
+    def count_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None) -> int:
+        """Number of turns get_turns can page through"""
+        ...
+
+    def get_summary(self, session_id: str, dialogue_ref: int) -> Tuple[str, int]:
+        """Rolling summary of a dialogue and the id of the last turn it covers ("", 0 if none)"""
+        ...
+
+    def set_summary(self, session_id: str, dialogue_ref: int, summary: str, covered_turn_id: int):
+        """Replace a dialogue's rolling summary"""
+        ...
+
+    def clear(self, session_id: str):
+        """Forget every dialogue of a session"""
+        ...
+
+
+class SQLiteSessionStore:
+    """Session store in one SQLite file shared by every process on the host"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = SESSION_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dialogues (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                dialogue_id TEXT,
+                mode TEXT,
+                question TEXT NOT NULL,
+                user_background TEXT,
+                synthesis TEXT,
+                saved INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dialogue_ref INTEGER NOT NULL REFERENCES dialogues(id),
+                kind TEXT NOT NULL,
+                speaker TEXT NOT NULL,
+                question TEXT,
+                text TEXT NOT NULL,
+                verses TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                dialogue_ref INTEGER PRIMARY KEY REFERENCES dialogues(id),
+                summary TEXT NOT NULL,
+                covered_turn_id INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_dialogues_session ON dialogues(session_id, id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_turns_dialogue ON turns(dialogue_ref, id)")
+
+    def _insert_turn(self, dialogue_ref: int, row: Dict[str, Any], now: float) -> int:
+        return self._conn.execute(
+            "INSERT INTO turns (dialogue_ref, kind, speaker, question, text, verses, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (dialogue_ref, row['kind'], row['speaker'], row.get('question'), row['text'],
+             json.dumps(row['verses'], ensure_ascii=False), now)
+        ).lastrowid
+
+    def _owns(self, session_id: str, dialogue_ref: int) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM dialogues WHERE id = ? AND session_id = ?", (dialogue_ref, session_id)
+        ).fetchone() is not None
+
+    def save_dialogue(self, session_id: str, result: Dict[str, Any], user_background: str = '') -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                dialogue_ref = self._conn.execute(
+                    "INSERT INTO dialogues (session_id, dialogue_id, mode, question, user_background, synthesis, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, result.get('dialogue_id'), result.get('mode'), result['question'],
+                     user_background, result['synthesis'], now)
+                ).lastrowid
+                for row in _turn_rows(result):
+                    self._insert_turn(dialogue_ref, row, now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return dialogue_ref
+
+    def add_follow_up(self, session_id: str, dialogue_ref: int, mentor: str, question: str,
+                      response: str, citations: Optional[List[Dict[str, Any]]] = None) -> int:
+        row = {'kind': 'follow_up', 'speaker': mentor, 'question': question, 'text': response,
+               'verses': compact_verses(mentor, citations)}
+        with self._lock:
+            if not self._owns(session_id, dialogue_ref):
+                raise KeyError(f"Dialogue {dialogue_ref} is not in session {session_id}")
+            return self._insert_turn(dialogue_ref, row, time.time())
+
+    def set_saved(self, session_id: str, dialogue_ref: int, saved: bool = True):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE dialogues SET saved = ? WHERE id = ? AND session_id = ?", (int(saved), dialogue_ref, session_id)
+            )
+
+    def latest_dialogue(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, dialogue_id, mode, question, user_background, synthesis FROM dialogues "
+                "WHERE session_id = ? ORDER BY id DESC LIMIT 1", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        dialogue_ref, dialogue_id, mode, question, user_background, synthesis = row
+        mentors = self.get_turns(session_id, dialogue_ref, kinds=['mentor'])
+        return {
+            'record_id': dialogue_ref,
+            'dialogue_id': dialogue_id,
+            'mode': mode,
+            'question': question,
+            'user_background': user_background or '',
+            'synthesis': synthesis,
+            'mentor_responses': [
+                {'mentor': t['speaker'], 'response': t['text'], 'citations': t['citations'],
+                 'verses': t['citations'], 'icon': t['icon']}
+                for t in mentors
+            ]
+        }
+
+    def _where(self, saved_only: bool) -> str:
+        return "session_id = ?" + (" AND saved = 1" if saved_only else "")
+
+    def list_dialogues(self, session_id: str, saved_only: bool = False,
+                       limit: int = 5, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, question, synthesis, saved, created_at FROM dialogues WHERE {self._where(saved_only)} "
+                "ORDER BY id DESC LIMIT ? OFFSET ?", (session_id, limit, offset)
+            ).fetchall()
+        return [
+            {'id': r[0], 'question': r[1], 'synthesis': r[2], 'saved': bool(r[3]), 'created_at': r[4]}
+            for r in rows
+        ]
+
+    def count_dialogues(self, session_id: str, saved_only: bool = False) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM dialogues WHERE {self._where(saved_only)}", (session_id,)
+            ).fetchone()[0]
+
+    def _turn_filter(self, kinds: Optional[List[str]]):
+        if not kinds:
+            return "", ()
+        return f" AND kind IN ({', '.join('?' * len(kinds))})", tuple(kinds)
+
+    def get_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None,
+                  limit: Optional[int] = None, offset: int = 0, after_id: int = 0) -> List[Dict[str, Any]]:
+        kind_sql, kind_args = self._turn_filter(kinds)
+        with self._lock:
+            if not self._owns(session_id, dialogue_ref):
+                return []
+            rows = self._conn.execute(
+                f"SELECT id, kind, speaker, question, text, verses, created_at FROM turns "
+                f"WHERE dialogue_ref = ? AND id > ?{kind_sql} ORDER BY id DESC LIMIT ? OFFSET ?",
+                (dialogue_ref, after_id, *kind_args, -1 if limit is None else limit, offset)
+            ).fetchall()
+
+        turns = [
+            {'id': r[0], 'kind': r[1], 'speaker': r[2], 'question': r[3] or '', 'text': r[4],
+             'verses': json.loads(r[5]), 'created_at': r[6]}
+            for r in reversed(rows)
+        ]
+        return [_expand_turn(turn) for turn in turns]
+
+    def count_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None) -> int:
+        kind_sql, kind_args = self._turn_filter(kinds)
+        with self._lock:
+            if not self._owns(session_id, dialogue_ref):
+                return 0
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM turns WHERE dialogue_ref = ?{kind_sql}", (dialogue_ref, *kind_args)
+            ).fetchone()[0]
+
+    def get_summary(self, session_id: str, dialogue_ref: int) -> Tuple[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.summary, s.covered_turn_id FROM summaries s JOIN dialogues d ON d.id = s.dialogue_ref "
+                "WHERE s.dialogue_ref = ? AND d.session_id = ?", (dialogue_ref, session_id)
+            ).fetchone()
+        return (row[0], row[1]) if row else ("", 0)
+
+    def set_summary(self, session_id: str, dialogue_ref: int, summary: str, covered_turn_id: int):
+        with self._lock:
+            if not self._owns(session_id, dialogue_ref):
+                raise KeyError(f"Dialogue {dialogue_ref} is not in session {session_id}")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (dialogue_ref, summary, covered_turn_id, updated_at) VALUES (?, ?, ?, ?)",
+                (dialogue_ref, summary, covered_turn_id, time.time())
+            )
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            for table in ("turns", "summaries"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE dialogue_ref IN (SELECT id FROM dialogues WHERE session_id = ?)",
+                    (session_id,)
+                )
+            self._conn.execute("DELETE FROM dialogues WHERE session_id = ?", (session_id,))
+            self._conn.execute("COMMIT")
+
+
+class MemorySessionStore:
+    """
+    Session store in process memory (tests, or no writable disk)
+
+    Keeps the same compact records as SQLiteSessionStore, but nothing
+    survives a restart.
+    """
+
+    backend = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dialogues: Dict[int, Dict[str, Any]] = {}
+        self._turns: Dict[int, List[Dict[str, Any]]] = {}
+        self._summaries: Dict[int, Tuple[str, int]] = {}
+        self._next_id = 1
+
+    def _new_id(self) -> int:
+        new_id, self._next_id = self._next_id, self._next_id + 1
+        return new_id
+
+    def _dialogue(self, session_id: str, dialogue_ref: int) -> Optional[Dict[str, Any]]:
+        dialogue = self._dialogues.get(dialogue_ref)
+        return dialogue if dialogue and dialogue['session_id'] == session_id else None
+
+    def save_dialogue(self, session_id: str, result: Dict[str, Any], user_background: str = '') -> int:
+        now = time.time()
+        with self._lock:
+            dialogue_ref = self._new_id()
+            self._dialogues[dialogue_ref] = {
+                'id': dialogue_ref, 'session_id': session_id, 'dialogue_id': result.get('dialogue_id'),
+                'mode': result.get('mode'), 'question': result['question'], 'user_background': user_background,
+                'synthesis': result['synthesis'], 'saved': False, 'created_at': now
+            }
+            self._turns[dialogue_ref] = [
+                dict(row, id=self._new_id(), question=row.get('question', ''), created_at=now)
+                for row in _turn_rows(result)
+            ]
+        return dialogue_ref
+
+    def add_follow_up(self, session_id: str, dialogue_ref: int, mentor: str, question: str,
+                      response: str, citations: Optional[List[Dict[str, Any]]] = None) -> int:
+        with self._lock:
+            if self._dialogue(session_id, dialogue_ref) is None:
+                raise KeyError(f"Dialogue {dialogue_ref} is not in session {session_id}")
+            turn_id = self._new_id()
+            self._turns[dialogue_ref].append({
+                'id': turn_id, 'kind': 'follow_up', 'speaker': mentor, 'question': question, 'text': response,
+                'verses': compact_verses(mentor, citations), 'created_at': time.time()
+            })
+        return turn_id
+
+    def set_saved(self, session_id: str, dialogue_ref: int, saved: bool = True):
+        with self._lock:
+            dialogue = self._dialogue(session_id, dialogue_ref)
+            if dialogue:
+                dialogue['saved'] = saved
+
+    def _session_dialogues(self, session_id: str, saved_only: bool) -> List[Dict[str, Any]]:
+        return [
+            d for d in sorted(self._dialogues.values(), key=lambda d: d['id'], reverse=True)
+            if d['session_id'] == session_id and (d['saved'] or not saved_only)
+        ]
+
+    def latest_dialogue(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            dialogues = self._session_dialogues(session_id, saved_only=False)
+        if not dialogues:
+            return None
+
+        dialogue = dialogues[0]
+        mentors = self.get_turns(session_id, dialogue['id'], kinds=['mentor'])
+        return {
+            'record_id': dialogue['id'],
+            'dialogue_id': dialogue['dialogue_id'],
+            'mode': dialogue['mode'],
+            'question': dialogue['question'],
+            'user_background': dialogue['user_background'] or '',
+            'synthesis': dialogue['synthesis'],
+            'mentor_responses': [
+                {'mentor': t['speaker'], 'response': t['text'], 'citations': t['citations'],
+                 'verses': t['citations'], 'icon': t['icon']}
+                for t in mentors
+            ]
+        }
+
+    def list_dialogues(self, session_id: str, saved_only: bool = False,
+                       limit: int = 5, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            page = self._session_dialogues(session_id, saved_only)[offset:offset + limit]
+        return [
+            {key: d[key] for key in ('id', 'question', 'synthesis', 'saved', 'created_at')}
+            for d in page
+        ]
+
+    def count_dialogues(self, session_id: str, saved_only: bool = False) -> int:
+        with self._lock:
+            return len(self._session_dialogues(session_id, saved_only))
+
+    def _matching_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]],
+                        after_id: int = 0) -> List[Dict[str, Any]]:
+        if self._dialogue(session_id, dialogue_ref) is None:
+            return []
+        return [t for t in self._turns[dialogue_ref] if t['id'] > after_id and (not kinds or t['kind'] in kinds)]
+
+    def get_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None,
+                  limit: Optional[int] = None, offset: int = 0, after_id: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            turns = self._matching_turns(session_id, dialogue_ref, kinds, after_id)
+            end = len(turns) - offset
+            page = turns[max(end - limit, 0) if limit is not None else 0:max(end, 0)]
+            page = [dict(t) for t in page]
+        return [_expand_turn(turn) for turn in page]
+
+    def count_turns(self, session_id: str, dialogue_ref: int, kinds: Optional[List[str]] = None) -> int:
+        with self._lock:
+            return len(self._matching_turns(session_id, dialogue_ref, kinds))
+
+    def get_summary(self, session_id: str, dialogue_ref: int) -> Tuple[str, int]:
+        with self._lock:
+            if self._dialogue(session_id, dialogue_ref) is None:
+                return "", 0
+            return self._summaries.get(dialogue_ref, ("", 0))
+
+    def set_summary(self, session_id: str, dialogue_ref: int, summary: str, covered_turn_id: int):
+        with self._lock:
+            if self._dialogue(session_id, dialogue_ref) is None:
+                raise KeyError(f"Dialogue {dialogue_ref} is not in session {session_id}")
+            self._summaries[dialogue_ref] = (summary, covered_turn_id)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            for dialogue_ref in [ref for ref, d in self._dialogues.items() if d['session_id'] == session_id]:
+                del self._dialogues[dialogue_ref]
+                del self._turns[dialogue_ref]
+                self._summaries.pop(dialogue_ref, None)
+
+
+def create_session_store(backend: Optional[str] = None) -> SessionStore:
+    """
+    Create a session store
+
+    Args:
+        backend: "sqlite" or "memory" (default: DIVINE_SESSION_STORE, else sqlite)
+
+    Returns:
+        A SessionStore; the SQLite store falls back to memory if its file
+        cannot be opened
+    """
+    backend = (backend or SESSION_STORE_BACKEND).strip().lower()
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"Unknown session store '{backend}'. Choose one of: {', '.join(SESSION_BACKENDS)}")
+
+    if backend == "sqlite":
+        try:
+            return SQLiteSessionStore()
+        except sqlite3.Error as e:
+            print(f"⚠️  Session store at {SESSION_DB_PATH} unavailable, keeping sessions in memory: {e}")
+    return MemorySessionStore()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide session store shared by every browser session"""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_session_store()
+    return _store
@@ -7,7 +7,7 @@ Multi-Agent Spiritual Debate System
 import streamlit as st
 import os
 from datetime import datetime
-from divine_dialogue_langgraph import run_divine_dialogue, load_rag_database
+from divine_dialogue_langgraph import run_divine_dialogue, load_rag_database, warm_up_in_background
 
 # Page configuration
 st.set_page_config(
@@ -123,6 +123,9 @@ def display_synthesis(synthesis_text):
 def main():
     """Main Streamlit application"""
     
+    # Start loading the RAG stack and LLM client without blocking the first render
+    warm_up_in_background()
+    
     # Initialize session state
     initialize_session_state()
     
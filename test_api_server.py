@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+HTTP API validation tests
+Checks that malformed request bodies are answered with 400 before any
+dialogue or follow-up work is started.
+
+Runs offline (the app is served without warm-up and every request is
+rejected before an LLM call). Use with pytest or:
+    python test_api_server.py
+"""
+
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from api_server import create_app
+
+MALFORMED_DIALOGUES = [
+    {'question': 42},
+    {'question': "Why?", 'mode': ['debate']},
+    {'question': "Why?", 'background': {'age': 30}},
+    {'question': "Why?", 'mentor': 7},
+    {'question': "Why?", 'dialogue_id': ['abc']},
+    {'question': "Why?", 'deadline_s': True},
+    {'question': "Why?", 'deadline_s': "20"},
+    {'question': "Why?", 'deadline_s': -1},
+]
+
+MALFORMED_FOLLOW_UPS = [
+    {'question': ["Why?"], 'mentor': 'Buddha'},
+    {'question': "Why?", 'mentor': ['Buddha']},
+    {'question': "Why?", 'mentor': 'Buddha', 'background': 3},
+    {'question': "Why?", 'mentor': 'Buddha', 'initial_question': {'text': "How?"}},
+    {'question': "Why?", 'mentor': 'Buddha', 'summary': 1.5},
+    {'question': "Why?", 'mentor': 'Buddha', 'conversation_history': [{'speaker': 'Buddha'}]},
+]
+
+
+async def post_all(path: str, bodies) -> list:
+    """POST each body to a fresh app, returning [(status, json body)]"""
+    async with TestClient(TestServer(create_app(workers=1, warm_up=False))) as client:
+        results = []
+        for body in bodies:
+            response = await client.post(path, json=body)
+            results.append((response.status, await response.json()))
+        return results
+
+
+def assert_rejected(results):
+    for status, body in results:
+        assert status == 400, f"expected 400, got {status}: {body}"
+        assert 'error' in body
+
+
+def test_malformed_dialogue_bodies_are_rejected():
+    for path in ('/dialogue', '/dialogue/stream', '/jobs'):
+        assert_rejected(asyncio.run(post_all(path, MALFORMED_DIALOGUES)))
+
+
+def test_malformed_follow_up_bodies_are_rejected():
+    assert_rejected(asyncio.run(post_all('/follow-up', MALFORMED_FOLLOW_UPS)))
+
+    streamed = [dict(body, mentors=[body['mentor']]) for body in MALFORMED_FOLLOW_UPS
+                if isinstance(body['mentor'], str)]
+    assert_rejected(asyncio.run(post_all('/follow-up/stream', streamed)))
+
+
+if __name__ == "__main__":
+    for test in (test_malformed_dialogue_bodies_are_rejected,
+                 test_malformed_follow_up_bodies_are_rejected):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ API validation tests passed")
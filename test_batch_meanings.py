@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Batched verse meaning parser tests
+Checks that _parse_batch_meanings recovers every meaning from clean JSON,
+broken JSON and line-oriented output, and that a reference never claims
+the line of a longer reference it is a prefix of.
+
+Runs offline (pure parsing, no LLM calls). Use with pytest or:
+    python test_batch_meanings.py
+"""
+
+import divine_dialogue_langgraph as ddl
+
+REFERENCES = ['2.4', '2.47', 'Verse 1', 'Verse 12']
+
+
+def test_json_object_inside_prose_and_fences():
+    text = 'Here you go:\n```json\n{"2.47": "Act without clinging to results.", "verse 12": "Hatred ends by love."}\n```'
+    meanings = ddl._parse_batch_meanings(text, REFERENCES)
+
+    assert meanings == {'2.47': 'Act without clinging to results.', 'Verse 12': 'Hatred ends by love.'}
+
+
+def test_broken_json_key_value_pairs():
+    text = '{"2.4": "Arjuna questions fighting his elders.", "2.47": "Act without attachment." "Verse 1": "Mind leads all."'
+    meanings = ddl._parse_batch_meanings(text, REFERENCES)
+
+    assert meanings['2.4'] == 'Arjuna questions fighting his elders.'
+    assert meanings['2.47'] == 'Act without attachment.'
+    assert meanings['Verse 1'] == 'Mind leads all.'
+
+
+def test_line_fallback_does_not_match_prefix_references():
+    text = "\n".join([
+        "2.47: Act from duty, not for the fruits.",
+        "[Verse 12] Hatred is never ended by hatred.",
+        "- 2.4 - Arjuna doubts whether to fight.",
+        "1. Verse 1: The mind shapes what we become.",
+    ])
+    meanings = ddl._parse_batch_meanings(text, REFERENCES)
+
+    assert meanings == {
+        '2.47': 'Act from duty, not for the fruits.',
+        'Verse 12': 'Hatred is never ended by hatred.',
+        '2.4': 'Arjuna doubts whether to fight.',
+        'Verse 1': 'The mind shapes what we become.',
+    }
+
+
+def test_missing_references_are_left_out():
+    meanings = ddl._parse_batch_meanings("2.47: Act from duty.\nSome closing remark about 2.4 and Verse 1.", REFERENCES)
+
+    assert meanings == {'2.47': 'Act from duty.'}
+    assert ddl._parse_batch_meanings("", REFERENCES) == {}
+
+
+if __name__ == "__main__":
+    for test in (test_json_object_inside_prose_and_fences,
+                 test_broken_json_key_value_pairs,
+                 test_line_fallback_does_not_match_prefix_references,
+                 test_missing_references_are_left_out):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Batched meaning parser tests passed")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Rolling conversation summary tests
+Checks that summaries are folded in incrementally off the request path and
+that follow-up context stays bounded as the conversation grows.
+
+Runs offline (the summary LLM call is stubbed). Use with pytest or:
+    python test_conversation_summary.py
+"""
+
+import time
+from contextlib import contextmanager
+
+import conversation_summary as cs
+from session_store import MemorySessionStore
+from test_session_store import make_result
+
+
+@contextmanager
+def stubbed_summary_llm(delay_s=0.0):
+    """Replace the summary call; yields the list of prompts it received"""
+    prompts = []
+    original = cs.call_llm
+
+    def fake_call_llm(system_prompt, user_message, **kwargs):
+        prompts.append(user_message)
+        time.sleep(delay_s)
+        return f"Summary after {len(prompts)} updates."
+
+    cs.call_llm = fake_call_llm
+    try:
+        yield prompts
+    finally:
+        cs.call_llm = original
+
+
+def test_summary_covers_new_turns_only():
+    with stubbed_summary_llm() as prompts:
+        store = MemorySessionStore()
+        summarizer = cs.RollingSummarizer(store)
+        ref = store.save_dialogue('s1', make_result(), 'student')
+
+        summary, latest = summarizer.context('s1', ref)
+        assert summary == "" and latest[0].startswith("User Question:")  # Nothing summarized yet
+
+        summarizer.schedule('s1', ref)
+        summarizer.flush()
+        store.add_follow_up('s1', ref, 'Krishna', 'What is duty?', 'Your own path.')
+        summarizer.schedule('s1', ref)
+        summarizer.flush()
+
+    assert len(prompts) == 2
+    assert "Do your duty." in prompts[0]
+    assert "Do your duty." not in prompts[1] and "What is duty?" in prompts[1]
+    assert "Summary after 1 updates." in prompts[1]
+    assert summarizer.context('s1', ref) == (
+        "Summary after 2 updates.", ["User Follow-up to Krishna: What is duty?", "Krishna: Your own path."]
+    )
+
+
+def test_turns_arriving_mid_update_are_coalesced():
+    with stubbed_summary_llm(delay_s=0.05) as prompts:
+        store = MemorySessionStore()
+        summarizer = cs.RollingSummarizer(store)
+        ref = store.save_dialogue('s1', make_result())
+        for i in range(6):
+            store.add_follow_up('s1', ref, 'Buddha', f"Question {i}", f"Answer {i}")
+            summarizer.schedule('s1', ref)
+        summarizer.flush()
+
+    assert len(prompts) <= 2
+    assert store.get_summary('s1', ref)[1] == store.get_turns('s1', ref, limit=1)[0]['id']
+
+
+def test_follow_up_context_stays_flat():
+    with stubbed_summary_llm():
+        store = MemorySessionStore()
+        summarizer = cs.RollingSummarizer(store)
+        ref = store.save_dialogue('s1', make_result())
+        sizes = []
+        for i in range(20):
+            store.add_follow_up('s1', ref, 'Jesus', f"Question {i}", f"Answer {i} " * 20)
+            summarizer.schedule('s1', ref)
+            summarizer.flush()
+            summary, latest = summarizer.context('s1', ref)
+            sizes.append(len(summary) + sum(len(line) for line in latest))
+
+        full_history = sum(len(line) for line in cs.history_lines(store.get_turns('s1', ref)))
+
+    assert max(sizes) < 1.2 * min(sizes)
+    assert full_history > 5 * max(sizes)
+
+
+if __name__ == "__main__":
+    for test in (test_summary_covers_new_turns_only,
+                 test_turns_arriving_mid_update_are_coalesced,
+                 test_follow_up_context_stays_flat):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Conversation summary tests passed")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Multi-mentor follow-up tests
+Checks that run_follow_ups asks the mentors concurrently, yields each
+answer as it completes and keeps going when one mentor fails.
+
+Runs offline (retrieval and LLM calls are stubbed). Use with pytest or:
+    python test_follow_ups.py
+"""
+
+import time
+from contextlib import contextmanager
+
+import divine_dialogue_langgraph as ddl
+from test_state_growth import STUB_VERSE
+
+# Seconds each mentor's stubbed LLM call takes
+LLM_DELAYS = {'Krishna': 0.3, 'Buddha': 0.1, 'Jesus': 0.2}
+
+
+@contextmanager
+def stubbed_follow_up_calls(failing=()):
+    """Slow canned retrieval and LLM answers; mentors in `failing` raise"""
+    originals = (ddl.load_rag_database, ddl.retrieve_verses, ddl.call_llm)
+
+    def call_llm(system_prompt, user_message, **kwargs):
+        mentor = next(name for name in LLM_DELAYS if name in system_prompt)
+        time.sleep(LLM_DELAYS[mentor])
+        if mentor in failing:
+            raise ddl.LLMError(f"{mentor} is unavailable")
+        return f"{mentor} answers the follow-up in a few sentences."
+
+    ddl.load_rag_database = lambda: None
+    ddl.retrieve_verses = lambda query, mentor, k=3, with_meanings=True: [dict(STUB_VERSE)]
+    ddl.call_llm = call_llm
+    try:
+        yield
+    finally:
+        ddl.load_rag_database, ddl.retrieve_verses, ddl.call_llm = originals
+
+
+def test_all_mentors_answer_concurrently_fastest_first():
+    with stubbed_follow_up_calls():
+        start = time.perf_counter()
+        results = list(ddl.run_follow_ups("What should I do next?", conversation_history=["User Question: x"]))
+        elapsed = time.perf_counter() - start
+
+    assert [r['mentor'] for r in results] == ['Buddha', 'Jesus', 'Krishna']
+    assert all(r['question'] == "What should I do next?" and r['timings'] for r in results)
+    assert elapsed < 0.8 * sum(LLM_DELAYS.values())  # Closer to the slowest than to the sum
+
+
+def test_failed_mentor_does_not_stop_the_others():
+    with stubbed_follow_up_calls(failing=('Jesus',)):
+        results = list(ddl.run_follow_ups("Why?", ['Jesus', 'Buddha']))
+
+    by_mentor = {r['mentor']: r for r in results}
+    assert by_mentor['Jesus']['error_type'] == 'LLMError'
+    assert 'response' in by_mentor['Buddha']
+
+
+def test_unknown_mentor_is_rejected():
+    try:
+        list(ddl.run_follow_ups("Why?", ['Zeus']))
+        assert False, "unknown mentor accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    for test in (test_all_mentors_answer_concurrently_fastest_first,
+                 test_failed_mentor_does_not_stop_the_others,
+                 test_unknown_mentor_is_rejected):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Follow-up fan-out tests passed")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+LLM response cache tests
+Checks exact-match keys, hit/miss counting, TTL expiry and least recently
+used eviction on an in-memory LLMResponseCache.
+
+Runs offline (no LLM calls). Use with pytest or:
+    python test_llm_cache.py
+"""
+
+import time
+
+from llm_cache import LLMResponseCache
+
+
+def test_keys_cover_the_whole_request():
+    key = LLMResponseCache.make_key("system", "user", "model-a", 100)
+
+    assert key == LLMResponseCache.make_key("system", "user", "model-a", 100)
+    assert key != LLMResponseCache.make_key("system", "user", "model-b", 100)
+    assert key != LLMResponseCache.make_key("system", "user", "model-a", 200)
+    assert key != LLMResponseCache.make_key("system", "user ", "model-a", 100)
+    assert key != LLMResponseCache.make_key("system", "user", "model-a", 100, endpoint="http://127.0.0.1:8787")
+
+
+def test_hits_and_misses_are_counted():
+    cache = LLMResponseCache(":memory:")
+    key = LLMResponseCache.make_key("system", "user", "model-a", 100)
+
+    assert cache.get(key) is None
+    cache.set(key, "cached answer", model="model-a")
+    assert cache.get(key) == "cached answer"
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['stores'], stats['entries']) == (1, 1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_entries_expire_after_the_ttl():
+    cache = LLMResponseCache(":memory:", ttl_s=0.05)
+    cache.set("k", "stale answer")
+    time.sleep(0.1)
+
+    assert cache.get("k") is None
+    assert cache.stats()['expired'] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LLMResponseCache(":memory:", max_entries=2)
+    cache.set("a", "A")
+    time.sleep(0.01)
+    cache.set("b", "B")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now the least recently used
+    time.sleep(0.01)
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.stats()['evictions'] == 1
+
+
+if __name__ == "__main__":
+    for test in (test_keys_cover_the_whole_request,
+                 test_hits_and_misses_are_counted,
+                 test_entries_expire_after_the_ttl,
+                 test_least_recently_used_entries_are_evicted):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ LLM cache tests passed")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+LLM scheduler tests
+Checks error classification, retry with backoff on transient failures,
+the concurrency limit (sync and async) and the token bucket of LLMScheduler.
+
+Runs offline (the calls are local functions). Use with pytest or:
+    python test_llm_scheduler.py
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_scheduler import (
+    LLMScheduler, TokenBucket, LLMRateLimitError, LLMAuthenticationError,
+    LLMServerError, LLMRequestError, classify_error
+)
+
+
+class StatusError(Exception):
+    """Provider-style exception carrying an HTTP status code"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def make_scheduler(**overrides) -> LLMScheduler:
+    """Scheduler without rate limits and with near-instant backoff"""
+    settings = dict(requests_per_minute=0, tokens_per_minute=0, max_concurrency=0,
+                    max_retries=3, backoff_base_s=0.001, backoff_max_s=0.001)
+    settings.update(overrides)
+    return LLMScheduler(**settings)
+
+
+def test_errors_are_classified():
+    assert classify_error(StatusError(429)) == (LLMRateLimitError, True)
+    assert classify_error(StatusError(503)) == (LLMServerError, True)
+    assert classify_error(StatusError(401)) == (LLMAuthenticationError, False)
+    assert classify_error(StatusError(400)) == (LLMRequestError, False)
+    assert classify_error(Exception("Request timed out")) == (LLMServerError, True)
+
+
+def test_transient_failures_are_retried():
+    scheduler = make_scheduler()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise StatusError(429)
+        return "answer"
+
+    assert scheduler.run(flaky) == "answer"
+    assert (scheduler.stats['retries'], scheduler.stats['rate_limited']) == (2, 2)
+
+
+def test_permanent_failures_and_exhausted_retries_raise_typed_errors():
+    scheduler = make_scheduler(max_retries=2)
+    attempts = []
+
+    def unauthorized():
+        attempts.append(1)
+        raise StatusError(401)
+
+    try:
+        scheduler.run(unauthorized)
+        assert False, "authentication error swallowed"
+    except LLMAuthenticationError:
+        assert len(attempts) == 1
+
+    def server_error():
+        raise StatusError(500)
+
+    try:
+        scheduler.run(server_error)
+        assert False, "server error swallowed"
+    except LLMServerError:
+        assert scheduler.stats['failures'] == 2
+
+
+def test_concurrency_limit_is_respected():
+    scheduler = make_scheduler(max_concurrency=2)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def call():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(lambda _: scheduler.run(call), range(6)))
+
+    assert results == ["ok"] * 6
+    assert peak[0] == 2
+
+
+def test_async_calls_share_the_concurrency_limit():
+    scheduler = make_scheduler(max_concurrency=2)
+    active, peak, attempts = [0], [0], []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise StatusError(503)  # Retried without blocking the loop
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.05)
+        active[0] -= 1
+        return "ok"
+
+    async def run_all():
+        return await asyncio.gather(*[scheduler.arun(call) for _ in range(6)])
+
+    assert asyncio.run(run_all()) == ["ok"] * 6
+    assert peak[0] == 2
+    assert scheduler.stats['retries'] == 1
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate_per_s=100, capacity=5)
+
+    assert bucket.try_acquire(5) == 0.0
+    wait = bucket.try_acquire(2)
+    assert 0 < wait <= 0.02
+
+    start = time.monotonic()
+    bucket.acquire(2)
+    assert time.monotonic() - start < 0.2
+
+
+if __name__ == "__main__":
+    for test in (test_errors_are_classified,
+                 test_transient_failures_are_retried,
+                 test_permanent_failures_and_exhausted_retries_raise_typed_errors,
+                 test_concurrency_limit_is_respected,
+                 test_async_calls_share_the_concurrency_limit,
+                 test_token_bucket_refills_at_its_rate):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ LLM scheduler tests passed")
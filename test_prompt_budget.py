@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Prompt budget tests
+Checks that PromptBuilder counts the fixed template text, and that every
+mentor, moderator, quick-answer and follow-up prompt stays within
+DIVINE_PROMPT_TOKEN_BUDGET however long the question's context grows.
+
+Runs offline (retrieval and LLM calls are stubbed). Use with pytest or:
+    python test_prompt_budget.py
+"""
+
+from contextlib import contextmanager
+
+import divine_dialogue_langgraph as ddl
+from prompt_budget import PromptBuilder, PROMPT_TOKEN_BUDGET, REQUIRED, count_tokens
+from test_state_growth import initial_state
+
+# Oversized context: each piece alone is close to the whole budget
+LONG_TEXT = " ".join(f"Sentence {i} about duty, fear and letting go of results." for i in range(400))
+LONG_VERSE = {
+    'reference': 'Test 1:1',
+    'text': LONG_TEXT,
+    'meaning': LONG_TEXT,
+    'source': 'Test',
+    'similarity': 1.0
+}
+
+# Leeway for counting sections one by one instead of the rendered prompt
+SLACK = 1.02
+
+
+@contextmanager
+def captured_prompts():
+    """Stub retrieval and LLM calls, collecting every (speaker, system, user) prompt"""
+    prompts = []
+    originals = (ddl.get_prefetched_verses, ddl.retrieve_verses, ddl._search_verses,
+                 ddl._generate_response, ddl.call_llm)
+
+    def generate(speaker, system_prompt, user_message, *args, **kwargs):
+        prompts.append((speaker, system_prompt, user_message))
+        return LONG_TEXT
+
+    def call_llm(system_prompt, user_message, **kwargs):
+        prompts.append(('Follow-up', system_prompt, user_message))
+        return LONG_TEXT
+
+    ddl.get_prefetched_verses = lambda state, mentor, k=3, config=None: [dict(LONG_VERSE)] * 3
+    ddl.retrieve_verses = lambda *args, **kwargs: [dict(LONG_VERSE)] * 3
+    ddl._search_verses = lambda *args, **kwargs: [dict(LONG_VERSE)] * 2
+    ddl._generate_response = generate
+    ddl.call_llm = call_llm
+    try:
+        yield prompts
+    finally:
+        (ddl.get_prefetched_verses, ddl.retrieve_verses, ddl._search_verses,
+         ddl._generate_response, ddl.call_llm) = originals
+
+
+def test_template_text_counts_against_the_budget():
+    template = "Fixed instructions that always go out. " * 20 + "{question} {notes}"
+    builder = PromptBuilder(budget=200)
+    builder.add_template(template)
+    builder.add('question', "Why?", priority=REQUIRED)
+    builder.add('notes', LONG_TEXT, priority=1)
+    parts = builder.build()
+
+    fixed_tokens = count_tokens(template.replace("{question}", "").replace("{notes}", ""))
+    assert builder.trimmed()
+    assert builder.report()['sections']['template']['tokens'] == fixed_tokens
+    assert count_tokens(template.format(**parts)) <= 200 * SLACK
+
+
+def test_named_template_values_are_counted():
+    builder = PromptBuilder().add_template("Speak as {name}: {verses}", name="Krishna")
+    assert builder.build()['template'] == "Speak as Krishna: "
+    assert not builder.trimmed()
+
+
+def test_every_dialogue_prompt_fits_the_budget():
+    state = dict(initial_state(), user_background=LONG_TEXT)
+
+    with captured_prompts() as prompts:
+        for node in (ddl.krishna_node, ddl.buddha_node, ddl.jesus_node):
+            state['mentor_responses'] = state['mentor_responses'] + node(state)['mentor_responses']
+        ddl.moderator_node(state)
+        ddl.moderator_node(dict(state, dialogue_mode='panel'))
+        ddl.make_panel_node('krishna')(state)
+        ddl.quick_answer_node(state)
+        ddl._follow_up("And then?", 'Buddha', [LONG_TEXT] * 4, LONG_TEXT, summary=LONG_TEXT)
+
+    assert len(prompts) == 8
+    for speaker, system_prompt, user_message in prompts:
+        tokens = count_tokens(system_prompt) + count_tokens(user_message)
+        assert tokens <= PROMPT_TOKEN_BUDGET * SLACK, f"{speaker} prompt has {tokens} tokens"
+
+
+if __name__ == "__main__":
+    for test in (test_template_text_counts_against_the_budget,
+                 test_named_template_values_are_counted,
+                 test_every_dialogue_prompt_fits_the_budget):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Prompt budget tests passed")
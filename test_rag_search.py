@@ -3,53 +3,22 @@
 Quick test script to demonstrate RAG database usage
 """
 
-import faiss
-import json
-import numpy as np
-from sentence_transformers import SentenceTransformer
+from vector_store import load_vector_store, encode_queries
 
-# Load FAISS vector store
-print("Loading FAISS vector store...")
-index = faiss.read_index('sacred_texts_rag_faiss/index.faiss')
-
-with open('sacred_texts_rag_faiss/texts.json', 'r', encoding='utf-8') as f:
-    texts = json.load(f)
-
-with open('sacred_texts_rag_faiss/metadatas.json', 'r', encoding='utf-8') as f:
-    metadatas = json.load(f)
-
-model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
-print(f"✓ Loaded {index.ntotal} verses\n")
+# Load vector store (FAISS, ChromaDB or NumPy - see DIVINE_VECTOR_BACKEND)
+print("Loading vector store...")
+store = load_vector_store()
+print(f"✓ Loaded {len(store)} verses ({store.backend})\n")
 
 
 def search_verses(query: str, mentor: str = None, top_k: int = 3):
     """Search for relevant verses"""
     
     # Generate query embedding
-    query_embedding = model.encode([query], convert_to_numpy=True)
-    
-    # Search in FAISS (get more results if filtering by mentor)
-    k = 50 if mentor else top_k
-    distances, indices = index.search(query_embedding.astype('float32'), k)
-    
-    results = []
-    for idx, dist in zip(indices[0], distances[0]):
-        metadata = metadatas[idx]
-        
-        # Filter by mentor if specified
-        if mentor and metadata['mentor'] != mentor:
-            continue
-            
-        results.append({
-            'text': texts[idx],
-            'metadata': metadata,
-            'similarity': 1 / (1 + dist)  # Convert distance to similarity
-        })
-        
-        if len(results) >= top_k:
-            break
+    query_embedding = encode_queries([query])[0]
     
-    return results
+    # Search (the store applies the mentor filter)
+    return store.search(query_embedding, mentor=mentor, k=top_k)
 
 
 # Test queries
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Session store tests
+Checks that both backends keep compact records (verse ids, not verse text),
+page history newest first and keep sessions apart.
+
+Runs offline. Use with pytest or:
+    python test_session_store.py
+"""
+
+import json
+
+from session_store import SQLiteSessionStore, MemorySessionStore, history_lines
+
+VERSE = {
+    'reference': '2.47',
+    'text': 'karmaṇy-evādhikāras te mā phaleṣhu kadāchana',
+    'source': 'Bhagavad Gita',
+    'similarity': 0.61234,
+    'meaning': 'Act without clinging to results.'
+}
+
+
+def make_result(question="How can I find inner peace?"):
+    return {
+        'question': question,
+        'mode': 'debate',
+        'dialogue_id': 'abc',
+        'mentor_responses': [
+            {'mentor': 'Krishna', 'response': 'Do your duty.', 'citations': [dict(VERSE)]},
+            {'mentor': 'Buddha', 'response': 'Watch the mind.', 'citations': []}
+        ],
+        'synthesis': 'Breathe, then act.'
+    }
+
+
+def stores():
+    return [MemorySessionStore(), SQLiteSessionStore(":memory:")]
+
+
+def test_dialogue_round_trip_keeps_verse_ids_only():
+    for store in stores():
+        ref = store.save_dialogue('s1', make_result(), 'student')
+        store.add_follow_up('s1', ref, 'Krishna', 'What is duty?', 'Your own path.', [dict(VERSE)])
+
+        turns = store.get_turns('s1', ref)
+        assert [t['kind'] for t in turns] == ['question', 'mentor', 'mentor', 'moderator', 'follow_up']
+        assert history_lines(turns)[-2:] == ["User Follow-up to Krishna: What is duty?", "Krishna: Your own path."]
+
+        citation = turns[1]['citations'][0]
+        assert citation['reference'] == '2.47' and citation['source'] == 'Bhagavad Gita'
+        assert citation['meaning'] == VERSE['meaning']
+
+        latest = store.latest_dialogue('s1')
+        assert latest['record_id'] == ref
+        assert [r['mentor'] for r in latest['mentor_responses']] == ['Krishna', 'Buddha']
+        assert latest['user_background'] == 'student'
+
+    store = SQLiteSessionStore(":memory:")
+    ref = store.save_dialogue('s1', make_result())
+    raw = store._conn.execute("SELECT verses FROM turns WHERE dialogue_ref = ? AND kind = 'mentor'", (ref,)).fetchone()[0]
+    assert json.loads(raw) == [{'id': 'krishna:2.47', 'similarity': 0.6123, 'meaning': VERSE['meaning']}]
+
+
+def test_history_is_paginated_newest_first():
+    for store in stores():
+        refs = [store.save_dialogue('s1', make_result(f"Question {i}")) for i in range(7)]
+        for ref in refs[::2]:
+            store.set_saved('s1', ref)
+
+        assert store.count_dialogues('s1') == 7
+        assert store.count_dialogues('s1', saved_only=True) == 4
+        first = store.list_dialogues('s1', saved_only=True, limit=3)
+        second = store.list_dialogues('s1', saved_only=True, limit=3, offset=3)
+        assert [d['question'] for d in first + second] == ["Question 6", "Question 4", "Question 2", "Question 0"]
+
+        for i in range(4):
+            store.add_follow_up('s1', refs[-1], 'Buddha', f"Follow-up {i}", f"Answer {i}")
+        latest = store.get_turns('s1', refs[-1], kinds=['follow_up'], limit=2)
+        earlier = store.get_turns('s1', refs[-1], kinds=['follow_up'], limit=2, offset=2)
+        assert [t['question'] for t in earlier + latest] == [f"Follow-up {i}" for i in range(4)]
+        assert store.count_turns('s1', refs[-1], kinds=['follow_up']) == 4
+
+
+def test_sessions_are_isolated_and_clearable():
+    for store in stores():
+        ref = store.save_dialogue('s1', make_result())
+        store.save_dialogue('s2', make_result("Other"))
+
+        assert store.get_turns('s2', ref) == []
+        assert store.latest_dialogue('s2')['question'] == "Other"
+        try:
+            store.add_follow_up('s2', ref, 'Jesus', 'q', 'a')
+            assert False, "follow-up accepted for another session's dialogue"
+        except KeyError:
+            pass
+
+        store.clear('s1')
+        assert store.latest_dialogue('s1') is None
+        assert store.count_dialogues('s2') == 1
+
+
+if __name__ == "__main__":
+    for test in (test_dialogue_round_trip_keeps_verse_ids_only,
+                 test_history_is_paginated_newest_first,
+                 test_sessions_are_isolated_and_clearable):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ Session store tests passed")
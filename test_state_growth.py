@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+State growth test for the Divine Dialogue graph
+Checks that nodes return only their deltas, so the list reducers add each
+response once and state grows linearly with the number of nodes run.
+
+Runs offline (retrieval and LLM calls are stubbed). Use with pytest or:
+    python test_state_growth.py
+"""
+
+import json
+import time
+import typing
+from contextlib import contextmanager
+
+import divine_dialogue_langgraph as ddl
+
+DEBATE_NODES = [ddl.krishna_node, ddl.buddha_node, ddl.jesus_node, ddl.moderator_node]
+
+STUB_VERSE = {
+    'reference': 'Test 1:1',
+    'text': 'A verse used by the state growth test.',
+    'meaning': 'Stay steady.',
+    'source': 'Test',
+    'similarity': 1.0
+}
+
+
+@contextmanager
+def stubbed_calls():
+    """Replace retrieval and LLM calls with canned answers"""
+    originals = (ddl.start_prefetch, ddl.get_prefetched_verses, ddl._generate_response, ddl.call_llm)
+    ddl.start_prefetch = lambda query, mentors, k=3, with_meanings=True, prefetch_id=None: ''
+    ddl.get_prefetched_verses = lambda state, mentor, k=3, config=None: [dict(STUB_VERSE)]
+    ddl._generate_response = lambda speaker, *args, **kwargs: f"{speaker} answers the question in a few sentences."
+    ddl.call_llm = lambda *args, **kwargs: "1. IMMEDIATE: breathe. 2. DAILY: reflect."
+    try:
+        yield
+    finally:
+        ddl.start_prefetch, ddl.get_prefetched_verses, ddl._generate_response, ddl.call_llm = originals
+
+
+def initial_state(question="How can I find inner peace?"):
+    return {
+        'user_question': question,
+        'user_background': '',
+        'dialogue_mode': 'debate',
+        'focus_mentor': '',
+        'prefetch_id': '',
+        'mentor_responses': [],
+        'conversation_history': [],
+        'current_mentor': '',
+        'synthesis_result': '',
+        'rag_context': {},
+        'degradations': []
+    }
+
+
+def apply_delta(state, delta):
+    """Merge a node's return value the way LangGraph does (reducers, else overwrite)"""
+    hints = typing.get_type_hints(ddl.ConversationState, include_extras=True)
+    merged = dict(state)
+    for key, value in delta.items():
+        metadata = getattr(hints.get(key), '__metadata__', ())
+        merged[key] = metadata[0](state[key], value) if metadata else value
+    return merged
+
+
+def run_rounds(rounds):
+    """Run the debate nodes `rounds` times over one state"""
+    state = initial_state()
+    for _ in range(rounds):
+        for node in DEBATE_NODES:
+            state = apply_delta(state, node(state))
+    return state
+
+
+def test_nodes_return_deltas_without_mutating_state():
+    with stubbed_calls():
+        state = initial_state()
+        for node in DEBATE_NODES:
+            snapshot = json.dumps(state, sort_keys=True)
+            delta = node(state)
+
+            assert json.dumps(state, sort_keys=True) == snapshot, f"{node.__name__} mutated the state"
+            assert set(delta) < set(state), f"{node.__name__} returned unknown keys"
+            assert len(delta.get('mentor_responses', [])) <= 1
+            assert len(delta['conversation_history']) == 1
+
+            state = apply_delta(state, delta)
+
+
+def test_single_debate_adds_each_response_once():
+    with stubbed_calls():
+        state = run_rounds(1)
+
+    assert [r['mentor'] for r in state['mentor_responses']] == ['Krishna', 'Buddha', 'Jesus']
+    assert [entry.split(':')[0] for entry in state['conversation_history']] == ['Krishna', 'Buddha', 'Jesus', 'Moderator']
+    assert set(state['rag_context']) == {'krishna', 'buddha', 'jesus'}
+
+
+def test_state_grows_linearly_with_rounds():
+    with stubbed_calls():
+        sizes = {rounds: run_rounds(rounds) for rounds in (1, 2, 4, 8)}
+
+    for rounds, state in sizes.items():
+        assert len(state['mentor_responses']) == 3 * rounds
+        assert len(state['conversation_history']) == 4 * rounds
+
+    # Each extra round adds the same number of bytes (quadratic growth would not)
+    size = {rounds: len(json.dumps(state)) for rounds, state in sizes.items()}
+    early_growth = size[2] - size[1]
+    late_growth = (size[8] - size[4]) / 4
+    assert abs(late_growth - early_growth) < 0.2 * early_growth
+
+
+def test_compiled_graph_state_size():
+    try:
+        import langgraph  # noqa: F401
+    except ImportError:
+        print("langgraph not installed - skipping compiled graph check")
+        return
+
+    with stubbed_calls():
+        final_state = ddl.build_divine_dialogue_graph().invoke(initial_state())
+
+    assert len(final_state['mentor_responses']) == 3
+    assert len(final_state['conversation_history']) == 4
+
+
+def test_finished_dialogue_checkpoints_are_deleted():
+    try:
+        from langgraph.checkpoint.memory import MemorySaver
+    except ImportError:
+        print("langgraph not installed - skipping checkpoint retention check")
+        return
+
+    registry = ddl.GraphRegistry(ddl.DIALOGUE_GRAPH_BUILDERS, MemorySaver)
+    originals = (ddl.graph_registry, ddl.load_rag_database)
+    ddl.graph_registry, ddl.load_rag_database = registry, lambda: None
+    try:
+        with stubbed_calls():
+            result = ddl.run_divine_dialogue("How can I find inner peace?", dialogue_id='finished')
+            answer = ddl._generate_response
+
+            def moderator_fails(speaker, *args, **kwargs):
+                if speaker == 'Moderator':
+                    raise RuntimeError("moderator crashed")  # Not an LLMError: no fallback
+                return answer(speaker, *args, **kwargs)
+
+            ddl._generate_response = moderator_fails
+            events = []
+            failed = ddl.run_divine_dialogue("How can I find inner peace?", dialogue_id='interrupted',
+                                             on_node=lambda node, event, error=False: events.append((node, event, error)))
+            other_question = ddl.run_divine_dialogue("Why do we suffer?", dialogue_id='interrupted')
+    finally:
+        ddl.graph_registry, ddl.load_rag_database = originals
+
+    assert 'error' not in result and 'error' in failed
+    assert events[-1] == ('moderator', 'end', True)
+    assert ('jesus', 'end', False) in events
+    assert other_question['error_type'] == 'ValueError'
+    assert registry.checkpoint('debate', {'configurable': {'thread_id': 'finished'}}) is None
+    assert registry.checkpoint('debate', {'configurable': {'thread_id': 'interrupted'}}).next == ('moderator',)
+
+
+def test_prefetch_gives_the_first_mentor_a_batch_of_their_own():
+    batches = []
+    original = ddl.aretrieve_verses_for_mentors
+
+    async def retrieve(query, mentors, k=3, with_meanings=True):
+        batches.append(list(mentors))
+        return {mentor: [dict(STUB_VERSE)] for mentor in mentors}
+
+    ddl.aretrieve_verses_for_mentors = retrieve
+    try:
+        prefetch_id = ddl.start_prefetch("How can I find inner peace?", ddl.MENTOR_ORDER, prefetch_id='dialogue-1')
+        verses = [ddl.get_prefetched_verses({'prefetch_id': prefetch_id}, mentor) for mentor in ('krishna', 'buddha')]
+        ddl.discard_prefetch(prefetch_id)  # Jesus was skipped
+    finally:
+        ddl.aretrieve_verses_for_mentors = original
+
+    assert prefetch_id == 'dialogue-1' and verses == [[STUB_VERSE], [STUB_VERSE]]
+    assert sorted(batches) == [['buddha', 'jesus'], ['krishna']]
+    assert prefetch_id not in ddl._prefetched
+
+
+def test_expired_deadline_degrades_instead_of_calling():
+    config = {'configurable': {'deadline': 1.0}}  # Long past
+    with stubbed_calls():
+        state = initial_state()
+        for node in DEBATE_NODES:
+            state = apply_delta(state, node(state, config))
+
+    assert state['mentor_responses'] == []
+    assert [d['action'] for d in state['degradations']] == ['skip', 'skip', 'skip', 'local_synthesis']
+    assert state['synthesis_result']
+
+
+def test_resumed_dialogue_gets_a_fresh_deadline():
+    try:
+        from langgraph.checkpoint.memory import MemorySaver
+    except ImportError:
+        print("langgraph not installed - skipping resume deadline check")
+        return
+
+    registry = ddl.GraphRegistry(ddl.DIALOGUE_GRAPH_BUILDERS, MemorySaver)
+    originals = (ddl.graph_registry, ddl.load_rag_database, dict(ddl.DEADLINE_ESTIMATES_S))
+    ddl.graph_registry, ddl.load_rag_database = registry, lambda: None
+    ddl.DEADLINE_ESTIMATES_S.update(meanings=0.01, quality=0.01, fast=0.01)
+    try:
+        with stubbed_calls():
+            answer = ddl._generate_response
+
+            def moderator_fails(speaker, *args, **kwargs):
+                if speaker == 'Moderator':
+                    raise RuntimeError("moderator crashed")
+                return answer(speaker, *args, **kwargs)
+
+            ddl._generate_response = moderator_fails
+            failed = ddl.run_divine_dialogue("How can I find inner peace?", dialogue_id='late', deadline_s=0.5)
+            time.sleep(0.6)  # The first run's deadline passes while it is interrupted
+
+            ddl._generate_response = answer
+            resumed = ddl.run_divine_dialogue("How can I find inner peace?", dialogue_id='late', deadline_s=0.5)
+    finally:
+        ddl.graph_registry, ddl.load_rag_database = originals[:2]
+        ddl.DEADLINE_ESTIMATES_S.update(originals[2])
+
+    assert 'error' in failed and 'error' not in resumed
+    assert resumed['resumed'] and resumed['deadline_s'] == 0.5
+    assert resumed['degradations'] == []
+    assert resumed['synthesis'] == "Moderator answers the question in a few sentences."
+
+
+if __name__ == "__main__":
+    for test in (test_nodes_return_deltas_without_mutating_state,
+                 test_single_debate_adds_each_response_once,
+                 test_state_grows_linearly_with_rounds,
+                 test_expired_deadline_degrades_instead_of_calling,
+                 test_resumed_dialogue_gets_a_fresh_deadline,
+                 test_finished_dialogue_checkpoints_are_deleted,
+                 test_prefetch_gives_the_first_mentor_a_batch_of_their_own,
+                 test_compiled_graph_state_size):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ State growth tests passed")
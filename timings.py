@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Timing Instrumentation
+Per-dialogue collection of node, retrieval and LLM call timings with token usage
+(each timing is also exported as a trace span when tracing is enabled)
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+
+from tracing import span, emit_span
+
+# Collector for the dialogue running in this context (None outside one)
+_collector: contextvars.ContextVar[Optional["TimingCollector"]] = contextvars.ContextVar("divine_timing_collector", default=None)
+
+# Name of the innermost open span, recorded as each new record's parent
+_parent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("divine_timing_parent", default=None)
+
+
+class TimingCollector:
+    """
+    Thread-safe list of timing records for one dialogue
+
+    Lives in a contextvar, so records made on LangGraph's worker threads,
+    in tasks on the shared LLM event loop (which run in a copy of the
+    submitting thread's context) and in asyncio.to_thread all land in the
+    dialogue that started them.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Structured breakdown of everything recorded so far
+
+        Returns:
+            {
+                'total_s': wall time since the collector started,
+                'nodes': {node name: seconds},
+                'by_kind': {kind: {'count', 'total_s'}},
+                'llm': {'calls', 'cache_hits', 'input_tokens', 'output_tokens'},
+                'records': [every record, ordered by start time]
+            }
+        """
+        with self._lock:
+            records = sorted((dict(r) for r in self.records), key=lambda r: r['start_s'])
+
+        nodes = {}
+        by_kind = {}
+        llm = {'calls': 0, 'cache_hits': 0, 'input_tokens': 0, 'output_tokens': 0}
+
+        for record in records:
+            kind = record['kind']
+            totals = by_kind.setdefault(kind, {'count': 0, 'total_s': 0.0})
+            totals['count'] += 1
+            totals['total_s'] += record['duration_s']
+
+            if kind == 'node':
+                nodes[record['name']] = nodes.get(record['name'], 0.0) + record['duration_s']
+            elif kind == 'llm':
+                if record.get('cache_hit'):
+                    llm['cache_hits'] += 1
+                else:
+                    llm['calls'] += 1
+                llm['input_tokens'] += record.get('input_tokens') or 0
+                llm['output_tokens'] += record.get('output_tokens') or 0
+
+        return {
+            'total_s': time.perf_counter() - self.started,
+            'nodes': nodes,
+            'by_kind': by_kind,
+            'llm': llm,
+            'records': records
+        }
+
+
+@contextmanager
+def collect_timings() -> Iterator[TimingCollector]:
+    """Collect every timing recorded inside the block (and its threads)"""
+    collector = TimingCollector()
+    token = _collector.set(collector)
+    parent_token = _parent.set(None)
+    try:
+        yield collector
+    finally:
+        _parent.reset(parent_token)
+        _collector.reset(token)
+
+
+def current_collector() -> Optional[TimingCollector]:
+    """The collector for the running dialogue, if any"""
+    return _collector.get()
+
+
+def _add_record(collector: TimingCollector, kind: str, name: str, duration_s: float, attrs: Dict[str, Any]):
+    end = time.perf_counter()
+    collector.add({
+        'kind': kind,
+        'name': name,
+        'parent': _parent.get(),
+        'start_s': end - duration_s - collector.started,
+        'duration_s': duration_s,
+        **attrs
+    })
+
+
+def record_timing(kind: str, name: str, duration_s: float, **attrs):
+    """
+    Record an already-measured operation (and export it as a trace span)
+
+    Args:
+        kind: Category - "node", "llm", "retrieval", "encode", "search", ...
+        name: Operation name (node name, model tier, mentor, ...)
+        duration_s: Measured duration
+        **attrs: Extra fields (tokens, mentor, k, cache_hit, ...)
+    """
+    emit_span(kind, name, duration_s, **attrs)
+
+    collector = _collector.get()
+    if collector is not None:
+        _add_record(collector, kind, name, duration_s, attrs)
+
+
+@contextmanager
+def timed(kind: str, name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Time the block as one record (and trace span); nested records get this
+    one as parent
+
+    Yields a dict the block may add attributes to (e.g. token counts).
+    """
+    with span(kind, name, **attrs) as span_attrs:
+        collector = _collector.get()
+        if collector is None:
+            yield span_attrs
+            return
+
+        parent_token = _parent.set(f"{kind}:{name}")
+        start = time.perf_counter()
+        try:
+            yield span_attrs
+        finally:
+            _parent.reset(parent_token)
+            _add_record(collector, kind, name, time.perf_counter() - start, span_attrs)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Local Tracing
+Nested spans (dialogue → node → retrieval/encode/search → LLM call) exported
+to rotating JSONL files by a background thread, plus a p50/p95/p99 summary CLI
+
+Tracing is off unless DIVINE_TRACE_DIR is set or enable_tracing() is called.
+Spans are created by the timings hooks (timed / record_timing), so every
+operation that shows up in a dialogue's timings is also traced.
+
+Usage:
+    DIVINE_TRACE_DIR=traces streamlit run app.py
+    python tracing.py summarize traces
+    python tracing.py summarize traces --by-name
+"""
+
+import os
+import sys
+import glob
+import json
+import math
+import time
+import uuid
+import queue
+import atexit
+import argparse
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+TRACE_DIR = os.getenv("DIVINE_TRACE_DIR")
+TRACE_MAX_BYTES = int(os.getenv("DIVINE_TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_BACKUP_COUNT = int(os.getenv("DIVINE_TRACE_BACKUP_COUNT", "5"))
+TRACE_FILE_NAME = "spans.jsonl"
+
+# (trace_id, span_id) of the innermost open span in this context
+_current_span: contextvars.ContextVar[Optional[Tuple[str, str]]] = contextvars.ContextVar("divine_trace_span", default=None)
+
+
+class JsonlSpanExporter:
+    """
+    Writes spans to a size-rotated JSONL file from a background thread
+
+    export() never blocks the caller: spans go onto a bounded queue and are
+    dropped (and counted) if the writer falls that far behind.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = TRACE_MAX_BYTES,
+                 backup_count: int = TRACE_BACKUP_COUNT, queue_size: int = 10000):
+        self.directory = directory
+        self.path = os.path.join(directory, TRACE_FILE_NAME)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.exported = 0
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="divine-trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Dict[str, Any]):
+        """Queue a finished span for writing"""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait (up to timeout) until every queued span has been written"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self, timeout: float = 5.0):
+        """Write everything still queued and stop the writer thread"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _rotate(self):
+        """spans.jsonl → spans.jsonl.1 → ... → spans.jsonl.<backup_count>"""
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _run(self):
+        handle = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                span = self._queue.get()
+                try:
+                    if span is None:
+                        return
+                    handle.write(json.dumps(span, default=str) + "\n")
+                    self.exported += 1
+
+                    if handle.tell() >= self.max_bytes:
+                        handle.close()
+                        self._rotate()
+                        handle = open(self.path, "a", encoding="utf-8")
+                    elif self._queue.empty():
+                        # Batch writes; flush once the queue drains
+                        handle.flush()
+                finally:
+                    self._queue.task_done()
+        finally:
+            handle.close()
+
+
+_exporter: Optional[JsonlSpanExporter] = None
+_exporter_lock = threading.Lock()
+_env_checked = False
+
+
+def enable_tracing(directory: str = "traces", max_bytes: int = TRACE_MAX_BYTES,
+                   backup_count: int = TRACE_BACKUP_COUNT) -> JsonlSpanExporter:
+    """Start exporting spans to directory (replacing any previous exporter)"""
+    global _exporter, _env_checked
+    with _exporter_lock:
+        if _exporter is not None:
+            _exporter.close()
+        _exporter = JsonlSpanExporter(directory, max_bytes, backup_count)
+        _env_checked = True
+    print(f"✓ Tracing spans to {_exporter.path}")
+    return _exporter
+
+
+def disable_tracing():
+    """Flush and stop the exporter"""
+    global _exporter
+    with _exporter_lock:
+        exporter, _exporter = _exporter, None
+    if exporter is not None:
+        exporter.close()
+
+
+def get_exporter() -> Optional[JsonlSpanExporter]:
+    """Active exporter, starting one from DIVINE_TRACE_DIR on first use"""
+    global _exporter, _env_checked
+    if not _env_checked:
+        with _exporter_lock:
+            if not _env_checked:
+                _env_checked = True
+                if TRACE_DIR:
+                    _exporter = JsonlSpanExporter(TRACE_DIR)
+    return _exporter
+
+
+atexit.register(disable_tracing)
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _export(exporter: JsonlSpanExporter, kind: str, name: str, trace_id: str, span_id: str,
+            parent_id: Optional[str], start: float, duration_s: float, attrs: Dict[str, Any],
+            error: Optional[BaseException] = None):
+    span = {
+        'trace_id': trace_id,
+        'span_id': span_id,
+        'parent_id': parent_id,
+        'kind': kind,
+        'name': name,
+        'start': start,
+        'duration_ms': duration_s * 1000,
+        'status': 'error' if error else 'ok',
+        'attrs': dict(attrs)
+    }
+    if error is not None:
+        span['error'] = type(error).__name__
+    exporter.export(span)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Trace the block as a span nested under the current one
+
+    Yields the attribute dict, which the block may add to before the span
+    is exported. A no-op (apart from yielding attrs) when tracing is off.
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        yield attrs
+        return
+
+    parent = _current_span.get()
+    trace_id = parent[0] if parent else _new_id()
+    span_id = _new_id()
+    token = _current_span.set((trace_id, span_id))
+
+    start = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        _export(exporter, kind, name, trace_id, span_id, parent[1] if parent else None,
+                start, time.perf_counter() - started, attrs, error)
+
+
+def emit_span(kind: str, name: str, duration_s: float, **attrs):
+    """Export an already-measured operation as a leaf span ending now"""
+    exporter = get_exporter()
+    if exporter is None:
+        return
+
+    parent = _current_span.get()
+    _export(exporter, kind, name, parent[0] if parent else _new_id(), _new_id(),
+            parent[1] if parent else None, time.time() - duration_s, duration_s, attrs)
+
+
+# ---------------------------------------------------------------------------
+# Summary CLI
+# ---------------------------------------------------------------------------
+
+def load_spans(directory: str) -> List[Dict[str, Any]]:
+    """Every span in the directory's current and rotated files"""
+    spans = []
+    for path in sorted(glob.glob(os.path.join(directory, TRACE_FILE_NAME + "*"))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # partially written line
+    return spans
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(spans: List[Dict[str, Any]], by_name: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Count, error count and latency percentiles (ms) per span type"""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for s in spans:
+        key = f"{s['kind']}:{s['name']}" if by_name else s['kind']
+        groups.setdefault(key, []).append(s)
+
+    summary = {}
+    for key, members in sorted(groups.items()):
+        durations = sorted(s['duration_ms'] for s in members)
+        summary[key] = {
+            'count': len(members),
+            'errors': sum(1 for s in members if s.get('status') == 'error'),
+            'p50_ms': percentile(durations, 50),
+            'p95_ms': percentile(durations, 95),
+            'p99_ms': percentile(durations, 99),
+            'max_ms': durations[-1]
+        }
+    return summary
+
+
+def main():
+    """Summarize exported spans"""
+    parser = argparse.ArgumentParser(description="Divine Dialogue trace tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = subparsers.add_parser("summarize", help="p50/p95/p99 latency per span type")
+    summary_parser.add_argument("directory", nargs="?", default=TRACE_DIR or "traces")
+    summary_parser.add_argument("--by-name", action="store_true",
+                                help="Group by kind:name (e.g. llm:fast, node:krishna) instead of kind")
+    summary_parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    spans = load_spans(args.directory)
+    if not spans:
+        print(f"No spans found in {args.directory}")
+        sys.exit(1)
+
+    summary = summarize(spans, by_name=args.by_name)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    traces = len({s['trace_id'] for s in spans})
+    print(f"\n📈 {len(spans)} spans from {traces} traces in {args.directory}\n")
+    print(f"{'span':<28}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("-" * 84)
+    for key, row in summary.items():
+        print(f"{key:<28}{row['count']:>8}{row['errors']:>8}{row['p50_ms']:>10.1f}"
+              f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Divine Dialogue - Vector Store Backends
+One search interface over the FAISS, ChromaDB and pure-NumPy engines
+"""
+
+import os
+import json
+from typing import List, Dict, Any, Optional, Protocol, runtime_checkable
+
+import numpy as np
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+FAISS_DB_PATH = "sacred_texts_rag_faiss"
+CHROMA_DB_PATH = "sacred_texts_rag"
+CHROMA_COLLECTION_NAME = "sacred_texts"
+
+# Backend names accepted by load_vector_store (and DIVINE_VECTOR_BACKEND)
+BACKENDS = ("faiss", "chroma", "numpy")
+
+# Shared embedding model (loaded once per process)
+_EMBEDDING_MODEL = None
+
+
+def get_embedding_model():
+    """Load the sentence-transformers model once and reuse it"""
+    global _EMBEDDING_MODEL
+
+    if _EMBEDDING_MODEL is None:
+        from sentence_transformers import SentenceTransformer
+        _EMBEDDING_MODEL = SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+    return _EMBEDDING_MODEL
+
+
+def encode_queries(queries: List[str]) -> np.ndarray:
+    """
+    Encode query strings with the shared embedding model
+
+    Args:
+        queries: List of query strings
+
+    Returns:
+        float32 array of shape (len(queries), dimension)
+    """
+    embeddings = get_embedding_model().encode(queries, convert_to_numpy=True)
+    return embeddings.astype('float32')
+
+
+def verse_id(mentor: str, reference: str) -> str:
+    """Compact, stable id of a verse (e.g. "krishna:2.47"), unique across the database"""
+    return f"{mentor.lower()}:{reference}"
+
+
+# Verse id -> {text, reference, source} (loaded once per process)
+_VERSE_CATALOG: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def load_verse_catalog(db_path: str = FAISS_DB_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Every stored verse keyed by verse_id, for turning saved ids back into verses
+
+    Returns an empty catalog (and retries next time) if the texts are missing.
+    """
+    global _VERSE_CATALOG
+
+    if _VERSE_CATALOG is None:
+        try:
+            texts, metadatas = _load_texts_and_metadatas(db_path)
+        except FileNotFoundError:
+            return {}
+        _VERSE_CATALOG = {
+            verse_id(metadata['mentor'], metadata['reference']): {
+                'text': text,
+                'reference': metadata['reference'],
+                'source': metadata['source']
+            }
+            for text, metadata in zip(texts, metadatas)
+        }
+
+    return _VERSE_CATALOG
+
+
+def _l2_to_similarity(distance: float) -> float:
+    """Convert a (squared) L2 distance to the 0-1 similarity used across the app"""
+    return float(1 / (1 + distance))
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """Search interface shared by every vector store backend"""
+
+    backend: str
+
+    def __len__(self) -> int:
+        """Number of stored verses"""
+        ...
+
+    def search(self, query_embedding: np.ndarray, mentor: Optional[str] = None, k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Find the k verses closest to a query embedding
+
+        Args:
+            query_embedding: 1-D (or 1 x dimension) float32 query vector
+            mentor: Optional mentor filter (krishna, buddha, jesus)
+            k: Number of results to return
+
+        Returns:
+            List of dicts with text, metadata, distance and similarity, best first
+        """
+        ...
+
+
+def _load_texts_and_metadatas(db_path: str):
+    """Load the texts.json / metadatas.json pair written by the builder"""
+    with open(os.path.join(db_path, "texts.json"), 'r', encoding='utf-8') as f:
+        texts = json.load(f)
+
+    with open(os.path.join(db_path, "metadatas.json"), 'r', encoding='utf-8') as f:
+        metadatas = json.load(f)
+
+    return texts, metadatas
+
+
+class FaissVectorStore:
+    """Vector store backed by a FAISS IndexFlatL2"""
+
+    backend = "faiss"
+
+    def __init__(self, index, texts: List[str], metadatas: List[Dict[str, Any]]):
+        self.index = index
+        self.texts = texts
+        self.metadatas = metadatas
+
+    @classmethod
+    def load(cls, db_path: str = FAISS_DB_PATH) -> "FaissVectorStore":
+        """Load index.faiss, texts.json and metadatas.json from db_path"""
+        import faiss
+
+        index = faiss.read_index(os.path.join(db_path, "index.faiss"))
+        texts, metadatas = _load_texts_and_metadatas(db_path)
+        return cls(index, texts, metadatas)
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def search(self, query_embedding: np.ndarray, mentor: Optional[str] = None, k: int = 3) -> List[Dict[str, Any]]:
+        query = np.asarray(query_embedding, dtype='float32').reshape(1, -1)
+
+        # FAISS has no metadata filter, so over-fetch and filter by mentor;
+        # widen the search if the mentor is under-represented in the top hits
+        search_k = min(max(50, k), self.index.ntotal) if mentor else min(k, self.index.ntotal)
+
+        while True:
+            distances, indices = self.index.search(query, search_k)
+
+            results = []
+            for idx, dist in zip(indices[0], distances[0]):
+                if idx < 0:
+                    continue
+                metadata = self.metadatas[idx]
+                if mentor and metadata['mentor'] != mentor:
+                    continue
+                results.append({
+                    'text': self.texts[idx],
+                    'metadata': metadata,
+                    'distance': float(dist),
+                    'similarity': _l2_to_similarity(dist)
+                })
+                if len(results) >= k:
+                    return results
+
+            if search_k >= self.index.ntotal:
+                return results
+            search_k = min(search_k * 4, self.index.ntotal)
+
+
+class NumpyVectorStore:
+    """
+    Brute-force vector store using a single BLAS matrix-vector product.
+
+    At ~5k x 384 vectors an exact matmul is cheaper than any index, and the
+    per-mentor row partitions make the mentor filter exact instead of
+    over-fetch-and-filter.
+    """
+
+    backend = "numpy"
+
+    def __init__(self, embeddings: np.ndarray, texts: List[str], metadatas: List[Dict[str, Any]]):
+        self.embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+        self.texts = texts
+        self.metadatas = metadatas
+        self.squared_norms = np.einsum('ij,ij->i', self.embeddings, self.embeddings)
+
+        # Row indices per mentor, with a contiguous copy of their vectors
+        self.mentor_rows = {}
+        self.mentor_embeddings = {}
+        for mentor in sorted({m['mentor'] for m in metadatas}):
+            rows = np.array([i for i, m in enumerate(metadatas) if m['mentor'] == mentor], dtype=np.int64)
+            self.mentor_rows[mentor] = rows
+            self.mentor_embeddings[mentor] = np.ascontiguousarray(self.embeddings[rows])
+
+    @classmethod
+    def load(cls, db_path: str = FAISS_DB_PATH) -> "NumpyVectorStore":
+        """
+        Load vectors from embeddings.npy, falling back to reconstructing
+        them from index.faiss for databases built before it was written
+        """
+        texts, metadatas = _load_texts_and_metadatas(db_path)
+
+        embeddings_path = os.path.join(db_path, "embeddings.npy")
+        if os.path.exists(embeddings_path):
+            embeddings = np.load(embeddings_path)
+        else:
+            import faiss
+            index = faiss.read_index(os.path.join(db_path, "index.faiss"))
+            embeddings = index.reconstruct_n(0, index.ntotal)
+
+        return cls(embeddings, texts, metadatas)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(self, query_embedding: np.ndarray, mentor: Optional[str] = None, k: int = 3) -> List[Dict[str, Any]]:
+        query = np.asarray(query_embedding, dtype='float32').reshape(-1)
+
+        if mentor:
+            rows = self.mentor_rows.get(mentor)
+            if rows is None:
+                return []
+            matrix = self.mentor_embeddings[mentor]
+            norms = self.squared_norms[rows]
+        else:
+            rows = None
+            matrix = self.embeddings
+            norms = self.squared_norms
+
+        # Squared L2 distance: |x|^2 - 2 x.q + |q|^2 (same scale as IndexFlatL2)
+        distances = norms - 2.0 * (matrix @ query) + float(query @ query)
+
+        k = min(k, len(distances))
+        if k <= 0:
+            return []
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+
+        results = []
+        for position in top:
+            idx = int(rows[position]) if rows is not None else int(position)
+            dist = max(float(distances[position]), 0.0)
+            results.append({
+                'text': self.texts[idx],
+                'metadata': self.metadatas[idx],
+                'distance': dist,
+                'similarity': _l2_to_similarity(dist)
+            })
+
+        return results
+
+
+class ChromaVectorStore:
+    """Vector store backed by a persistent ChromaDB collection"""
+
+    backend = "chroma"
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @classmethod
+    def load(cls, db_path: str = CHROMA_DB_PATH, collection_name: str = CHROMA_COLLECTION_NAME) -> "ChromaVectorStore":
+        """Open the collection written by build_rag_database.py"""
+        import chromadb
+
+        client = chromadb.PersistentClient(path=db_path)
+        return cls(client.get_collection(name=collection_name))
+
+    def __len__(self) -> int:
+        return self.collection.count()
+
+    def search(self, query_embedding: np.ndarray, mentor: Optional[str] = None, k: int = 3) -> List[Dict[str, Any]]:
+        query = np.asarray(query_embedding, dtype='float32').reshape(-1)
+
+        query_args = {
+            'query_embeddings': [query.tolist()],
+            'n_results': k
+        }
+        if mentor:
+            query_args['where'] = {'mentor': mentor}
+
+        response = self.collection.query(**query_args)
+
+        results = []
+        for text, metadata, dist in zip(
+            response['documents'][0],
+            response['metadatas'][0],
+            response['distances'][0]
+        ):
+            results.append({
+                'text': text,
+                'metadata': metadata,
+                'distance': float(dist),
+                'similarity': _l2_to_similarity(dist)
+            })
+
+        return results
+
+
+def available_backends() -> List[str]:
+    """Backends whose on-disk database exists in the working directory"""
+    backends = []
+
+    if os.path.exists(os.path.join(FAISS_DB_PATH, "index.faiss")):
+        backends.append("faiss")
+    if os.path.exists(CHROMA_DB_PATH):
+        backends.append("chroma")
+    if os.path.exists(os.path.join(FAISS_DB_PATH, "embeddings.npy")) or "faiss" in backends:
+        backends.append("numpy")
+
+    return backends
+
+
+def load_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    Load a vector store backend
+
+    Args:
+        backend: "faiss", "chroma" or "numpy". Defaults to the
+            DIVINE_VECTOR_BACKEND environment variable, then to the first
+            database found on disk (FAISS, then ChromaDB).
+
+    Returns:
+        A VectorStore instance
+    """
+    backend = (backend or os.getenv("DIVINE_VECTOR_BACKEND", "")).strip().lower()
+
+    if not backend:
+        found = available_backends()
+        if not found:
+            raise FileNotFoundError(
+                f"No vector database found ({FAISS_DB_PATH}/ or {CHROMA_DB_PATH}/). "
+                "Run: python build_rag_database.py"
+            )
+        backend = found[0]
+
+    if backend == "faiss":
+        return FaissVectorStore.load()
+    if backend in ("chroma", "chromadb"):
+        return ChromaVectorStore.load()
+    if backend == "numpy":
+        return NumpyVectorStore.load()
+
+    raise ValueError(f"Unknown vector store backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")